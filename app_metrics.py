@@ -0,0 +1,92 @@
+"""
+Prometheus metrics shared by the web app, the rewrite pipeline and the analysis caches.
+
+Every metric is defined here, so the names and labels stay consistent, and is exposed by the
+web app on GET /metrics.
+
+Multiple workers: when PROMETHEUS_MULTIPROC_DIR points at a shared, writable directory (set it
+before the workers start and empty it on deploy), prometheus_client keeps each worker's values in
+files there and /metrics aggregates all of them. Without it, every worker reports its own values.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest,
+)
+
+__all__ = ['CONTENT_TYPE_LATEST', 'render', 'time_stage', 'record_cache']
+
+_MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# Seconds; spans sub-millisecond sanitizer steps up to long streamed rewrites.
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+
+REQUESTS = Counter(
+    "sanitizator_requests_total", "Requests handled, by endpoint, action and outcome.",
+    ["endpoint", "action", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "sanitizator_request_duration_seconds", "Time until the response (or stream) is handed back.",
+    ["endpoint", "action"], buckets=_LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "sanitizator_stage_duration_seconds", "Duration of each pipeline stage.",
+    ["stage"], buckets=_LATENCY_BUCKETS,
+)
+TIME_TO_FIRST_CHUNK = Histogram(
+    "sanitizator_rewrite_time_to_first_chunk_seconds", "Time from the rewrite request to its first streamed chunk.",
+    buckets=_LATENCY_BUCKETS,
+)
+REWRITES_IN_PROGRESS = Gauge(
+    "sanitizator_rewrites_in_progress", "Rewrite streams currently running.",
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "sanitizator_rate_limit_rejections_total", "Rewrites rejected by a rate limiter.",
+    ["limiter"],
+)
+CACHE_REQUESTS = Counter(
+    "sanitizator_cache_requests_total", "Cache lookups, by cache and result (hit/miss).",
+    ["cache", "result"],
+)
+AI_SCORE_SOURCE = Counter(
+    "sanitizator_ai_score_total", "AI scores returned, by source (local model or LLM critique).",
+    ["source"],
+)
+COMPONENT_READY = Gauge(
+    "sanitizator_component_ready", "1 when a preloaded component (model, matcher, data file) is loaded.",
+    ["component"], multiprocess_mode="liveall",
+)
+REWRITE_JOBS = Counter(
+    "sanitizator_rewrite_jobs_total", "Background rewrite jobs finished, by final status.",
+    ["status"],
+)
+REWRITE_JOBS_QUEUED = Gauge(
+    "sanitizator_rewrite_jobs_queued", "Background rewrite jobs waiting for a free worker slot.",
+    multiprocess_mode="livesum",
+)
+
+
+@contextmanager
+def time_stage(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def render() -> bytes:
+    """The exposition text for every worker (multiprocess mode) or this process."""
+    if _MULTIPROCESS:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,104 @@
+"""
+Cold-start benchmark and import profile for the web app entry point (web_app/main.py).
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 5] [--profile] [--top 25]
+
+Every run starts a fresh interpreter, imports web_app.main, starts the app and sends
+its first /api/process?action=clean request, which is what a new Vercel instance does.
+It reports the import time, time to the first response, total wall time and which heavy
+packages ended up loaded. --profile runs `python -X importtime` once and lists the
+most expensive imports (cumulative).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_HEAVY_PACKAGES = ("spacy", "langchain_core", "textstat", "fitz", "docx2txt", "bs4", "numpy")
+
+_CHILD_SCRIPT = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from web_app.main import app
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    t2 = time.perf_counter()
+    response = client.post("/api/process", data={"action": "clean", "text": "Hello <b>world</b>, mail me at a@b.io"})
+    t3 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t3 - t2) * 1000,
+    "total_ms": (t3 - t0) * 1000,
+    "status": response.status_code,
+    "loaded": [m for m in HEAVY if m in sys.modules],
+}))
+"""
+
+
+def _child_env(tmp_dir: str) -> dict:
+    env = dict(os.environ)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    # Keep the benchmark database out of the source tree.
+    env["VERCEL"] = "1"
+    env.setdefault("AUTH_SECRET", "benchmark")
+    env["TMPDIR"] = tmp_dir
+    return env
+
+
+def _run_once(env: dict) -> dict:
+    script = f"HEAVY = {_HEAVY_PACKAGES!r}\n" + _CHILD_SCRIPT
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=_PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _import_profile(env: dict, top: int):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import web_app.main"],
+        cwd=_PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+
+    print(f"\nTop {top} imports by cumulative time")
+    print(f"{'cumulative':>12}{'self':>10}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>9.1f} ms{self_us / 1000:>7.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", action="store_true", help="Show a -X importtime breakdown")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = _child_env(tmp_dir)
+        runs = [_run_once(env) for _ in range(args.runs)]
+
+        for key in ("import_ms", "startup_ms", "first_request_ms", "total_ms"):
+            values = [r[key] for r in runs]
+            print(f"{key:<18} median {statistics.median(values):8.1f} ms   max {max(values):8.1f} ms")
+        print(f"{'status':<18} {sorted(set(r['status'] for r in runs))}")
+        print(f"{'heavy modules':<18} {runs[-1]['loaded']}")
+
+        if args.profile:
+            _import_profile(env, args.top)
+
+
+if __name__ == "__main__":
+    main()
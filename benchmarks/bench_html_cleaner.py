@@ -0,0 +1,112 @@
+"""
+Benchmark for html_cleaner.clean_html across the available parser backends.
+
+Usage:
+    python benchmarks/bench_html_cleaner.py [--corpus DIR] [--repeat N]
+
+The corpus is every *.html / *.htm / *.txt file in DIR (e.g. HTML copied out of
+Google Docs, Word, web pages or chat UIs). Without --corpus a synthetic set of
+pasted-looking documents is generated so the script always has something to measure.
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _PROJECT_ROOT)
+
+import _paths  # noqa: E402,F401 — centralised path setup
+import html_cleaner  # noqa: E402
+
+
+_PARAGRAPH = (
+    "The committee reviewed the proposal &amp; agreed that the timeline was realistic, "
+    "although a few members raised concerns about the budget for the second phase."
+)
+
+
+def _synthetic_corpus() -> dict[str, str]:
+    google_docs = "".join(
+        f'<p dir="ltr" style="line-height:1.38;margin-top:0pt"><span style="font-size:11pt;'
+        f'font-family:Arial;color:#000000;">{_PARAGRAPH}</span></p>'
+        for _ in range(40)
+    )
+    word = (
+        '<html><head><style>p.MsoNormal{margin:0cm;}</style></head><body>'
+        + "".join(f'<p class="MsoNormal"><o:p>{_PARAGRAPH}</o:p></p>' for _ in range(40))
+        + "</body></html>"
+    )
+    web_page = (
+        "<html><head><script>var tracking = {id: 42};</script></head><body><nav><ul>"
+        + "".join(f'<li><a href="/p/{i}">Link {i}</a></li>' for i in range(30))
+        + "</ul></nav><article>"
+        + "".join(f"<h2>Section {i}</h2><p>{_PARAGRAPH}</p>" for i in range(40))
+        + "</article></body></html>"
+    )
+    plain = "\n\n".join(_PARAGRAPH.replace("&amp;", "and") for _ in range(40))
+    return {
+        "google_docs": google_docs,
+        "word": word,
+        "web_page": web_page,
+        "plain_text": plain,
+    }
+
+
+def _load_corpus(directory: str) -> dict[str, str]:
+    corpus = {}
+    for pattern in ("*.html", "*.htm", "*.txt"):
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                corpus[os.path.basename(path)] = f.read()
+    return corpus
+
+
+def _time_call(fn, text: str, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory with pasted HTML samples")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = _load_corpus(args.corpus) if args.corpus else _synthetic_corpus()
+    if not corpus:
+        sys.exit(f"No samples found in {args.corpus}")
+
+    backends = html_cleaner.available_backends()
+    original_backend = html_cleaner.get_backend()
+
+    print(f"{'sample':<24}{'size':>10}  " + "".join(f"{b:>16}" for b in backends))
+    totals = {b: 0.0 for b in backends}
+    total_bytes = 0
+
+    for name, text in corpus.items():
+        total_bytes += len(text.encode("utf-8"))
+        row = []
+        for backend in backends:
+            html_cleaner.set_backend(backend)
+            median = statistics.median(_time_call(html_cleaner.clean_html, text, args.repeat))
+            totals[backend] += median
+            row.append(f"{median * 1000:>13.3f} ms")
+        print(f"{name[:23]:<24}{len(text):>10}  " + "".join(row))
+
+    html_cleaner.set_backend(original_backend)
+
+    print()
+    for backend in backends:
+        throughput = total_bytes / totals[backend] / 1_000_000 if totals[backend] else float("inf")
+        print(f"{backend:<16} total {totals[backend] * 1000:9.3f} ms   {throughput:8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
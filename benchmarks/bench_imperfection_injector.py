@@ -0,0 +1,106 @@
+"""
+Long-text benchmark for imperfection_injector.inject_imperfections.
+
+Usage:
+    python benchmarks/bench_imperfection_injector.py [--sizes 10000 100000 1000000] [--repeat 5] [--legacy]
+
+The input is realistic prose full of typo candidates, contractions and "and"s, repeated up to
+each size. Timings are the best of --repeat runs with a fixed seed. --legacy also times the
+previous split-and-rejoin implementation (global random module) on the same inputs.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _PROJECT_ROOT)
+
+import _paths  # noqa: E402,F401 — centralised path setup
+import imperfection_injector  # noqa: E402
+
+_PARAGRAPH = (
+    "The team didn't receive their results until Friday, and because the report wasn't ready "
+    "they're definitely going to accommodate the delay. We can't say it really matters. "
+    "It doesn't help, and you're right that they aren't happy; the plan won't change!\n\n"
+)
+
+
+def _legacy_inject(text: str) -> str:
+    typos = imperfection_injector._COMMON_TYPOS
+    contraction_typos = imperfection_injector._CONTRACTION_TYPOS
+
+    result = []
+    for w in re.split(r'(\s+|[.,;!?])', text):
+        if not w or w.isspace() or re.match(r'[.,;!?]', w):
+            result.append(w)
+            continue
+        w_lower = w.lower()
+        new_w = w
+        if w_lower in typos and random.random() < imperfection_injector._TYPO_RATE:
+            new_w = typos[w_lower]
+            if w[0].isupper():
+                new_w = new_w.capitalize()
+        elif w_lower in contraction_typos and random.random() < imperfection_injector._CONTRACTION_TYPO_RATE:
+            new_w = contraction_typos[w_lower]
+            if w[0].isupper():
+                new_w = new_w.capitalize()
+        result.append(new_w)
+    text = "".join(result)
+
+    words = []
+    for w in text.split(' '):
+        if w.lower() == "and" and random.random() < imperfection_injector._AMPERSAND_RATE:
+            words.append("&")
+        else:
+            words.append(w)
+    text = ' '.join(words)
+
+    if random.random() < imperfection_injector._DOUBLE_SPACE_RATE:
+        text = re.sub(r'([.!?])\s+(?=[A-Z])', r'\1  ', text)
+    return text
+
+
+def _build_text(size: int) -> str:
+    return (_PARAGRAPH * (size // len(_PARAGRAPH) + 1))[:size]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy", action="store_true", help="Also time the previous implementation")
+    args = parser.parse_args()
+
+    imperfection_injector._load_typos_csv()
+    imperfection_injector.inject_imperfections("warm up the pattern", random.Random(0))
+
+    header = f"{'chars':>10}{'current':>12}{'MB/s':>8}"
+    if args.legacy:
+        header += f"{'legacy':>12}{'speedup':>9}"
+    print(header)
+
+    for size in args.sizes:
+        text = _build_text(size)
+        current = _best_of(lambda: imperfection_injector.inject_imperfections(text, random.Random(42)), args.repeat)
+        row = f"{size:>10}{current * 1000:>10.1f}ms{size / current / 1e6:>8.1f}"
+        if args.legacy:
+            random.seed(42)
+            legacy = _best_of(lambda: _legacy_inject(text), args.repeat)
+            row += f"{legacy * 1000:>10.1f}ms{legacy / current:>8.1f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
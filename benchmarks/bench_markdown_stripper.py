@@ -0,0 +1,87 @@
+"""
+Pathological-input benchmark for markdown_stripper.strip_markdown.
+
+Usage:
+    python benchmarks/bench_markdown_stripper.py [--sizes 10000 20000 40000] [--legacy]
+
+Each case repeats a hostile fragment (stray asterisks, unclosed brackets, dangling link
+openers...) on a single long line. For a linear-time stripper the time roughly doubles
+when the size doubles; the "growth" column shows that ratio. --legacy also times the
+previous regex cascade on the same inputs for comparison.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _PROJECT_ROOT)
+
+import _paths  # noqa: E402,F401 — centralised path setup
+import markdown_stripper  # noqa: E402
+
+CASES = {
+    "stray_asterisks": "*a ",
+    "stray_underscores": "_a ",
+    "unclosed_brackets": "[",
+    "unclosed_images": "![",
+    "dangling_link_open": "[x](",
+    "bracket_paren": "](",
+    "mixed_emphasis": "**a*",
+    "backtick_noise": "`a``",
+    "realistic_line": "Some **bold** text with a [link](http://example.com) and `code`. ",
+}
+
+_LEGACY_PATTERNS = [
+    (re.compile(r'^#{1,6}\s*', re.MULTILINE), ''),
+    (re.compile(r'\*{2}(.*?)\*{2}'), r'\1'),
+    (re.compile(r'_{2}(.*?)_{2}'), r'\1'),
+    (re.compile(r'\*(.*?)\*'), r'\1'),
+    (re.compile(r'_(.*?)_'), r'\1'),
+    (re.compile(r'!\[(.*?)\]\(.*?\)'), r'\1'),
+    (re.compile(r'\[(.*?)\]\(.*?\)'), r'\1'),
+    (re.compile(r'^>\s*', re.MULTILINE), ''),
+    (re.compile(r'`(.*?)`'), r'\1'),
+    (re.compile(r'```.*?\n?(.*?)```', re.DOTALL), r'\1'),
+    (re.compile(r'^\s*[-*_]{3,}\s*$', re.MULTILINE), ''),
+]
+
+
+def _legacy_strip(text: str) -> str:
+    for pattern, replacement in _LEGACY_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _time_once(fn, text: str) -> float:
+    start = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - start
+
+
+def _report(label: str, fn, sizes: list[int]):
+    print(f"\n{label}")
+    print(f"{'case':<22}" + "".join(f"{n:>12}" for n in sizes) + f"{'growth':>10}")
+    for name, fragment in CASES.items():
+        timings = []
+        for size in sizes:
+            text = (fragment * (size // len(fragment) + 1))[:size]
+            timings.append(_time_once(fn, text))
+        growth = timings[-1] / timings[-2] if len(timings) > 1 and timings[-2] else float("nan")
+        print(f"{name:<22}" + "".join(f"{t * 1000:>9.2f} ms" for t in timings) + f"{growth:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 20_000, 40_000, 80_000])
+    parser.add_argument("--legacy", action="store_true", help="Also time the old regex cascade (quadratic, use small sizes)")
+    args = parser.parse_args()
+
+    _report("single-pass strip_markdown", markdown_stripper.strip_markdown, args.sizes)
+    if args.legacy:
+        _report("legacy regex cascade", _legacy_strip, args.sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark for the n-gram repetition counting in repetition_detection.
+
+Usage:
+    python benchmarks/bench_repetition_detection.py [--sizes 1000 10000 50000] [--full]
+
+Compares the hashed NumPy counting (find_repeated_ngrams) against the previous
+approach of joining every 2- to 5-gram into a string and counting with a Counter.
+Tokens are synthetic so the counting stage is measured on its own; --full also
+times get_repeating_keyphrases end to end, which needs the spaCy model.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _PROJECT_ROOT)
+
+import _paths  # noqa: E402,F401 — centralised path setup
+import repetition_detection  # noqa: E402
+
+_VOCABULARY = (
+    "the of and to in a is that for it as was with be by on not he this are or his from at which "
+    "but have an they you were her she there been one all we their has would when if so no will "
+    "data model system important note process result approach language human writing detector"
+).split()
+
+
+def _legacy_repetitions(words: list[str], min_length: int, max_length: int) -> list[str]:
+    ngrams = []
+    for n in range(min_length, max_length + 1):
+        for i in range(len(words) - n + 1):
+            ngrams.append(' '.join(words[i:i + n]))
+    counts = Counter(item.lower() for item in ngrams)
+    seen_originals = {}
+    for item in ngrams:
+        seen_originals.setdefault(item.lower(), item)
+    return [seen_originals[normalized] for normalized, count in counts.items() if count > 1]
+
+
+def _synthetic_tokens(size: int, rng: random.Random) -> tuple[list[str], np.ndarray]:
+    words = [rng.choice(_VOCABULARY) for _ in range(size)]
+    lookup = {}
+    ids = np.fromiter(
+        (lookup.setdefault(w.lower(), len(lookup) + 1) for w in words), dtype=np.uint64, count=size
+    )
+    return words, ids
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000, 200_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--full", action="store_true", help="Also time tokenization + counting")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'tokens':>10}{'legacy':>14}{'hashed':>14}{'speedup':>10}" + (f"{'full':>14}" if args.full else ""))
+
+    for size in args.sizes:
+        words, ids = _synthetic_tokens(size, rng)
+        legacy = _best_of(lambda: _legacy_repetitions(words, 2, 5), args.repeat)
+        hashed = _best_of(lambda: repetition_detection.find_repeated_ngrams(words, ids, 2, 5), args.repeat)
+        line = f"{size:>10}{legacy * 1000:>11.2f} ms{hashed * 1000:>11.2f} ms{legacy / hashed:>9.1f}x"
+
+        if args.full:
+            text = " ".join(words)
+            full = _best_of(lambda: repetition_detection.get_repeating_keyphrases(text), args.repeat)
+            line += f"{full * 1000:>11.2f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Benchmark suite for the sanitization and analysis hot paths.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1KB 10KB 100KB 1MB] [--kinds plain markdown html emoji pii]
+                                     [--cases sanitize. analyzer.] [--repeat 5] [--max-seconds 10]
+                                     [--output baseline.json] [--compare baseline.json] [--threshold 0.2]
+
+Every case runs over the synthetic corpus (benchmarks/corpus.py) at each size and kind it applies to.
+It records latency percentiles (p50/p95/p99), throughput (MB/s of input at p50) and peak traced memory
+(tracemalloc, measured in a separate run so it does not skew the timings).
+
+--output writes the results as a JSON baseline. --compare re-runs the same cases and flags any case
+whose p50 latency or peak memory grew by more than --threshold (20% by default; differences under
+0.5 ms are treated as noise). The exit status is 1 when a regression was found, so CI can gate on it.
+--cases keeps only the cases whose name starts with one of the given prefixes.
+
+Analyzers that need a spaCy model which is not installed are reported as skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import unicodedata
+from datetime import datetime, timezone
+
+import numpy as np
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import _paths  # noqa: E402,F401 — centralised path setup
+import corpus  # noqa: E402
+
+_NOISE_FLOOR_MS = 0.5
+
+
+class Case:
+    """A benchmarked callable. `prepare` turns the corpus text into the callable's argument (untimed)."""
+
+    def __init__(self, name, run, kinds=corpus.KINDS, prepare=None):
+        self.name = name
+        self.run = run
+        self.kinds = kinds
+        self.prepare = prepare or (lambda text: text)
+
+
+def _sanitizer_cases():
+    import emoji_cleaner
+    import html_cleaner
+    import markdown_stripper
+    import normalizator
+    import pii_redactor
+    import profanity_filter
+    import strip_inv_chars
+    import whitespace_collapser
+    from text_sanitization.changes_log import apply_regex_changes, build_changes_log
+
+    cases = [
+        Case("changes_log.build_changes_log", build_changes_log),
+        Case("sanitize.strip_markdown", markdown_stripper.strip_markdown),
+        Case("sanitize.nfkc_normalize", lambda text: unicodedata.normalize('NFKC', text)),
+        Case("sanitize.validate_and_fix_encoding", strip_inv_chars.validate_and_fix_encoding),
+        Case("sanitize.invisible_char_patterns", lambda text: apply_regex_changes(text, strip_inv_chars.PATTERNS)),
+        Case("sanitize.redact_pii", pii_redactor.redact_pii),
+        Case("sanitize.remove_emojis", emoji_cleaner.remove_emojis),
+        Case("sanitize.redact_profanity", profanity_filter.redact_profanity),
+        Case("sanitize.collapse_whitespace", whitespace_collapser.collapse_whitespace),
+        Case("sanitize.normalize_punctuation", normalizator.normalize_punctuation),
+        Case("sanitize.normalization_patterns", lambda text: apply_regex_changes(text, normalizator.PATTERNS)),
+    ]
+    # One variant per installed HTML backend.
+    for backend in html_cleaner.available_backends():
+        cases.append(Case(
+            f"sanitize.clean_html[{backend}]",
+            lambda text, backend=backend: html_cleaner.html_to_text(text, backend=backend),
+        ))
+    return cases
+
+
+def _analysis_cases():
+    import analyzer_registry
+    import incremental_analysis
+    import llm_validator
+
+    cases = [
+        Case(f"analyzer.{name}", lambda text, name=name: _checked(analyzer_registry.run_analyzer(name, text)),
+             kinds=("plain", "markdown", "pii"))
+        for name in analyzer_registry.ALL_METRICS
+    ]
+
+    def incremental_warm(text):
+        # Cache primed in prepare, so this measures re-analysis of an unchanged document.
+        return llm_validator.collect_stats(text, _available_metrics(), True)
+
+    def prime(text):
+        incremental_analysis.clear_cache()
+        llm_validator.collect_stats(text, _available_metrics(), True)
+        return text
+
+    cases.append(Case("collect_stats.full", lambda text: llm_validator.collect_stats(text, _available_metrics()),
+                      kinds=("plain",)))
+    cases.append(Case("collect_stats.incremental_warm", incremental_warm, kinds=("plain",), prepare=prime))
+    return cases
+
+
+def _humanize_cases():
+    from post_humanizer import humanize
+    return [
+        Case(f"humanize.{strength}", lambda text, strength=strength: humanize(text, strength, random.getrandbits(32)),
+             kinds=("plain",))
+        for strength in ("light", "medium", "aggressive")
+    ]
+
+
+def _loader_cases():
+    from text_sanitization import document_loading
+
+    def loader(extension, encode):
+        return Case(
+            f"load.{extension}",
+            lambda data: document_loading.load_bytes_content(data, f"bench.{extension}"),
+            kinds=("html",) if extension == "html" else ("plain",),
+            prepare=encode,
+        )
+
+    return [
+        loader("txt", lambda text: text.encode("utf-8")),
+        loader("html", lambda text: text.encode("utf-8")),
+        loader("docx", corpus.as_docx),
+        loader("pdf", corpus.as_pdf),
+    ]
+
+
+_available = None
+
+
+def _available_metrics():
+    """The analyzers that can run here (the others need a spaCy model that is not installed)."""
+    global _available
+    if _available is None:
+        import analyzer_registry
+        probe = "A short probe sentence. And another one here."
+        _available = [m for m in analyzer_registry.ALL_METRICS if "error" not in analyzer_registry.run_analyzer(m, probe)]
+    return _available
+
+
+class _Skip(Exception):
+    pass
+
+
+def _checked(result):
+    if isinstance(result, dict) and "error" in result:
+        raise _Skip(result["error"])
+    return result
+
+
+def all_cases():
+    return _sanitizer_cases() + _analysis_cases() + _humanize_cases() + _loader_cases()
+
+
+def _measure(case, arg, repeat, max_seconds):
+    case.run(arg)  # warm-up: lazy loads, caches, regex compilation
+
+    timings = []
+    budget_end = time.perf_counter() + max_seconds
+    while len(timings) < repeat:
+        start = time.perf_counter()
+        case.run(arg)
+        timings.append(time.perf_counter() - start)
+        # Slow inputs stop early once the budget is spent (the first run always counts).
+        if time.perf_counter() > budget_end:
+            break
+
+    tracemalloc.start()
+    try:
+        case.run(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return np.array(timings), peak
+
+
+def run_suite(sizes, kinds, prefixes, repeat, max_seconds):
+    results = {}
+    cases = [c for c in all_cases() if not prefixes or c.name.startswith(tuple(prefixes))]
+
+    for case in cases:
+        for kind in (k for k in kinds if k in case.kinds):
+            for size_name in sizes:
+                size = corpus.SIZES[size_name]
+                key = f"{case.name}|{kind}|{size_name}"
+                text = corpus.generate(kind, size)
+                try:
+                    arg = case.prepare(text)
+                    timings, peak = _measure(case, arg, repeat, max_seconds)
+                except _Skip as e:
+                    results[key] = {"skipped": str(e)[:200]}
+                    print(f"{key:<60} skipped")
+                    continue
+
+                p50, p95, p99 = (float(np.percentile(timings, q)) for q in (50, 95, 99))
+                results[key] = {
+                    "runs": len(timings),
+                    "p50_ms": round(p50 * 1000, 3),
+                    "p95_ms": round(p95 * 1000, 3),
+                    "p99_ms": round(p99 * 1000, 3),
+                    "throughput_mb_s": round(size / p50 / 1e6, 3) if p50 > 0 else None,
+                    "peak_mem_kb": round(peak / 1024, 1),
+                }
+                r = results[key]
+                print(f"{key:<60} p50 {r['p50_ms']:>10.2f} ms  p95 {r['p95_ms']:>10.2f} ms  "
+                      f"{r['throughput_mb_s'] or 0:>8.2f} MB/s  peak {r['peak_mem_kb']:>10.1f} KB")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    regressions = []
+    for key, new in current.items():
+        old = baseline.get(key)
+        if not old or "skipped" in old or "skipped" in new:
+            continue
+        if new["p50_ms"] > old["p50_ms"] * (1 + threshold) and new["p50_ms"] - old["p50_ms"] > _NOISE_FLOOR_MS:
+            regressions.append((key, "p50_ms", old["p50_ms"], new["p50_ms"]))
+        if new["peak_mem_kb"] > old["peak_mem_kb"] * (1 + threshold) and new["peak_mem_kb"] - old["peak_mem_kb"] > 64:
+            regressions.append((key, "peak_mem_kb", old["peak_mem_kb"], new["peak_mem_kb"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=list(corpus.SIZES), choices=list(corpus.SIZES))
+    parser.add_argument("--kinds", nargs="+", default=list(corpus.KINDS), choices=list(corpus.KINDS))
+    parser.add_argument("--cases", nargs="*", default=[], help="Case name prefixes to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="Time budget per case and input")
+    parser.add_argument("--output", help="Write the results to this JSON baseline")
+    parser.add_argument("--compare", help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.kinds, args.cases, args.repeat, args.max_seconds)
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline["results"], results, args.threshold)
+        print(f"\nCompared with {args.compare} (commit {baseline['meta'].get('commit')}):")
+        if not regressions:
+            print("No regressions.")
+        for key, metric, old, new in regressions:
+            print(f"REGRESSION {key:<60} {metric}: {old} -> {new} ({(new / old - 1) * 100:+.0f}%)")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
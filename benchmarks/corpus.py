@@ -0,0 +1,169 @@
+"""
+Deterministic synthetic corpus for the benchmark suite (bench_suite.py).
+
+Each kind stresses a different part of the pipeline:
+- plain: AI-flavoured prose with hedging, stock phrases and repeated n-grams,
+- markdown: headings, emphasis, links, lists, quotes and code fences,
+- html: nested markup, entities, scripts and styles,
+- emoji: prose dense with emoji, ZWJ sequences and skin-tone modifiers,
+- pii: prose full of emails, URLs, IP addresses and phone numbers.
+
+The same (kind, size, seed) always produces the same text, so baselines stay comparable.
+"""
+import io
+import random
+import zipfile
+
+KINDS = ("plain", "markdown", "html", "emoji", "pii")
+
+SIZES = {
+    "1KB": 1_000,
+    "10KB": 10_000,
+    "100KB": 100_000,
+    "1MB": 1_000_000,
+}
+
+_SENTENCES = [
+    "It is important to note that the landscape of modern software is constantly evolving.",
+    "Moreover, teams must delve into the intricate interplay between speed and quality.",
+    "The results were basically quite good, and the team was really happy with them.",
+    "In conclusion, this pivotal moment serves as a testament to their dedication.",
+    "We shipped the fix on Tuesday.",
+    "Nobody expected the migration to take three weeks, but it did.",
+    "Additionally, the new tooling fosters collaboration and underscores best practices.",
+    "Honestly, the old build was slow.",
+    "Furthermore, it could potentially be argued that the approach might arguably work.",
+    "She rewrote the parser in an afternoon and it has not broken since.",
+]
+
+_WORDS = ["data", "model", "team", "release", "parser", "budget", "latency", "cache", "worker", "query"]
+
+_EMOJI = ["😀", "🚀", "🔥", "👍🏽", "👨‍👩‍👧", "🎉", "✅", "🤖", "❤️", "🇧🇬"]
+
+
+def _sentence(rng: random.Random) -> str:
+    if rng.random() < 0.7:
+        return rng.choice(_SENTENCES)
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(5, 14))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, n: int = None) -> str:
+    return " ".join(_sentence(rng) for _ in range(n or rng.randint(3, 6)))
+
+
+def _plain_block(rng):
+    return _paragraph(rng) + "\n\n"
+
+
+def _markdown_block(rng):
+    choice = rng.randint(0, 5)
+    if choice == 0:
+        return f"## {rng.choice(_WORDS).title()} {rng.choice(_WORDS)}\n\n"
+    if choice == 1:
+        return "".join(f"- **{rng.choice(_WORDS)}**: {_sentence(rng)}\n" for _ in range(3)) + "\n"
+    if choice == 2:
+        return f"> {_sentence(rng)}\n> {_sentence(rng)}\n\n"
+    if choice == 3:
+        return f"```python\nprint('{rng.choice(_WORDS)}')\n```\n\n"
+    words = _paragraph(rng).split(" ")
+    for i in range(0, len(words), 7):
+        words[i] = rng.choice([f"*{words[i]}*", f"**{words[i]}**", f"[{words[i]}](https://example.com/{i})", f"`{words[i]}`"])
+    return " ".join(words) + "\n\n"
+
+
+def _html_block(rng):
+    choice = rng.randint(0, 4)
+    if choice == 0:
+        return "<script>var x = 1; console.log('<p>not text</p>');</script>\n"
+    if choice == 1:
+        return "<style>p { color: red; }</style>\n"
+    if choice == 2:
+        items = "".join(f"<li><a href='/x/{i}'>{rng.choice(_WORDS)}</a> &amp; more</li>" for i in range(3))
+        return f"<div class='list'><ul>{items}</ul></div>\n"
+    sentences = [f"<span>{_sentence(rng)}</span>" for _ in range(3)]
+    return f"<div><p>{' '.join(sentences)} &mdash; &quot;quoted&quot; &nbsp;text</p></div>\n"
+
+
+def _emoji_block(rng):
+    words = _paragraph(rng).split(" ")
+    for i in range(0, len(words), 3):
+        words[i] = words[i] + rng.choice(_EMOJI)
+    return " ".join(words) + "\n\n"
+
+
+def _pii_block(rng):
+    n = rng.randint(0, 9999)
+    return (
+        f"{_sentence(rng)} Contact jane.doe{n}@example.com or visit https://example.com/u/{n}?ref=mail. "
+        f"The server at 192.168.{n % 255}.{(n * 7) % 255} logged +1 (555) 01{n % 100:02d}-{n:04d}. "
+        f"{_sentence(rng)}\n\n"
+    )
+
+
+_BLOCKS = {
+    "plain": _plain_block,
+    "markdown": _markdown_block,
+    "html": _html_block,
+    "emoji": _emoji_block,
+    "pii": _pii_block,
+}
+
+
+def generate(kind: str, size: int, seed: int = 0) -> str:
+    """A `kind` document of exactly `size` characters."""
+    rng = random.Random(f"{kind}:{seed}")
+    block = _BLOCKS[kind]
+    parts, length = [], 0
+    while length < size:
+        part = block(rng)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:size]
+
+
+def as_docx(text: str) -> bytes:
+    """A minimal .docx (one paragraph per line) readable by docx2txt."""
+    from xml.sax.saxutils import escape
+    body = "".join(f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(line)}</w:t></w:r></w:p>" for line in text.split("\n"))
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ))
+        z.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/></Relationships>'
+        ))
+        z.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def as_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """A text PDF built with PyMuPDF, `lines_per_page` wrapped lines per page."""
+    import textwrap
+
+    import fitz
+
+    lines = [wrapped for line in text.split("\n") for wrapped in (textwrap.wrap(line, 90) or [""])]
+    pdf = fitz.open()
+    for start in range(0, max(1, len(lines)), lines_per_page):
+        page = pdf.new_page()
+        page.insert_text((36, 40), "\n".join(lines[start:start + lines_per_page]), fontsize=9)
+    data = pdf.tobytes()
+    pdf.close()
+    return data
@@ -0,0 +1,91 @@
+"""
+A local stand-in for the Cloudflare Workers AI chat model, for offline load tests.
+
+Streaming calls (the rewrite) wait `first_token_latency` seconds, then emit `<final_text>`, a
+generated body of `output_tokens` words at `tokens_per_second`, and `</final_text>`, one word
+per chunk like the real model. Non-streaming calls (the critique) wait `critique_latency` seconds
+and answer with a valid critique JSON. `failure_rate` makes that fraction of calls raise.
+
+Install it with `install(FakeChatModel(...))` before the web app is imported.
+"""
+import asyncio
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_WORDS = ["the", "team", "shipped", "a", "fix", "and", "it", "worked", "fine", "after", "that", "week"]
+
+
+class FakeLLMError(RuntimeError):
+    pass
+
+
+class FakeChatModel(BaseChatModel):
+    tokens_per_second: float = 50.0
+    first_token_latency: float = 0.3
+    output_tokens: int = 200
+    critique_latency: float = 1.0
+    failure_rate: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-workers-ai"
+
+    def _maybe_fail(self):
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise FakeLLMError("Injected upstream failure")
+
+    def _tokens(self) -> List[str]:
+        words = [random.choice(_WORDS) for _ in range(self.output_tokens)]
+        body = [w + (".\n\n" if i % 60 == 59 else ". " if i % 12 == 11 else " ") for i, w in enumerate(words)]
+        return ["<final_text>\n"] + body + ["\n</final_text>"]
+
+    def _critique(self) -> AIMessage:
+        return AIMessage(content=json.dumps({
+            "validation_of_stats": {},
+            "stylistic_issues": ["Uniform sentence length"],
+            "recommended_actions": ["Vary the rhythm"],
+            "ai_score": round(random.uniform(3, 8), 1),
+        }))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.critique_latency)
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=self._critique())])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.critique_latency)
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=self._critique())])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.first_token_latency)
+        self._maybe_fail()
+        for token in self._tokens():
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+            time.sleep(1.0 / self.tokens_per_second)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.first_token_latency)
+        self._maybe_fail()
+        for token in self._tokens():
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+            await asyncio.sleep(1.0 / self.tokens_per_second)
+
+
+def install(model: BaseChatModel):
+    """Makes `llm_info.get_llm()` (and so `llm_info.llm`) return `model`."""
+    import _paths  # noqa: F401 — centralised path setup
+    import llm_info
+
+    llm_info._llm = model
+    llm_info.get_llm = lambda: model
@@ -0,0 +1,195 @@
+"""
+Load test for the streaming /api/process rewrite endpoint, fully offline.
+
+Usage:
+    python benchmarks/load_test.py [--concurrency 1 2 4 8 16 32] [--requests-per-client 3]
+                                   [--tokens-per-second 50] [--first-token-latency 0.3]
+                                   [--output-tokens 200] [--critique-latency 1.0] [--failure-rate 0]
+                                   [--text-size 3000] [--output results.json]
+
+The app runs in-process under uvicorn, with `llm_info.get_llm` swapped for the fake chat model in
+benchmarks/fake_llm.py, and the anonymous rate limiter lifted. For each concurrency level, that many
+clients each send --requests-per-client rewrite requests back to back and read the NDJSON stream.
+
+Reported per level:
+- req/s: completed streams per second,
+- ttfc: time to the first "chunk" event (p50/p95),
+- done: time to the "done" event (p50/p95),
+- jitter: the 95th percentile gap between consecutive chunks, per stream (p50 across streams),
+- errors: the share of requests that failed (HTTP error, "error" event, an in-band "[Error: ...]"
+  chunk from the rewriting agent, missing "done", exception).
+
+The level where req/s stops growing while ttfc keeps rising is the worker's saturation point.
+The app runs with VERCEL=1 so its SQLite database goes to /tmp instead of the source tree.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("VERCEL", "1")
+os.environ.setdefault("AUTH_SECRET", "load-test")
+
+import _paths  # noqa: E402,F401 — centralised path setup
+import corpus  # noqa: E402
+import fake_llm  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int):
+    import uvicorn
+
+    from web_app.main import app
+    from web_app.services import rate_limiter
+
+    rate_limiter.anonymous_rewrite_limiter.max_requests = 10 ** 9
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def _one_request(client, url: str, text: str) -> dict:
+    start = time.perf_counter()
+    chunk_times = []
+    result = {"error": None, "ttfc": None, "done": None, "jitter": None}
+    try:
+        async with client.stream("POST", url, data={"action": "rewrite", "text": text}) as response:
+            if response.status_code != 200:
+                result["error"] = f"HTTP {response.status_code}"
+                return result
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                now = time.perf_counter() - start
+                if event["type"] == "chunk":
+                    chunk_times.append(now)
+                    # The rewriting agent reports LLM failures in-band rather than as an error event.
+                    if str(event["data"]).startswith("[Error:"):
+                        result["error"] = str(event["data"])
+                elif event["type"] == "done":
+                    result["done"] = now
+                elif event["type"] == "error":
+                    result["error"] = str(event["data"])[:200]
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    if chunk_times:
+        result["ttfc"] = chunk_times[0]
+    if len(chunk_times) > 2:
+        result["jitter"] = float(np.percentile(np.diff(chunk_times), 95))
+    if result["error"] is None and result["done"] is None:
+        result["error"] = "Stream ended without a done event"
+    return result
+
+
+async def _run_level(base_url: str, concurrency: int, per_client: int, text: str) -> dict:
+    import httpx
+
+    url = f"{base_url}/api/process"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=300, limits=limits) as client:
+        async def client_loop():
+            return [await _one_request(client, url, text) for _ in range(per_client)]
+
+        start = time.perf_counter()
+        batches = await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    results = [r for batch in batches for r in batch]
+    ok = [r for r in results if r["error"] is None]
+
+    def pct(values, q):
+        values = [v for v in values if v is not None]
+        return round(float(np.percentile(values, q)), 3) if values else None
+
+    errors = [r["error"] for r in results if r["error"] is not None]
+    return {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "req_per_s": round(len(ok) / elapsed, 2),
+        "ttfc_p50": pct([r["ttfc"] for r in ok], 50),
+        "ttfc_p95": pct([r["ttfc"] for r in ok], 95),
+        "done_p50": pct([r["done"] for r in ok], 50),
+        "done_p95": pct([r["done"] for r in ok], 95),
+        "jitter_p50": pct([r["jitter"] for r in ok], 50),
+        "error_rate": round(len(errors) / len(results), 3),
+        "sample_errors": sorted(set(errors))[:3],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--requests-per-client", type=int, default=3)
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--first-token-latency", type=float, default=0.3)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--critique-latency", type=float, default=1.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--text-size", type=int, default=3000, help="Characters of input text per request")
+    parser.add_argument("--output", help="Write the per-level results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's INFO logs")
+    args = parser.parse_args()
+
+    fake_llm.install(fake_llm.FakeChatModel(
+        tokens_per_second=args.tokens_per_second,
+        first_token_latency=args.first_token_latency,
+        output_tokens=args.output_tokens,
+        critique_latency=args.critique_latency,
+        failure_rate=args.failure_rate,
+    ))
+
+    port = _free_port()
+    server, thread = _start_server(port)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+    text = corpus.generate("plain", args.text_size)
+
+    levels = []
+    print(f"{'conc':>5}{'reqs':>6}{'req/s':>8}{'ttfc p50':>10}{'ttfc p95':>10}"
+          f"{'done p50':>10}{'done p95':>10}{'jitter':>9}{'errors':>8}")
+    try:
+        for concurrency in args.concurrency:
+            level = asyncio.run(_run_level(f"http://127.0.0.1:{port}", concurrency, args.requests_per_client, text))
+            levels.append(level)
+            fmt = lambda v: f"{v:.3f}" if v is not None else "-"  # noqa: E731
+            print(f"{level['concurrency']:>5}{level['requests']:>6}{level['req_per_s']:>8}"
+                  f"{fmt(level['ttfc_p50']):>10}{fmt(level['ttfc_p95']):>10}"
+                  f"{fmt(level['done_p50']):>10}{fmt(level['done_p95']):>10}"
+                  f"{fmt(level['jitter_p50']):>9}{level['error_rate']:>8.1%}")
+            for error in level["sample_errors"]:
+                print(f"      error: {error}")
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "levels": levels}, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Opt-in per-request cProfile capture for /api/process, for finding hot spots in real traffic.
+
+A request is profiled when any trigger fires, decided before it runs:
+- header: it carries `X-Profile-Token` equal to PROFILE_TOKEN (unset: the header is ignored),
+- sample: a random draw below PROFILE_SAMPLE_RATE (0..1, default 0).
+With PROFILE_SLOW_MS set, sampled profiles are only kept when the request took longer than that;
+header-triggered profiles are always kept. Unsampled requests never run under cProfile.
+
+It achieves this by:
+1. Keeping the request's profile in a context variable, so it follows the request into tasks.
+2. Running each `to_thread` hop under its own cProfile.Profile in the worker thread.
+3. Profiling the streamed response's generator only while one of its steps runs on the event loop,
+   so other requests sharing the loop are not attributed to it.
+4. Merging all parts with pstats on completion and saving `<id>.prof` (open it with pstats or
+   snakeviz) plus `<id>.json` (request metadata and the top functions) to PROFILE_DIR.
+
+The end goal is a profile of one slow production request without reproducing it.
+Threads started by libraries inside a hop (e.g. langchain's batch executor) are not covered.
+"""
+import asyncio
+import cProfile
+import contextvars
+import json
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['start', 'finish', 'to_thread', 'profile_stream', 'configure']
+
+HEADER = "X-Profile-Token"
+_TOP_FUNCTIONS = 25
+
+_current = contextvars.ContextVar('request_profile', default=None)
+
+_token = None
+_sample_rate = 0.0
+_slow_ms = None
+_directory = None
+
+
+def configure(token: str = None, sample_rate: float = None, slow_ms: float = None, directory: str = None):
+    """(Re)reads the triggers; called once on import with the environment settings."""
+    global _token, _sample_rate, _slow_ms, _directory
+    _token = token if token is not None else os.getenv("PROFILE_TOKEN") or None
+    _sample_rate = sample_rate if sample_rate is not None else float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    if slow_ms is None and os.getenv("PROFILE_SLOW_MS"):
+        slow_ms = float(os.environ["PROFILE_SLOW_MS"])
+    _slow_ms = slow_ms
+    _directory = directory or os.getenv("PROFILE_DIR", "/tmp/profiles" if os.environ.get("VERCEL") else "profiles")
+
+
+class RequestProfile:
+    def __init__(self, triggers, metadata):
+        self.id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.triggers = triggers
+        self.metadata = metadata
+        self.hops = {}
+        self.skipped_hops = 0
+        self._parts = []
+        self._loop_profiler = None
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._finished = False
+
+    def run(self, label: str, fn, *args, **kwargs):
+        """Runs `fn` under a fresh profiler on the calling thread and keeps its stats."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process; concurrent hops lose out.
+            with self._lock:
+                self.skipped_hops += 1
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._parts.append(profiler)
+                self.hops[label] = self.hops.get(label, 0) + 1
+
+    def step(self, fn, *args):
+        """Runs one event-loop step of the request under its (reused) event-loop profiler."""
+        if self._loop_profiler is None:
+            self._loop_profiler = cProfile.Profile()
+            with self._lock:
+                self._parts.append(self._loop_profiler)
+        self.hops["event_loop"] = self.hops.get("event_loop", 0) + 1
+        try:
+            self._loop_profiler.enable()
+        except ValueError:
+            return fn(*args)
+        try:
+            return fn(*args)
+        finally:
+            self._loop_profiler.disable()
+
+    def _stats(self):
+        with self._lock:
+            parts = list(self._parts)
+        if not parts:
+            return None
+        stats = pstats.Stats(parts[0])
+        for part in parts[1:]:
+            stats.add(part)
+        return stats
+
+
+def _triggers(request) -> list:
+    triggers = []
+    if _token and request is not None and request.headers.get(HEADER) == _token:
+        triggers.append("header")
+    if _sample_rate and random.random() < _sample_rate:
+        triggers.append("sample")
+    return triggers
+
+
+def start(request, **metadata):
+    """Starts profiling the current request if a trigger fires; returns the profile or None."""
+    triggers = _triggers(request)
+    if not triggers:
+        return None
+    if request is not None:
+        metadata = {"method": request.method, "path": request.url.path, **metadata}
+    profile = RequestProfile(triggers, metadata)
+    _current.set(profile)
+    return profile
+
+
+def finish(profile, status: str = None):
+    """Saves the profile, unless it was only sampled and the request was faster than PROFILE_SLOW_MS."""
+    if profile is None or profile._finished:
+        return None
+    profile._finished = True
+    duration_ms = (time.perf_counter() - profile._start) * 1000
+
+    triggers = list(profile.triggers)
+    if _slow_ms is not None and triggers == ["sample"] and duration_ms < _slow_ms:
+        return None
+
+    stats = profile._stats()
+    if stats is None:
+        return None
+
+    os.makedirs(_directory, exist_ok=True)
+    base = os.path.join(_directory, profile.id)
+    try:
+        stats.dump_stats(base + ".prof")
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "id": profile.id,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "pid": os.getpid(),
+                "triggers": triggers,
+                "status": status,
+                "duration_ms": round(duration_ms, 1),
+                "hops": profile.hops,
+                "skipped_hops": profile.skipped_hops,
+                **profile.metadata,
+                "top_functions": _top_functions(stats),
+            }, f, indent=2, default=str)
+    except OSError as e:
+        logger.warning("Could not save profile %s: %s", profile.id, e)
+        return None
+    logger.info("Saved request profile %s (%.0f ms, %s)", base, duration_ms, ", ".join(triggers))
+    return base
+
+
+def _top_functions(stats) -> list:
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{name} ({os.path.basename(filename)}:{line})",
+            "calls": ncalls,
+            "tottime_ms": round(tottime * 1000, 2),
+            "cumtime_ms": round(cumtime * 1000, 2),
+        })
+    rows.sort(key=lambda r: r["cumtime_ms"], reverse=True)
+    return rows[:_TOP_FUNCTIONS]
+
+
+async def to_thread(fn, *args, **kwargs):
+    """asyncio.to_thread that profiles `fn` in the worker thread when the request is profiled."""
+    profile = _current.get()
+    if profile is None:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    label = getattr(fn, "__qualname__", repr(fn))
+    return await asyncio.to_thread(profile.run, label, fn, *args, **kwargs)
+
+
+class _ProfiledStep:
+    """Drives one awaitable, profiling only while it runs (not while it is suspended)."""
+
+    def __init__(self, awaitable, profile):
+        self._awaitable = awaitable
+        self._profile = profile
+
+    def __await__(self):
+        iterator = self._awaitable.__await__()
+        send, value, error = iterator.send, None, None
+        while True:
+            try:
+                if error is None:
+                    yielded = self._profile.step(send, value)
+                else:
+                    yielded = self._profile.step(iterator.throw, error)
+            except StopIteration as stop:
+                return stop.value
+            value, error = None, None
+            try:
+                value = yield yielded
+            except BaseException as e:
+                error = e
+
+
+async def profile_stream(profile, stream, status: str = "ok"):
+    """Wraps a streamed response's async generator so it is profiled and the profile saved at the end."""
+    if profile is None:
+        async for item in stream:
+            yield item
+        return
+
+    _current.set(profile)
+    try:
+        while True:
+            try:
+                item = await _ProfiledStep(stream.__anext__(), profile)
+            except StopAsyncIteration:
+                break
+            yield item
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        await stream.aclose()
+        finish(profile, status)
+
+
+configure()
@@ -4,33 +4,63 @@ Shared Spacy NLP model loader.
 This module provides a single, lazily-loaded Spacy model instance that is shared
 across all modules that need NLP processing (hedging_filler_detector, imperfection_injector).
 This avoids loading the same ~50MB model multiple times into memory.
+
+spaCy itself is only imported when a model is first requested, so importing this module is free.
+The model is meant to be installed at build time (it is pinned in requirements.txt). Downloading it
+at runtime is a fallback for local development only and is disabled on Vercel, where it would
+happen inside a cold start; set SPACY_MODEL_AUTO_DOWNLOAD=1/0 to override.
+
+Each getter loads its model under its own lock, so concurrent first requests load it only once.
 """
-import spacy
-import spacy.cli
+import os
+import threading
+
+_MODEL_NAME = "en_core_web_sm"
+_AUTO_DOWNLOAD = os.getenv(
+    "SPACY_MODEL_AUTO_DOWNLOAD", "0" if (os.environ.get("VERCEL") or os.environ.get("VERCEL_ENV")) else "1"
+) == "1"
 
 _nlp_full = None
 _nlp_light = None
 _nlp_tagger = None
+_nlp_blank = None
+
+_full_lock = threading.Lock()
+_light_lock = threading.Lock()
+_tagger_lock = threading.Lock()
+_blank_lock = threading.Lock()
+
+
+def _load_model(disable=()):
+    import spacy
+
+    try:
+        return spacy.load(_MODEL_NAME, disable=list(disable))
+    except OSError:
+        if not _AUTO_DOWNLOAD:
+            raise OSError(
+                f"Spacy model '{_MODEL_NAME}' is not installed. Install it at build time "
+                f"(see requirements.txt) or run `python -m spacy download {_MODEL_NAME}`."
+            )
+        import spacy.cli
+        spacy.cli.download(_MODEL_NAME)
+        return spacy.load(_MODEL_NAME, disable=list(disable))
 
 
 def get_nlp_full():
     global _nlp_full
     if _nlp_full is None:
-        try:
-            _nlp_full = spacy.load("en_core_web_sm")
-        except OSError:
-            spacy.cli.download("en_core_web_sm")
-            _nlp_full = spacy.load("en_core_web_sm")
+        with _full_lock:
+            if _nlp_full is None:
+                _nlp_full = _load_model()
     return _nlp_full
 
 def get_nlp_tagger():
     global _nlp_tagger
     if _nlp_tagger is None:
-        try:
-            _nlp_tagger = spacy.load("en_core_web_sm", disable=["ner", "textcat", "entity_linker"])
-        except OSError:
-            spacy.cli.download("en_core_web_sm")
-            _nlp_tagger = spacy.load("en_core_web_sm", disable=["ner", "textcat", "entity_linker"])
+        with _tagger_lock:
+            if _nlp_tagger is None:
+                _nlp_tagger = _load_model(disable=["ner", "textcat", "entity_linker"])
     return _nlp_tagger
 
 
@@ -38,17 +68,30 @@ def get_nlp_light():
     """Returns a lightweight en_core_web_sm model (NER, lemmatizer, textcat disabled)."""
     global _nlp_light
     if _nlp_light is None:
-        try:
-            _nlp_light = spacy.load("en_core_web_sm", disable=["ner", "lemmatizer", "textcat", "entity_linker"])
-        except OSError:
-            spacy.cli.download("en_core_web_sm")
-            _nlp_light = spacy.load("en_core_web_sm", disable=["ner", "lemmatizer", "textcat", "entity_linker"])
+        with _light_lock:
+            if _nlp_light is None:
+                _nlp_light = _load_model(disable=["ner", "lemmatizer", "textcat", "entity_linker"])
     return _nlp_light
 
 
+def get_nlp_blank():
+    """
+    Returns a blank English pipeline: the same tokenizer and lexical attributes
+    (like_email, like_url, is_punct, lower...) as the model, without loading any weights.
+    """
+    global _nlp_blank
+    if _nlp_blank is None:
+        with _blank_lock:
+            if _nlp_blank is None:
+                import spacy
+                _nlp_blank = spacy.blank("en")
+    return _nlp_blank
+
+
 def clear_nlp_models():
     """Clears all loaded NLP models from memory."""
-    global _nlp_full, _nlp_light, _nlp_tagger
+    global _nlp_full, _nlp_light, _nlp_tagger, _nlp_blank
     _nlp_full = None
     _nlp_light = None
     _nlp_tagger = None
+    _nlp_blank = None
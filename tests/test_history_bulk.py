@@ -0,0 +1,111 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from web_app import routes_history
+from web_app.auth import get_optional_user
+from web_app.database import Base, get_db
+from web_app.models import HistoryEntry, User
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    with Session() as db:
+        db.add(User(email="user@example.com", password_hash="x", salt="x"))
+        db.commit()
+        user = db.query(User).one()
+        db.expunge(user)
+
+    def override_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(routes_history.router)
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_optional_user] = lambda: user
+
+    with TestClient(app) as test_client:
+        test_client.session_factory = Session
+        yield test_client
+
+
+def _item(i):
+    return {"action_type": "rewrite", "input_text": f"in {i}", "output_text": f"out {i}",
+            "created_at": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}"}
+
+
+def _stored(client):
+    with client.session_factory() as db:
+        return db.query(HistoryEntry).count()
+
+
+def test_bulk_saves_items(client):
+    response = client.post("/api/history/bulk", json=[_item(i) for i in range(3)])
+    assert response.status_code == 200
+    assert response.json() == {"status": "saved", "count": 3}
+    assert _stored(client) == 3
+
+
+def test_bulk_count_is_items_received(client):
+    total = routes_history.MAX_HISTORY_PER_USER + 10
+    response = client.post("/api/history/bulk", json=[_item(i) for i in range(total)])
+    assert response.json()["count"] == total
+    assert _stored(client) == routes_history.MAX_HISTORY_PER_USER
+
+
+def test_bulk_empty_array(client):
+    response = client.post("/api/history/bulk", content=b"  [ ]  ")
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+
+
+@pytest.mark.parametrize("body", [
+    b'{"action_type": "rewrite"}',
+    b'[{"action_type": "rewrite", "input_text": "a", "output_text": "b"} {"x": 1}]',
+    b'[1,, 2]',
+    b'[1, 2] trailing',
+    b'not json',
+])
+def test_bulk_malformed_array(client, body):
+    response = client.post("/api/history/bulk", content=body)
+    assert response.status_code == 422
+    assert _stored(client) == 0
+
+
+@pytest.mark.parametrize("body", [
+    b'[',
+    b'[{"action_type": "rewrite", "input_text": "a", "output_text": "b"}',
+    b'[{"action_type": "rewrite", "input_text": "a", "output_te',
+    b'[{"action_type": "rewrite", "input_text": "a", "output_text": "b"},',
+    b'',
+])
+def test_bulk_truncated_array(client, body):
+    response = client.post("/api/history/bulk", content=body)
+    assert response.status_code == 422
+    assert _stored(client) == 0
+
+
+def test_bulk_invalid_item(client):
+    response = client.post("/api/history/bulk", json=[{"action_type": "rewrite"}])
+    assert response.status_code == 422
+    assert _stored(client) == 0
+
+
+def test_bulk_body_too_large(client, monkeypatch):
+    monkeypatch.setattr(routes_history, "MAX_BULK_BODY_BYTES", 64)
+    response = client.post("/api/history/bulk", json=[_item(i) for i in range(5)])
+    assert response.status_code == 413
+    assert _stored(client) == 0
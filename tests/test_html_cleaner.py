@@ -0,0 +1,59 @@
+import pytest
+
+from text_sanitization import html_cleaner
+
+FIXTURES = {
+    "paragraphs": "<p>First paragraph.</p>\n<p>Second <b>bold</b> paragraph.</p>",
+    "crlf": "<p>Line one\r\nline two</p>\r\n<p>Three\rfour</p>",
+    "nul": "<p>a\x00b</p><p>\x00</p><p>c</p>",
+    "noscript": "<div>Before<noscript><p>Enable JS</p> please</noscript>After</div>",
+    "head_noscript": "<html><head><title>Title</title><noscript><style>p {}</style></noscript></head>"
+                     "<body><p>Body</p></body></html>",
+    "nested": "<ul>\n  <li> one <b>bold</b> </li>\n  <li>two</li>\n</ul>",
+    "entities": "<p>Fish &amp; chips&nbsp;&lt;3 &copy;</p>",
+    "scripts": "<p>x</p><script>var a = 1;</script><style>p { color: red; }</style><p>y</p>",
+    "template": "<p>shown</p><template><p>hidden</p></template>",
+    "comment": "<p>a<!-- hidden -->b</p>",
+    "textarea": "<form><textarea>typed\ntext</textarea></form>",
+    "pre": "<pre>code\n<span>   </span>\n  indented</pre><div>\n\n</div><div>  </div>",
+    "inline": "<p>Split<span>word</span> and <i>more</i>.</p>",
+    "plain": "just text & more",
+    "empty": "",
+}
+
+CALLS = [
+    {"separator": " ", "strip": False},
+    {"separator": "\n", "strip": True},
+    {"separator": " ", "strip": False, "drop_tags": ("script", "style")},
+    {"separator": "\n", "strip": True, "drop_tags": ("script", "style")},
+]
+
+BACKENDS = html_cleaner.available_backends()
+
+
+@pytest.mark.skipif(len(BACKENDS) < 2, reason="needs selectolax and a BeautifulSoup backend")
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+@pytest.mark.parametrize("kwargs", CALLS, ids=lambda kwargs: "-".join(f"{k}={v!r}" for k, v in kwargs.items()))
+def test_backends_agree(name, kwargs):
+    results = {
+        backend: html_cleaner.html_to_text(FIXTURES[name], backend=backend, **kwargs)
+        for backend in BACKENDS
+    }
+    assert len(set(results.values())) == 1, results
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_bytes_input(backend):
+    markup = "<p>Café</p><p>crème</p>".encode("utf-8")
+    assert html_cleaner.html_to_text(markup, separator="\n", strip=True, backend=backend) == "Café\ncrème"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_nul_does_not_split_text(backend):
+    text = html_cleaner.html_to_text("<p>a\x00b</p><p>c</p>", separator="\n", strip=True, backend=backend)
+    assert text == "ab\nc"
+
+
+def test_clean_html_drops_scripts():
+    assert html_cleaner.clean_html("<p>Hello</p><script>alert(1)</script><p>world</p>") == "Hello world"
+    assert html_cleaner.clean_html("  no markup  ") == "no markup"
@@ -0,0 +1,53 @@
+import pytest
+
+import analyzer_registry
+import incremental_analysis
+import shared_nlp
+
+TEXTS = [
+    "Basically, this is a test.\n\nIt is really quite good.\n\nThe end, honestly.",
+    "  Indented start.  \n\n\n\nI think maybe we should go. \n\n",
+    "One paragraph only, basically.",
+    "\n\nLeading gap.\n\n \n\nTrailing gap.\t",
+    "   ",
+    "",
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    incremental_analysis.clear_cache()
+    yield
+    incremental_analysis.clear_cache()
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_hedging_matches_full_analysis(text):
+    incremental = incremental_analysis.collect_stats_incremental(text, ["hedging"])["hedging"]
+    full = analyzer_registry.run_analyzers(text, ["hedging"])["hedging"]
+    assert incremental["original_word_count"] == full["original_word_count"]
+    assert incremental["filler_count"] == full["filler_count"]
+    assert incremental["filler_density"] == pytest.approx(full["filler_density"])
+
+
+def test_cached_paragraphs_give_the_same_counts():
+    text = TEXTS[0]
+    first = incremental_analysis.collect_stats_incremental(text, ["hedging"])
+    second = incremental_analysis.collect_stats_incremental(text, ["hedging"])
+    assert first == second
+
+
+def test_text_metrics_survive_a_missing_model(monkeypatch):
+    def missing_model(*args, **kwargs):
+        raise OSError("model not installed")
+
+    monkeypatch.setattr(shared_nlp, "get_nlp_tagger", missing_model)
+    text = "This is very, very important.\n\nReally, it is."
+    metrics = ["flagged_words", "verb_frequency", "hedging"]
+
+    incremental = incremental_analysis.collect_stats_incremental(text, metrics)
+    full = analyzer_registry.run_analyzers(text, metrics)
+
+    assert "error" not in incremental["flagged_words"]
+    assert incremental["flagged_words"] == full["flagged_words"]
+    assert "error" in incremental["verb_frequency"]
@@ -0,0 +1,169 @@
+import json
+import os
+import socket
+import sys
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import fake_llm  # noqa: E402
+import llm_info  # noqa: E402
+from web_app import routes_jobs  # noqa: E402
+from web_app.auth import get_optional_user  # noqa: E402
+from web_app.database import Base, get_db  # noqa: E402
+from web_app.models import RewriteJob  # noqa: E402
+from web_app.services import job_queue, rewrite_pipeline  # noqa: E402
+
+TEXT = "This is a sample paragraph that needs rewriting. " * 5
+EVENT_BATCH = 3
+
+
+def _install_model(monkeypatch, **settings):
+    # Restored by monkeypatch; the rewriting agent binds the model when it is created.
+    monkeypatch.setattr(llm_info, "_llm", None)
+    monkeypatch.setattr(llm_info, "get_llm", llm_info.get_llm)
+    fake_llm.install(fake_llm.FakeChatModel(first_token_latency=0.01, critique_latency=0.01, **settings))
+    monkeypatch.setattr(rewrite_pipeline, "rewriting_agent", rewrite_pipeline.rewriting_agent.__class__())
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    # A database file rather than a StaticPool: jobs write from worker threads while requests
+    # read, and one shared connection would interleave their transactions.
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    def override_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    queue = job_queue.JobQueue(workers=1)
+    monkeypatch.setattr(job_queue, "SessionLocal", Session)
+    monkeypatch.setattr(job_queue, "REWRITE_JOBS_ENABLED", True)
+    monkeypatch.setattr(job_queue, "REWRITE_JOB_EVENT_BATCH", EVENT_BATCH)
+    monkeypatch.setattr(job_queue, "JOB_FLUSH_SECONDS", 60)
+    monkeypatch.setattr(routes_jobs, "REWRITE_JOBS_ENABLED", True)
+    monkeypatch.setattr(routes_jobs, "job_queue", queue)
+    monkeypatch.setattr(routes_jobs, "check_rewrite_allowed", lambda *args: None)
+    _install_model(monkeypatch, tokens_per_second=2000, output_tokens=40)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        queue.start()
+        yield
+        await queue.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(routes_jobs.router)
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_optional_user] = lambda: None
+    app.state.session_factory = Session
+    return app
+
+
+def _events(client, job_id, offset=0):
+    response = client.get(f"/api/jobs/{job_id}/events", params={"offset": offset})
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def _create(client):
+    response = client.post("/api/jobs", data={"text": TEXT})
+    assert response.status_code == 202
+    return response.json()["job_id"]
+
+
+def _wait_for_status(client, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] == status:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} never reached {status!r}")
+
+
+def _stale_job(Session, status):
+    # Same host and PID as this process, but an earlier boot.
+    with Session() as db:
+        job = job_queue.JobQueue().create_job(db, None, TEXT, TEXT, [], "medium")
+        job.owner = f"{socket.gethostname()}:{os.getpid()}:oldboot"
+        job.status = status
+        db.commit()
+        return job.id
+
+
+def test_follow_and_resume(app):
+    with TestClient(app) as client:
+        job_id = _create(client)
+        events = _events(client, job_id)
+
+        assert events[0]["type"] == "stage"
+        assert events[-1] == {"type": "job", "data": {"status": "done"}}
+        assert client.get(f"/api/jobs/{job_id}").json()["event_count"] == len(events)
+        assert _events(client, job_id, offset=3) == events[3:]
+        assert _events(client, job_id, offset=len(events)) == []
+
+
+def test_events_are_written_in_batches(app, monkeypatch):
+    batches = []
+    write_events = job_queue._write_events
+
+    def recording_write(job_id, first_seq, payloads):
+        batches.append((first_seq, len(payloads)))
+        return write_events(job_id, first_seq, payloads)
+
+    monkeypatch.setattr(job_queue, "_write_events", recording_write)
+    with TestClient(app) as client:
+        job_id = _create(client)
+        events = _events(client, job_id)
+
+    # Full batches only; the remainder is committed together with the final event.
+    streamed = len(events) - 1
+    assert batches == [(seq, EVENT_BATCH) for seq in range(0, streamed - streamed % EVENT_BATCH, EVENT_BATCH)]
+    assert len(batches) >= 2
+
+
+def test_cancel_running_and_queued(app, monkeypatch):
+    _install_model(monkeypatch, tokens_per_second=20, output_tokens=200)
+    with TestClient(app) as client:
+        running = _create(client)
+        queued = _create(client)
+        _wait_for_status(client, running, "running")
+        assert client.get(f"/api/jobs/{queued}").json()["status"] == "queued"
+
+        assert client.delete(f"/api/jobs/{queued}").json()["status"] == "cancelling"
+        assert _events(client, queued) == [{"type": "job", "data": {"status": "cancelled"}}]
+
+        assert client.delete(f"/api/jobs/{running}").status_code == 200
+        events = _events(client, running)
+        assert events[-1] == {"type": "job", "data": {"status": "cancelled"}}
+        assert client.get(f"/api/jobs/{running}").json()["event_count"] == len(events)
+
+        assert client.delete(f"/api/jobs/{running}").status_code == 409
+
+
+def test_orphaned_jobs_are_taken_over(app):
+    Session = app.state.session_factory
+    queued = _stale_job(Session, "queued")
+    running = _stale_job(Session, "running")
+
+    with TestClient(app) as client:
+        assert _events(client, queued)[-1] == {"type": "job", "data": {"status": "done"}}
+        assert _events(client, running) == [
+            {"type": "job", "data": {"status": "failed", "error": "Interrupted by a server restart"}}
+        ]
+
+    with Session() as db:
+        assert {job.owner for job in db.query(RewriteJob)} == {job_queue.OWNER}
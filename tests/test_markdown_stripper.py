@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+from text_sanitization.markdown_stripper import strip_markdown
+
+CASES = {
+    "empty": ("", ""),
+    "plain": ("just text", "just text"),
+    "heading": ("# Heading *x*", "Heading x"),
+    "horizontal_rule": ("above\n---\nbelow", "above\n\nbelow"),
+    "quote": ("> quoted", "quoted"),
+    "nested_quote": (">> nested quote", "nested quote"),
+    "spaced_nested_quote": ("> > spaced", "spaced"),
+    "backtick_fence": ("```\nfenced *x*\n```\nafter", "fenced *x*\nafter"),
+    "tilde_fence": ("~~~\ncode *x*\n~~~\nafter", "code *x*\nafter"),
+    "longer_closing_fence": ("~~~python\nx\n~~~~", "x"),
+    "code_span": ("use `a*b*` here", "use a*b* here"),
+    "double_backtick_code_span": ("``a ` b`` end", "a ` b end"),
+    "unclosed_code_span": ("a `b", "a `b"),
+    "snake_case": ("snake_case_name and _em_", "snake_case_name and em"),
+    "bold_and_italic": ("**bold** and *it*", "bold and it"),
+    "nested_emphasis": ("a **b *c* d** e", "a b c d e"),
+    "underscore_strong": ("__strong__", "strong"),
+    "unclosed_bold": ("unclosed **bold", "unclosed **bold"),
+    "link_and_image": ("[link](http://x) ![img](a.png)", "link img"),
+    "unclosed_link": ("[text](no close", "[text](no close"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_strip_markdown(name):
+    text, expected = CASES[name]
+    assert strip_markdown(text) == expected
+
+
+@pytest.mark.parametrize("text", ["*a" * 20000, "[" * 20000, "[a](" * 20000, "_a" * 20000, "`" * 20000])
+def test_pathological_input_is_linear(text):
+    start = time.perf_counter()
+    strip_markdown(text)
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,124 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from web_app import routes_process
+
+app = FastAPI()
+app.include_router(routes_process.router)
+client = TestClient(app)
+
+
+def test_upload_text_file():
+    response = client.post("/api/upload", files={"file": ("notes.txt", b"Hello\r\nworld", "text/plain")})
+    assert response.status_code == 200
+    assert response.json() == {"content": "Hello\nworld"}
+
+
+def test_upload_unsupported_extension():
+    response = client.post("/api/upload", files={"file": ("image.png", b"\x89PNG", "image/png")})
+    assert response.status_code == 400
+
+
+def test_upload_without_file():
+    response = client.post("/api/upload", data={"text": "no file"})
+    assert response.status_code == 422
+
+
+def test_upload_over_limit_without_content_length(monkeypatch):
+    monkeypatch.setattr(routes_process, "MAX_UPLOAD_BYTES", 16)
+    response = client.post("/api/upload", files={"file": ("big.txt", b"x" * 64, "text/plain")})
+    assert response.status_code == 413
+
+
+def _call(headers, chunks):
+    """Runs one upload through the ASGI app; returns the status code and the number of body chunks read."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/upload",
+        "raw_path": b"/api/upload",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")] + headers,
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    chunks = list(chunks)
+    reads = []
+    sent = []
+
+    async def receive():
+        index = len(reads)
+        reads.append(True)
+        if index < len(chunks):
+            return {"type": "http.request", "body": chunks[index], "more_body": index + 1 < len(chunks)}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], len(reads)
+
+
+def _multipart(filename, size, chunk_size=64 * 1024):
+    head = (
+        b"--xyz\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="' + filename.encode() + b'"\r\n'
+        b"Content-Type: application/octet-stream\r\n\r\n"
+    )
+    yield head
+    for _ in range(size // chunk_size):
+        yield b"a" * chunk_size
+    yield b"\r\n--xyz--\r\n"
+
+
+_CHUNKED = [(b"content-type", b"multipart/form-data; boundary=xyz"), (b"transfer-encoding", b"chunked")]
+
+
+def test_upload_rejected_on_content_length_before_reading_body():
+    declared = routes_process.MAX_UPLOAD_BYTES + routes_process._MULTIPART_OVERHEAD_BYTES + 1
+    headers = [(b"content-type", b"multipart/form-data; boundary=xyz"), (b"content-length", str(declared).encode())]
+    status, reads = _call(headers, [b""])
+    assert status == 413
+    assert reads == 0
+
+
+def test_unsupported_type_rejected_before_reading_file_body():
+    status, reads = _call(_CHUNKED, _multipart("a.png", 30 * 1024 * 1024))
+    assert status == 400
+    assert reads == 1
+
+
+def test_chunked_upload_stops_at_the_limit():
+    chunks = list(_multipart("a.txt", 30 * 1024 * 1024))
+    status, reads = _call(_CHUNKED, chunks)
+    assert status == 413
+    limit = routes_process.MAX_UPLOAD_BYTES + routes_process._MULTIPART_OVERHEAD_BYTES
+    assert reads * 64 * 1024 <= limit + 2 * 64 * 1024
+    assert reads < len(chunks)
+
+
+def test_accepted_file_stays_in_memory():
+    async def parse():
+        async def stream():
+            for chunk in _multipart("a.txt", 3 * 1024 * 1024):
+                yield chunk
+
+        headers = Headers({"content-type": "multipart/form-data; boundary=xyz"})
+        form = await routes_process._UploadParser(headers, stream(), lambda name: True).parse()
+        upload = form["file"]
+        try:
+            return upload.size, upload.file._rolled
+        finally:
+            await form.close()
+
+    size, rolled_to_disk = asyncio.run(parse())
+    assert size == 3 * 1024 * 1024
+    assert not rolled_to_disk
@@ -0,0 +1,222 @@
+"""
+The AI score model predicts the LLM critique's `ai_score` locally from the `collect_stats` metrics.
+
+Getting the score from the LLM costs a separate round trip on every rewrite, although the statistical
+metrics it is asked to judge are already computed. A small model over those metrics answers in microseconds.
+
+It achieves this by:
+1. Turning the metrics into a fixed feature vector (filler density, AI phrase and flagged word rates,
+   repetition, sentence length variation, readability spread, AI verb density, punctuation structure).
+2. Scoring it with a NumPy logistic regression: score = 1 + 9 * sigmoid(w . standardized(x) + b).
+3. Reporting a confidence that drops near the middle of the scale and when metrics are missing,
+   so callers can fall back to the LLM critique when the local answer is unreliable.
+4. Logging (stats, LLM score) pairs whenever the LLM does run, and retraining from that log with
+   `python text-analysis/ai_score_model.py train`.
+
+The model shipped in `compiled/ai_score_model.json` is a hand-set prior (`trained_on` is 0) until it is
+trained on logged pairs; llm_validator only relies on a trained model unless AI_SCORE_MODE is "local".
+The end goal is to skip the LLM critique whenever the metrics already make the answer clear.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from typing import Optional
+
+import numpy as np
+
+__all__ = ['LocalScore', 'extract_features', 'predict', 'trained_on', 'log_pair', 'train', 'FEATURES']
+
+_DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.getenv("AI_SCORE_MODEL_PATH", os.path.join(_DATA_DIR, 'compiled', 'ai_score_model.json'))
+
+if os.environ.get("VERCEL") or os.environ.get("VERCEL_ENV"):
+    _DEFAULT_LOG_PATH = "/tmp/ai_score_pairs.jsonl"
+else:
+    _DEFAULT_LOG_PATH = os.path.join(_DATA_DIR, 'compiled', 'ai_score_pairs.jsonl')
+PAIRS_LOG_PATH = os.getenv("AI_SCORE_LOG_PATH", _DEFAULT_LOG_PATH)
+
+FEATURES = (
+    'filler_density',
+    'ai_phrases_per_100_words',
+    'flagged_words',
+    'repetitions_per_100_words',
+    'sentence_length_cv',
+    'reading_ease_std',
+    'ai_verb_density',
+    'structure_ratio',
+)
+
+_model = None
+_log_lock = threading.Lock()
+
+
+class LocalScore:
+    __slots__ = ('score', 'confidence')
+
+    def __init__(self, score: float, confidence: float):
+        self.score = score
+        self.confidence = confidence
+
+
+def _metric(stats: dict, name: str) -> dict:
+    result = stats.get(name)
+    return result if isinstance(result, dict) and "error" not in result else None
+
+
+def _sentence_length_cv(result: dict) -> float:
+    # A CV of exactly 0 (perfectly uniform sentences) is a real value; only too few sentences is missing.
+    # Imported here so `ai_score_model.py train` runs without the analyzers' dependencies.
+    from uniform_sentence_len import RESULT_TEMPLATES
+
+    if result['judgment'] == RESULT_TEMPLATES['insufficient'][0]:
+        return np.nan
+    return result['score']
+
+
+def extract_features(stats: dict) -> np.ndarray:
+    """The feature vector for `stats`; features whose metric is missing or failed are NaN."""
+    hedging = _metric(stats, 'hedging')
+    words = hedging.get('original_word_count', 0) if hedging else 0
+    per_100 = 100.0 / words if words else np.nan
+
+    def value(name, fn):
+        result = _metric(stats, name)
+        if result is None:
+            return np.nan
+        try:
+            return float(fn(result))
+        except (KeyError, TypeError, ValueError):
+            return np.nan
+
+    return np.array([
+        value('hedging', lambda r: r['filler_density']),
+        value('ai_phrases', lambda r: r['count'] * per_100),
+        value('flagged_words', lambda r: r['count']),
+        value('repetition', lambda r: r['count'] * per_100),
+        value('sentence_variance', _sentence_length_cv),
+        value('readability', lambda r: r['reading_ease_std'] if r.get('status') == 'success' else np.nan),
+        value('verb_frequency', lambda r: r['ai_verb_density_percentage']),
+        value('punctuation_profile', lambda r: r['structure_ratio']),
+    ], dtype=np.float64)
+
+
+def _load_model() -> dict:
+    global _model
+    if _model is None:
+        with open(MODEL_PATH, 'r', encoding='utf-8') as f:
+            model = json.load(f)
+        if tuple(model['features']) != FEATURES:
+            raise ValueError(f"{MODEL_PATH} was built for different features")
+        _model = {
+            'mean': np.array(model['mean'], dtype=np.float64),
+            'std': np.array(model['std'], dtype=np.float64),
+            'weights': np.array(model['weights'], dtype=np.float64),
+            'bias': float(model['bias']),
+            'trained_on': int(model.get('trained_on', 0)),
+        }
+    return _model
+
+
+def trained_on() -> int:
+    """The number of logged pairs the model was fitted to; 0 for the hand-set prior or no model."""
+    try:
+        return _load_model()['trained_on']
+    except (OSError, ValueError, KeyError):
+        return 0
+
+
+def predict(stats: dict) -> Optional[LocalScore]:
+    """
+    Returns the local score (1.0-10.0) and its confidence (0-1), or None when no model is available.
+    Missing features are imputed with the training mean and lower the confidence proportionally.
+    """
+    try:
+        model = _load_model()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    x = extract_features(stats)
+    missing = np.isnan(x)
+    z = np.where(missing, 0.0, (x - model['mean']) / model['std'])
+    p = 1.0 / (1.0 + np.exp(-(z @ model['weights'] + model['bias'])))
+
+    decisiveness = abs(2.0 * p - 1.0)
+    confidence = decisiveness * (1.0 - missing.mean())
+    return LocalScore(round(1.0 + 9.0 * float(p), 1), round(float(confidence), 2))
+
+
+def log_pair(stats: dict, llm_score) -> None:
+    """Appends a (features, LLM score) training pair. Logging failures never affect the caller."""
+    if not isinstance(llm_score, (int, float)) or not PAIRS_LOG_PATH:
+        return
+    features = [None if np.isnan(v) else round(float(v), 4) for v in extract_features(stats)]
+    line = json.dumps({"features": features, "ai_score": float(llm_score)})
+    try:
+        with _log_lock, open(PAIRS_LOG_PATH, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+    except OSError:
+        pass
+
+
+def train(pairs_path: str = PAIRS_LOG_PATH, model_path: str = MODEL_PATH,
+          epochs: int = 2000, learning_rate: float = 0.1, l2: float = 0.01) -> dict:
+    """Fits the logistic regression to the logged pairs (scores rescaled to 0-1 as soft labels)."""
+    rows, targets = [], []
+    with open(pairs_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                pair = json.loads(line)
+                rows.append([np.nan if v is None else v for v in pair['features']])
+                targets.append((min(10.0, max(1.0, pair['ai_score'])) - 1.0) / 9.0)
+
+    if len(rows) < 2 * len(FEATURES):
+        raise ValueError(f"Need at least {2 * len(FEATURES)} logged pairs, found {len(rows)}")
+
+    X = np.array(rows, dtype=np.float64)
+    y = np.array(targets, dtype=np.float64)
+
+    mean = np.nan_to_num(np.nanmean(X, axis=0))
+    std = np.nan_to_num(np.nanstd(X, axis=0))
+    std[std == 0] = 1.0
+    Z = np.where(np.isnan(X), 0.0, (X - mean) / std)
+
+    weights = np.zeros(Z.shape[1])
+    bias = 0.0
+    for _ in range(epochs):
+        p = 1.0 / (1.0 + np.exp(-(Z @ weights + bias)))
+        error = p - y
+        weights -= learning_rate * (Z.T @ error / len(y) + l2 * weights)
+        bias -= learning_rate * float(error.mean())
+
+    model = {
+        'features': list(FEATURES),
+        'mean': mean.round(6).tolist(),
+        'std': std.round(6).tolist(),
+        'weights': weights.round(6).tolist(),
+        'bias': round(bias, 6),
+        'trained_on': len(y),
+    }
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    with open(model_path, 'w', encoding='utf-8') as f:
+        json.dump(model, f, indent=2)
+
+    global _model
+    _model = None
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local AI score model from logged LLM scores.")
+    parser.add_argument('command', choices=['train'])
+    parser.add_argument('--pairs', default=PAIRS_LOG_PATH)
+    parser.add_argument('--output', default=MODEL_PATH)
+    args = parser.parse_args()
+
+    model = train(args.pairs, args.output)
+    print(f"Trained on {model['trained_on']} pairs, wrote {os.path.relpath(args.output)}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
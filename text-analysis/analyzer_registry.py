@@ -0,0 +1,176 @@
+"""
+The analyzer registry is the single place that knows which analyzers exist and what each one needs.
+
+Every metric declares the cheapest input it can work with:
+- TEXT: the raw string, no NLP at all (punctuation, excess words),
+- TOKENS: a tokenized Doc from a blank pipeline, no model weights needed (phrase matching, n-grams),
+- SENTENCES: a Doc with sentence boundaries from the parser (sentence variance, readability),
+- POS: a Doc with part-of-speech tags and lemmas (verb frequency).
+
+It achieves this by:
+1. Importing an analyzer module only the first time one of its metrics is requested.
+2. Looking at the requested metrics and parsing the text at most once, with only the spaCy
+   components the most demanding of them needs.
+3. Handing that shared Doc to every analyzer, and wrapping each one so a failure becomes
+   an {"error": ...} entry instead of breaking the whole report.
+
+The end goal is that cheap passes (e.g. verifying the rewritten text) do not pay for the full suite.
+"""
+import importlib
+from collections import namedtuple
+
+import _paths  # noqa: E402 — centralised path setup
+import shared_nlp
+import tracing
+
+__all__ = [
+    'ALL_METRICS', 'VERIFICATION_METRICS', 'get_module', 'parse_for_level', 'required_level', 'run_analyzer', 'run_analyzers',
+]
+
+TEXT = "text"
+TOKENS = "tokens"
+SENTENCES = "sentences"
+POS = "pos"
+
+_LEVEL_RANK = {TEXT: 0, TOKENS: 1, SENTENCES: 2, POS: 3}
+
+# Components of the tagger pipeline that can be skipped for each level.
+_DISABLED_COMPONENTS = {
+    SENTENCES: ("tagger", "attribute_ruler", "lemmatizer", "ner"),
+    POS: ("ner",),
+}
+
+Analyzer = namedtuple('Analyzer', ['module', 'needs', 'run'])
+
+
+def _run_hedging(module, text, doc):
+    _, stats = module.analyze_and_filter_out(text, doc=doc)
+    return stats
+
+
+def _run_repetition(module, text, doc):
+    repeats = module.get_repeating_keyphrases(text, doc=doc)
+    return {
+        "count": len(repeats),
+        "samples": repeats[:5]
+    }
+
+
+_ANALYZERS = {
+    'hedging': Analyzer('hedging_filler_detector', TOKENS, _run_hedging),
+    'repetition': Analyzer('repetition_detection', TOKENS, _run_repetition),
+    'sentence_variance': Analyzer(
+        'uniform_sentence_len', SENTENCES, lambda m, text, doc: m.uniform_sentence_check(text, doc=doc)
+    ),
+    'readability': Analyzer(
+        'readability_analysis', SENTENCES, lambda m, text, doc: m.analyze_readability_variance(text, doc=doc)
+    ),
+    'verb_frequency': Analyzer(
+        'verb_freq', POS, lambda m, text, doc: m.analyze_verb_frequency(text, doc=doc)
+    ),
+    'punctuation_profile': Analyzer(
+        'punctuation_checker', TEXT, lambda m, text, doc: m.analyze_punctuation_structure(text)
+    ),
+    'flagged_words': Analyzer(
+        'excess_words_checker', TEXT, lambda m, text, doc: m.check_excess_words(text)
+    ),
+    'ai_phrases': Analyzer(
+        'ai_phrase_detector', TOKENS, lambda m, text, doc: m.analyze_ai_phrases(text, doc=doc)
+    ),
+}
+
+ALL_METRICS = tuple(_ANALYZERS.keys())
+
+# The metrics the results panel renders for the rewritten text.
+VERIFICATION_METRICS = (
+    'hedging', 'repetition', 'sentence_variance', 'verb_frequency', 'punctuation_profile', 'ai_phrases',
+)
+
+_modules = {}
+
+
+def get_module(name: str):
+    module = _modules.get(name)
+    if module is None:
+        module = importlib.import_module(name)
+        _modules[name] = module
+    return module
+
+
+def _resolve_metrics(metrics) -> list:
+    if metrics is None:
+        return list(ALL_METRICS)
+    unknown = [m for m in metrics if m not in _ANALYZERS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}. Available: {', '.join(ALL_METRICS)}")
+    return list(metrics)
+
+
+def required_level(metrics=None) -> str:
+    """Returns the most demanding input level among the requested metrics."""
+    levels = [_ANALYZERS[m].needs for m in _resolve_metrics(metrics)]
+    return max(levels, key=_LEVEL_RANK.get, default=TEXT)
+
+
+def parse_for_level(text: str, level: str):
+    if level == TEXT:
+        return None
+
+    with tracing.span("analysis.parse", level=level, chars=len(text)):
+        if level == TOKENS:
+            return shared_nlp.get_nlp_blank().make_doc(text)
+
+        nlp = shared_nlp.get_nlp_tagger()
+
+        disabled = [c for c in _DISABLED_COMPONENTS[level] if c in nlp.pipe_names]
+        return nlp(text, disable=disabled)
+
+
+class _SharedDoc:
+    """Parses the text on first use and hands the same Doc to every analyzer."""
+
+    def __init__(self, text: str, level: str):
+        self.text = text
+        self.level = level
+        self._doc = None
+        self._error = None
+
+    def get(self):
+        if self._error is not None:
+            raise self._error
+        if self._doc is None and self.level != TEXT:
+            try:
+                self._doc = parse_for_level(self.text, self.level)
+            except Exception as e:
+                self._error = e
+                raise
+        return self._doc
+
+
+def run_analyzer(name: str, text: str, doc=None) -> dict:
+    analyzer = _ANALYZERS[name]
+    with tracing.span("analysis.analyzer", metric=name) as span:
+        try:
+            return analyzer.run(get_module(analyzer.module), text, doc)
+        except Exception as e:
+            span.record_exception(e)
+            return {"error": str(e)}
+
+
+def run_analyzers(text: str, metrics=None) -> dict:
+    names = _resolve_metrics(metrics)
+    shared = _SharedDoc(text, required_level(names))
+
+    results = {}
+    for name in names:
+        if _ANALYZERS[name].needs == TEXT:
+            results[name] = run_analyzer(name, text)
+            continue
+        try:
+            doc = shared.get()
+        except Exception as e:
+            results[name] = {"error": str(e)}
+            continue
+        results[name] = run_analyzer(name, text, doc)
+
+    return results
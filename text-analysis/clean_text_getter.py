@@ -7,6 +7,7 @@ analysis folder to import the cleaned text.
 import os
 import sys
 import _paths  # noqa: E402 — centralised path setup
+import app_metrics
 
 from text_sanitization.changes_log import build_changes_log
 from text_sanitization.document_loading import load_file_content
@@ -23,8 +24,10 @@ def get_clean_text_from_file(file_path: str) -> str:
 
 def get_clean_text_from_string(raw_text: str) -> str:
     if raw_text in _processed_text_cache:
+        app_metrics.record_cache("clean_text", True)
         return _processed_text_cache[raw_text]
-    
+
+    app_metrics.record_cache("clean_text", False)
     text, _ = build_changes_log(raw_text)
     _processed_text_cache[raw_text] = text
     return text
\ No newline at end of file
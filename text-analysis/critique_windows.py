@@ -0,0 +1,161 @@
+"""
+The critique windows module decides which parts of a long text the LLM critique gets to see,
+and merges the per-window critiques back into one.
+
+A single critique call only reads the first `_MAX_LLM_INPUT_CHARS` characters, so the AI score of a
+long document used to describe its opening only.
+
+It achieves this by:
+1. Splitting the text into paragraphs and packing them into windows that fit the input limit.
+2. Always picking the start, middle and end windows, then the windows around the paragraphs with the
+   highest filler density, up to the configured call budget.
+3. Averaging the window scores weighted by window length, and deriving a confidence from how much of the
+   text was covered and how much the windows agree with each other.
+
+The end goal is a score that represents the whole document at a bounded, predictable number of LLM calls.
+"""
+import os
+
+import numpy as np
+
+import _paths  # noqa: E402 — centralised path setup
+import shared_nlp
+
+__all__ = ['CritiqueWindow', 'select_windows', 'merge_critiques', 'CRITIQUE_CALL_BUDGET']
+
+CRITIQUE_CALL_BUDGET = int(os.getenv("CRITIQUE_CALL_BUDGET", "4"))
+
+# Scores range from 1 to 10, so a standard deviation of 4.5 means the windows disagree completely.
+_MAX_SCORE_SPREAD = 4.5
+
+_MAX_LISTED_ITEMS = 8
+
+
+class CritiqueWindow:
+    __slots__ = ('label', 'start', 'end', 'text')
+
+    def __init__(self, label: str, start: int, end: int, text: str):
+        self.label = label
+        self.start = start
+        self.end = end
+        self.text = text
+
+
+def _paragraph_spans(text: str) -> list[tuple[int, int]]:
+    spans, offset = [], 0
+    for part in text.split('\n\n'):
+        if part.strip():
+            spans.append((offset, offset + len(part)))
+        offset += len(part) + 2
+    return spans
+
+
+def _pack_windows(text: str, max_chars: int) -> list[tuple[int, int]]:
+    """Consecutive runs of paragraphs no longer than `max_chars` (a huge paragraph is cut)."""
+    windows = []
+    start = end = None
+    for p_start, p_end in _paragraph_spans(text):
+        while p_end - p_start > max_chars:
+            if start is not None:
+                windows.append((start, end))
+                start = None
+            windows.append((p_start, p_start + max_chars))
+            p_start += max_chars
+        if start is not None and p_end - start > max_chars:
+            windows.append((start, end))
+            start = None
+        if start is None:
+            start = p_start
+        end = p_end
+    if start is not None:
+        windows.append((start, end))
+    return windows
+
+
+def _filler_densities(text: str, spans: list[tuple[int, int]]) -> list[float]:
+    """The filler density (% of tokens) of each span, from a single tokenization of the whole text."""
+    import hedging_filler_detector
+
+    doc = shared_nlp.get_nlp_blank().make_doc(text)
+    offsets = np.fromiter((token.idx for token in doc), dtype=np.int64, count=len(doc))
+    is_filler = np.zeros(len(doc) + 1, dtype=np.int64)
+    for start, end in hedging_filler_detector.find_fillers(doc):
+        is_filler[start:end] = 1
+    # Prefix sums: the filler tokens between two token positions in O(1).
+    fillers_before = np.concatenate(([0], np.cumsum(is_filler[:-1])))
+
+    densities = []
+    for start, end in spans:
+        first, last = np.searchsorted(offsets, start), np.searchsorted(offsets, end)
+        tokens = last - first
+        densities.append(100.0 * float(fillers_before[last] - fillers_before[first]) / tokens if tokens else 0.0)
+    return densities
+
+
+def select_windows(text: str, max_chars: int, budget: int = CRITIQUE_CALL_BUDGET) -> list[CritiqueWindow]:
+    windows = _pack_windows(text, max_chars)
+    if len(windows) <= 1:
+        return [CritiqueWindow("full", 0, len(text), text[:max_chars])]
+
+    chosen = {0: "start", len(windows) // 2: "middle", len(windows) - 1: "end"}
+    chosen = dict(list(chosen.items())[:max(1, budget)])
+
+    if len(chosen) < budget:
+        remaining = [i for i in range(len(windows)) if i not in chosen]
+        densities = _filler_densities(text, [windows[i] for i in remaining])
+        for i in np.argsort(densities)[::-1][:budget - len(chosen)]:
+            if densities[i] > 0:
+                chosen[remaining[i]] = "high_filler"
+
+    return [
+        CritiqueWindow(label, windows[i][0], windows[i][1], text[windows[i][0]:windows[i][1]])
+        for i, label in sorted(chosen.items())
+    ]
+
+
+def _dedupe(items) -> list:
+    seen, result = set(), []
+    for item in items:
+        key = str(item).strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result[:_MAX_LISTED_ITEMS]
+
+
+def merge_critiques(windows: list[CritiqueWindow], critiques: list, text_length: int) -> dict:
+    """
+    Combines the window critiques (dicts, or exceptions for failed calls) into one critique with
+    a length-weighted `ai_score` and a 0-1 `confidence`. A single window's critique is returned as is.
+    """
+    if len(windows) == 1 and isinstance(critiques[0], dict):
+        return critiques[0]
+
+    ok = [(w, c) for w, c in zip(windows, critiques)
+          if isinstance(c, dict) and isinstance(c.get("ai_score"), (int, float))]
+    if not ok:
+        failure = next((c for c in critiques if isinstance(c, Exception)), None)
+        return {
+            "error": "Failed to get LLM critique",
+            "details": str(failure) if failure else "No window returned a score",
+        }
+
+    scores = np.array([float(c["ai_score"]) for _, c in ok])
+    weights = np.array([max(1, w.end - w.start) for w, _ in ok], dtype=np.float64)
+    covered = float(weights.sum())
+
+    coverage = min(1.0, covered / text_length) if text_length else 1.0
+    agreement = max(0.0, 1.0 - float(np.std(scores)) / _MAX_SCORE_SPREAD)
+
+    return {
+        "validation_of_stats": ok[0][1].get("validation_of_stats", {}),
+        "stylistic_issues": _dedupe(i for _, c in ok for i in c.get("stylistic_issues", [])),
+        "recommended_actions": _dedupe(a for _, c in ok for a in c.get("recommended_actions", [])),
+        "ai_score": round(float(np.average(scores, weights=weights)), 1),
+        "confidence": round(agreement * (0.5 + 0.5 * coverage), 2),
+        "windows": [
+            {"label": w.label, "start": w.start, "end": w.end,
+             "ai_score": c.get("ai_score") if isinstance(c, dict) else None}
+            for w, c in zip(windows, critiques)
+        ],
+    }
@@ -0,0 +1,54 @@
+"""
+The excess words checker flags every word from `excess_words.csv` that shows up in the text.
+
+Unlike the hedging detector, which only matches the "style" words and measures their density,
+this check covers the whole list (content and style words) and simply reports which ones were found.
+
+It achieves this by:
+1. Lazily loading the word list and compiling one word-boundary regex per entry.
+2. Searching the raw text with each pattern, so no NLP parsing is needed.
+
+The end goal is to give the llm a short list of suspicious vocabulary to avoid during rewriting.
+"""
+import csv
+import os
+import re
+
+__all__ = ['check_excess_words', 'find_excess_words', 'summarize_excess_words']
+
+_excess_words_patterns = None
+
+
+def _load_patterns():
+    global _excess_words_patterns
+    if _excess_words_patterns is not None:
+        return _excess_words_patterns
+
+    csv_path = os.path.join(os.path.dirname(__file__), 'excess_words.csv')
+    patterns = []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            word = row.get('word', '').strip().lower()
+            if word:
+                pattern = re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
+                patterns.append((word, pattern))
+
+    _excess_words_patterns = patterns
+    return patterns
+
+
+def find_excess_words(text: str) -> list[str]:
+    return [word for word, pattern in _load_patterns() if pattern.search(text)]
+
+
+def summarize_excess_words(found) -> dict:
+    """Builds the report from a collection of found words, keeping the CSV order."""
+    found = set(found)
+    flagged = [word for word, _ in _load_patterns() if word in found]
+    return {"count": len(flagged), "words": flagged[:20]}
+
+
+def check_excess_words(text: str) -> dict:
+    flagged = find_excess_words(text)
+    return {"count": len(flagged), "words": flagged[:20]}
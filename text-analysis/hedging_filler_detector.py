@@ -7,9 +7,9 @@ Unlike simple keyword matching, this module provides both detection metrics and
 "cleaned" version of the text.
 
 It achieves this by:
-1. Using a lazy-loading pattern for the Spacy NLP model to ensure the application starts fast.
-2. Ingesting a categorized database of "style" words from `excess_words.csv`.
-3. Utilizing Spacy's `PhraseMatcher` for efficient, high-speed pattern matching across the document.
+1. Using a lazy-loading pattern for the Spacy tokenizer to ensure the application starts fast.
+2. Ingesting the "style" words from `excess_words.csv`, precompiled into a lookup table by phrase_artifacts.
+3. Matching those phrases on lowercase token ids for efficient, high-speed matching across the document.
 4. Calculating a "filler density" score to quantify how much of the text is non-substantive.
 
 The end goal is to highlight weak writing patterns and provide an immediate option to tighten
@@ -17,52 +17,48 @@ the prose by stripping out these redundancies.
 """
 import os
 import sys
-import csv
-
-import clean_text_getter
 
 import _paths  # noqa: E402 — centralised path setup
 import shared_nlp
 
+import phrase_artifacts
+
 nlp = None
 matcher = None
-style_words = None
 
 __all__ = ['analyze_and_filter_out']
 
 def _initialize_spacy():
     
-    global nlp, matcher, style_words
-    if nlp is not None:
+    global matcher
+    if matcher is not None:
         return
 
-    from spacy.matcher import PhraseMatcher
+    matcher = phrase_artifacts.load_phrase_table('style_words')
 
-    nlp = shared_nlp.get_nlp_full()
-    
-    style_words = []
-    csv_path = os.path.join(os.path.dirname(__file__), "excess_words.csv")
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get('type') == 'style' and row.get('word'):
-                style_words.append(row['word'].strip())
+def _get_nlp():
+    # Only LOWER is matched, so the tokenizer is all that is needed from the model.
+    global nlp
+    if nlp is None:
+        nlp = shared_nlp.get_nlp_blank()
+    return nlp
 
-    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-
-    style_patterns = [nlp.make_doc(text) for text in style_words]
-    matcher.add("AI_FILLER", style_patterns)
+def find_fillers(doc) -> list[tuple[int, int]]:
+    """Returns the (start, end) token spans of every filler phrase in an already tokenized doc."""
+    _initialize_spacy()
+    return matcher.find(doc)
 
-def analyze_and_filter_out(text: str):
+def analyze_and_filter_out(text: str, doc=None):
     _initialize_spacy()
     
-    doc = nlp(text)
-    matches = matcher(doc)
+    if doc is None:
+        doc = _get_nlp().make_doc(text)
+    matches = matcher.find(doc)
     
     to_remove = set()
     found_words = []
 
-    for match_id, start, end in matches:
+    for start, end in matches:
         found_words.append(doc[start:end].text)
         for i in range(start, end):
             to_remove.add(i)
@@ -70,7 +66,7 @@ def analyze_and_filter_out(text: str):
     cleaned_tokens = [token.text_with_ws for token in doc if token.i not in to_remove]
     cleaned_text = "".join(cleaned_tokens).strip()
 
-    filler_token_count = sum(end - start for _, start, end in matches)
+    filler_token_count = sum(end - start for start, end in matches)
     filler_density = (filler_token_count / len(doc)) * 100 if len(doc) > 0 else 0
 
     stats = {
@@ -0,0 +1,272 @@
+"""
+The incremental analysis module re-analyzes edited text without starting from scratch.
+
+Users often tweak a few sentences and resubmit. Most paragraphs are then byte-for-byte identical
+to the previous run, so their parse results can be reused.
+
+It achieves this by:
+1. Splitting the text into paragraphs and keying each one by a hash of its content.
+2. Caching, per paragraph, the partial aggregates every metric needs (sentence word counts,
+   readability totals, token ids for n-grams, phrase/filler matches, verb counts) in a bounded LRU.
+3. Parsing only the paragraphs that are missing from the cache, then recombining all partials
+   into the same report shape `collect_stats` returns.
+4. Running the punctuation profile, which is a couple of regex counts, on the whole text.
+5. Parsing paragraphs only at the level their spaCy-based metrics need; regex-only metrics never
+   depend on the parse, so a missing model does not fail them.
+
+The end goal is for re-analysis cost to scale with the size of the edit, not the document.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import _paths  # noqa: E402 — centralised path setup
+import analyzer_registry
+import app_metrics
+import tracing
+
+__all__ = ['collect_stats_incremental', 'clear_cache']
+
+_MAX_CACHED_PARAGRAPHS = 4096
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _paragraph_key(paragraph: str) -> str:
+    return hashlib.blake2b(paragraph.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _split_paragraphs(text: str) -> list[str]:
+    return [p for p in text.split('\n\n') if p.strip()]
+
+
+def _cache_get(key: str):
+    with _cache_lock:
+        partials = _cache.get(key)
+        if partials is not None:
+            _cache.move_to_end(key)
+    app_metrics.record_cache("paragraph_analysis", partials is not None)
+    return partials
+
+
+def _cache_put(key: str, partials: dict):
+    with _cache_lock:
+        _cache[key] = partials
+        _cache.move_to_end(key)
+        while len(_cache) > _MAX_CACHED_PARAGRAPHS:
+            _cache.popitem(last=False)
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _module(name: str):
+    return analyzer_registry.get_module(name)
+
+
+def _edge_whitespace_tokens(text: str) -> tuple[int, int]:
+    """
+    The whitespace tokens spaCy makes at the start and the end of `text`: any leading whitespace,
+    and trailing whitespace other than a single space (which attaches to the last token).
+    """
+    trailing = text[len(text.rstrip()):]
+    return int(text[:1].isspace()), int(trailing not in ("", " "))
+
+
+def _partial_hedging(paragraph, doc):
+    spans = _module('hedging_filler_detector').find_fillers(doc)
+    return {
+        "tokens": len(doc),
+        "edge_tokens": sum(_edge_whitespace_tokens(paragraph)),
+        "matches": len(spans),
+        "filler_tokens": sum(end - start for start, end in spans),
+        "words": [doc[start:end].text for start, end in spans],
+    }
+
+
+def _partial_repetition(paragraph, doc):
+    words, ids = _module('repetition_detection').tokenize_text_with_ids(paragraph, doc)
+    return {"words": words, "ids": ids}
+
+
+def _partial_sentence_variance(paragraph, doc):
+    return _module('uniform_sentence_len').sentence_word_counts(doc)
+
+
+def _partial_readability(paragraph, doc):
+    module = _module('readability_analysis')
+    return {
+        "units": module.count_readability_units(doc),
+        "single": module.analyze_readability_variance(paragraph, doc=doc),
+    }
+
+
+def _partial_verb_frequency(paragraph, doc):
+    return _module('verb_freq').analyze_verb_frequency(paragraph, doc=doc)
+
+
+def _partial_ai_phrases(paragraph, doc):
+    result = _module('ai_phrase_detector').analyze_ai_phrases(paragraph, doc=doc)
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result["phrases"]
+
+
+def _partial_flagged_words(paragraph, doc):
+    return _module('excess_words_checker').find_excess_words(paragraph)
+
+
+def _combine_hedging(parts, text):
+    # Counted like a parse of the whole text, where each whitespace run between paragraphs
+    # (including the paragraphs' own edge whitespace) is a single token.
+    if parts:
+        leading, trailing = _edge_whitespace_tokens(text)
+        tokens = sum(p["tokens"] - p["edge_tokens"] for p in parts) + len(parts) - 1 + leading + trailing
+    else:
+        tokens = 1 if text else 0  # whitespace only: a single whitespace token
+    filler_tokens = sum(p["filler_tokens"] for p in parts)
+    found_words = [w for p in parts for w in p["words"]]
+    return {
+        "original_word_count": tokens,
+        "filler_count": sum(p["matches"] for p in parts),
+        "filler_density": (filler_tokens / tokens) * 100 if tokens > 0 else 0,
+        "detected_fillers": list(set(found_words)),
+    }
+
+
+def _combine_repetition(parts, text):
+    words = [w for p in parts for w in p["words"]]
+    ids = np.concatenate([p["ids"] for p in parts]) if parts else np.empty(0, dtype=np.uint64)
+    repeats = _module('repetition_detection').find_repeated_ngrams(words, ids, 2, 5)
+    return {
+        "count": len(repeats),
+        "samples": repeats[:5]
+    }
+
+
+def _combine_sentence_variance(parts, text):
+    counts = [c for p in parts for c in p]
+    return _module('uniform_sentence_len').classify_sentence_lengths(counts)
+
+
+def _combine_readability(parts, text):
+    if len(parts) <= 1:
+        return parts[0]["single"] if parts else _module('readability_analysis').analyze_readability_variance('')
+    words, sentences, syllables = zip(*(p["units"] for p in parts))
+    return _module('readability_analysis').score_paragraphs(words, sentences, syllables)
+
+
+def _combine_verb_frequency(parts, text):
+    total = sum(p.get("total_verbs", 0) for p in parts)
+    ai_count = sum(p.get("ai_verbs_count", 0) for p in parts)
+    detected = set(v for p in parts for v in p.get("detected_ai_verbs", []))
+    if not parts:
+        return _module('verb_freq').analyze_verb_frequency('')
+    density = (ai_count / total * 100) if total > 0 else 0.0
+    return {
+        "status": "success",
+        "total_verbs": total,
+        "ai_verbs_count": ai_count,
+        "ai_verb_density_percentage": round(density, 2),
+        "detected_ai_verbs": list(detected),
+    }
+
+
+def _combine_flagged_words(parts, text):
+    return _module('excess_words_checker').summarize_excess_words(w for p in parts for w in p)
+
+
+def _combine_ai_phrases(parts, text):
+    phrases = [phrase for p in parts for phrase in p]
+    return {
+        "count": len(phrases),
+        "phrases": phrases
+    }
+
+
+# metric -> (per-paragraph partial, recombination over all paragraphs)
+_INCREMENTAL = {
+    'hedging': (_partial_hedging, _combine_hedging),
+    'repetition': (_partial_repetition, _combine_repetition),
+    'sentence_variance': (_partial_sentence_variance, _combine_sentence_variance),
+    'readability': (_partial_readability, _combine_readability),
+    'verb_frequency': (_partial_verb_frequency, _combine_verb_frequency),
+    'ai_phrases': (_partial_ai_phrases, _combine_ai_phrases),
+    'flagged_words': (_partial_flagged_words, _combine_flagged_words),
+}
+
+
+def _paragraph_partials(paragraph: str, metrics: list, parse_error=None):
+    """
+    Returns the paragraph's partials and the parse error, if any. After a failed parse the next
+    paragraphs get `parse_error` for their parsed metrics instead of trying again.
+    """
+    key = _paragraph_key(paragraph)
+    partials = _cache_get(key) or {}
+    missing = [m for m in metrics if m not in partials]
+    if not missing:
+        return partials, parse_error
+
+    partials = dict(partials)
+    parsed = [m for m in missing if analyzer_registry.required_level([m]) != analyzer_registry.TEXT]
+    doc = None
+    if parsed and parse_error is None:
+        try:
+            doc = analyzer_registry.parse_for_level(paragraph, analyzer_registry.required_level(parsed))
+        except Exception as e:
+            parse_error = e
+
+    for name in missing:
+        if name in parsed and parse_error is not None:
+            partials[name] = parse_error
+            continue
+        with tracing.span("analysis.partial", metric=name):
+            try:
+                partials[name] = _INCREMENTAL[name][0](paragraph, doc)
+            except Exception as e:
+                partials[name] = e
+
+    # Failures are reported for this run but not cached, so the next run retries them.
+    _cache_put(key, {k: v for k, v in partials.items() if not isinstance(v, Exception)})
+    return partials, parse_error
+
+
+def collect_stats_incremental(text: str, metrics=None) -> dict:
+    names = list(metrics) if metrics is not None else list(analyzer_registry.ALL_METRICS)
+    analyzer_registry.required_level(names)  # rejects unknown metric names
+    paragraph_metrics = [m for m in names if m in _INCREMENTAL]
+
+    per_paragraph = []
+    if paragraph_metrics:
+        with tracing.span("analysis.paragraphs") as span:
+            paragraphs = _split_paragraphs(text)
+            parse_error = None
+            for paragraph in paragraphs:
+                partials, parse_error = _paragraph_partials(paragraph, paragraph_metrics, parse_error)
+                per_paragraph.append(partials)
+            span.set_attribute("paragraphs", len(paragraphs))
+            if parse_error is not None:
+                span.record_exception(parse_error)
+
+    results = {}
+    for name in names:
+        if name not in _INCREMENTAL:
+            results[name] = analyzer_registry.run_analyzer(name, text)
+            continue
+        parts = [p[name] for p in per_paragraph]
+        failed = next((p for p in parts if isinstance(p, Exception)), None)
+        if failed is not None:
+            results[name] = {"error": str(failed)}
+            continue
+        with tracing.span("analysis.combine", metric=name):
+            try:
+                results[name] = _INCREMENTAL[name][1](parts, text)
+            except Exception as e:
+                results[name] = {"error": str(e)}
+
+    return results
@@ -6,28 +6,34 @@ It does that by feeding the mathematical data gathered from the other files in t
 
 Based on that data the LLM provides a critique, returns it as a json file and also calculates
 a score from 1.0 to 10.0 (the lower the more human the text is).
+Texts longer than the LLM input limit are critiqued in several windows at once (see critique_windows.py).
+When the local model in ai_score_model.py is confident enough, the score comes from it and the LLM is skipped.
 """
-import os
-
 import json
+import os
+import random
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
-import csv
 
 import _paths
-import hedging_filler_detector as hedging
-import repetition_detection as repetition
-import repeating_headings
-import uniform_sentence_len as uniform
-import readability_analysis
-import verb_freq
-import punctuation_checker
-import ai_phrase_detector
+import ai_score_model
+import analyzer_registry
+import critique_windows
+import incremental_analysis
 import llm_info
+import tracing
 
 _MAX_LLM_INPUT_CHARS = 4000
 
+# "auto": local score when the model is trained and confident, LLM otherwise; "local": always local;
+# "llm": always LLM.
+AI_SCORE_MODE = os.getenv("AI_SCORE_MODE", "auto")
+LOCAL_SCORE_MIN_CONFIDENCE = float(os.getenv("LOCAL_SCORE_MIN_CONFIDENCE", "0.6"))
+# Share of confident "auto" cases still sent to the LLM, so the logged training pairs also cover
+# the texts the local model is sure about.
+AI_SCORE_LOG_SAMPLE_RATE = float(os.getenv("AI_SCORE_LOG_SAMPLE_RATE", "0.05"))
+
 
 class CritiqueSchema(BaseModel):
     validation_of_stats: dict = Field(description="Verification of the algorithmically detected hedging, repetition, variance, readability, verb usage, and punctuation.")
@@ -35,96 +41,51 @@ class CritiqueSchema(BaseModel):
     recommended_actions: list[str] = Field(description="Steps to take during the rewriting phase.")
     ai_score: float = Field(description="Score from 1.0 (Human-written) to 10.0 (AI-generated). Use decimals for precision.")
 
-def collect_stats(text: str) -> dict:
-    return {
-        'hedging': _analyze_hedging(text),
-        'repetition': _analyze_repetition(text),
-        'sentence_variance': _analyze_sentence_variance(text),
-        'readability': _analyze_readability(text),
-        'verb_frequency': _analyze_verb_frequency(text),
-        'punctuation_profile': _analyze_punctuation(text),
-        'flagged_words': _check_excess_words(text),
-        'ai_phrases': _analyze_ai_phrases(text),
-    }
+def collect_stats(text: str, metrics=None, incremental: bool = False) -> dict:
+    """
+    Runs the requested analyzers (all of them by default), see analyzer_registry for the
+    available metric names. Only the modules and spaCy components they need are loaded.
+    With incremental=True, paragraphs analyzed in a previous call are served from cache.
+    """
+    if incremental:
+        return incremental_analysis.collect_stats_incremental(text, metrics)
+    return analyzer_registry.run_analyzers(text, metrics)
 
 
-def verify_metrics_only(text: str) -> dict:
-    stats = collect_stats(text)
+def verify_metrics_only(text: str, metrics=analyzer_registry.VERIFICATION_METRICS) -> dict:
+    stats = collect_stats(text, metrics)
 
     return {
         "statistical_metrics": stats,
         "llm_critique": None
     }
 
-def _safe_analyze(fn):
-    def wrapper(*args, **kwargs):
-        try:
-            return fn(*args, **kwargs)
-        except Exception as e:
-            return {"error": str(e)}
-    return wrapper
-
-@_safe_analyze
-def _analyze_hedging(text: str) -> dict:
-    _, hedging_stats = hedging.analyze_and_filter_out(text)
-    return hedging_stats
-
-@_safe_analyze
-def _analyze_repetition(text: str) -> dict:
-    repeats = repetition.get_repeating_keyphrases(text)
-    return {
-        "count": len(repeats), 
-        "samples": repeats[:5]
-    }
-
-@_safe_analyze
-def _analyze_sentence_variance(text: str) -> dict:
-    return uniform.uniform_sentence_check(text)
-
-@_safe_analyze
-def _analyze_readability(text: str) -> dict:
-    return readability_analysis.analyze_readability_variance(text)
 
-@_safe_analyze
-def _analyze_verb_frequency(text: str) -> dict:
-    return verb_freq.analyze_verb_frequency(text)
-
-@_safe_analyze
-def _analyze_punctuation(text: str) -> dict:
-    return punctuation_checker.analyze_punctuation_structure(text)
-
-_excess_words_patterns = None
-
-@_safe_analyze
-def _check_excess_words(text: str) -> dict:
-    global _excess_words_patterns
-    import re
-    
-    if _excess_words_patterns is None:
-        csv_path = os.path.join(os.path.dirname(__file__), 'excess_words.csv')
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            _excess_words_patterns = []
-            for row in reader:
-                word = row.get('word', '').strip().lower()
-                if word:
-                    pattern = re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
-                    _excess_words_patterns.append((word, pattern))
-        
-    flagged = []
-    
-    for word, pattern in _excess_words_patterns:
-        if pattern.search(text):
-            flagged.append(word)
-            
-    return {"count": len(flagged), "words": flagged[:20]}
-
-@_safe_analyze
-def _analyze_ai_phrases(text: str) -> dict:
-    return ai_phrase_detector.analyze_ai_phrases(text)
-
-
-def get_llm_critique(text: str, stats: dict) -> dict:
+def local_ai_score(stats: dict):
+    """
+    The local `ai_score_model` prediction if AI_SCORE_MODE allows using it, otherwise None (the
+    caller then asks the LLM and logs the pair). In "auto" mode an untrained model is never used,
+    and AI_SCORE_LOG_SAMPLE_RATE of the confident cases go to the LLM anyway.
+    """
+    if AI_SCORE_MODE == "llm":
+        return None
+    if AI_SCORE_MODE != "local" and ai_score_model.trained_on() == 0:
+        return None
+    local = ai_score_model.predict(stats)
+    if local is None:
+        return None
+    if AI_SCORE_MODE == "local":
+        return local
+    if local.confidence >= LOCAL_SCORE_MIN_CONFIDENCE and random.random() >= AI_SCORE_LOG_SAMPLE_RATE:
+        return local
+    return None
+
+
+def get_llm_critique(text: str, stats: dict, call_budget: int = critique_windows.CRITIQUE_CALL_BUDGET) -> dict:
+    """
+    Up to `call_budget` windows of the text (start, middle, end, highest filler density) are
+    critiqued concurrently and merged into one critique with an `ai_score` and a `confidence`.
+    """
     parser = JsonOutputParser(pydantic_object=CritiqueSchema)
     
     prompt = ChatPromptTemplate.from_messages([
@@ -133,13 +94,25 @@ def get_llm_critique(text: str, stats: dict) -> dict:
     ])
     
     chain = prompt | llm_info.llm | parser
-    
+
     try:
-        return chain.invoke({
-            "stats_json": json.dumps(stats),
-            "text_content": text[:_MAX_LLM_INPUT_CHARS],
-            "format_instructions": parser.get_format_instructions()
-        })
+        windows = critique_windows.select_windows(text, _MAX_LLM_INPUT_CHARS, call_budget)
+        stats_json = json.dumps(stats)
+        format_instructions = parser.get_format_instructions()
+        with tracing.span("llm.critique", windows=len(windows), input_chars=sum(len(w.text) for w in windows)):
+            critiques = chain.batch(
+                [
+                    {
+                        "stats_json": stats_json,
+                        "text_content": window.text,
+                        "format_instructions": format_instructions
+                    }
+                    for window in windows
+                ],
+                config={"max_concurrency": len(windows)},
+                return_exceptions=True,
+            )
+        return critique_windows.merge_critiques(windows, critiques, len(text))
     except Exception as e:
         return {
             "error": "Failed to get LLM critique",
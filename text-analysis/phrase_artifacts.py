@@ -0,0 +1,153 @@
+"""
+The phrase artifacts module turns the phrase CSVs into precompiled lookup tables.
+
+Building a spaCy PhraseMatcher means reading the CSV and running `nlp.make_doc` on every phrase,
+and in the hedging detector it also meant loading the full pipeline just to match on LOWER.
+Doing that on the first request of every fresh worker is wasted time, so instead:
+
+1. A build step (`python text-analysis/phrase_artifacts.py`) tokenizes every phrase once with the
+   English tokenizer and writes the lowercase token sequences to `compiled/<name>.json`,
+   together with the SHA-256 of the source CSV and the spaCy version.
+2. At startup the artifact is loaded (a few milliseconds) if its CSV hash still matches;
+   otherwise the phrases are compiled on the fly, exactly like before.
+3. Matching compares the doc's LOWER hash ids against the patterns indexed by their first token,
+   returning every (start, end) span, the same matches a LOWER PhraseMatcher would.
+
+The end goal is for phrase matching to cost nothing at cold start and need no NLP model loaded.
+"""
+import csv
+import hashlib
+import json
+import os
+import sys
+
+import spacy
+from spacy.attrs import LOWER
+from spacy.strings import hash_string
+
+__all__ = ['PhraseTable', 'load_phrase_table', 'build_all']
+
+ARTIFACT_VERSION = 1
+
+_DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+_COMPILED_DIR = os.path.join(_DATA_DIR, 'compiled')
+
+
+def _read_ai_phrases(reader):
+    return [row.get('phrase', '').strip() for row in reader]
+
+
+def _read_style_words(reader):
+    return [row['word'].strip() for row in reader if row.get('type') == 'style' and row.get('word')]
+
+
+# artifact name -> (source CSV, row reader)
+PHRASE_SOURCES = {
+    'ai_phrases': ('ai_phrases.csv', _read_ai_phrases),
+    'style_words': ('excess_words.csv', _read_style_words),
+}
+
+
+class PhraseTable:
+    """Case-insensitive multi-token phrase lookup over spaCy docs."""
+
+    def __init__(self, patterns):
+        self._by_first = {}
+        for tokens in set(tuple(p) for p in patterns if p):
+            hashed = tuple(hash_string(t) for t in tokens)
+            self._by_first.setdefault(hashed[0], []).append(hashed)
+
+    def __len__(self):
+        return sum(len(v) for v in self._by_first.values())
+
+    def find(self, doc) -> list[tuple[int, int]]:
+        lowers = doc.to_array(LOWER).tolist()
+        spans = []
+        for start, lower in enumerate(lowers):
+            candidates = self._by_first.get(lower)
+            if not candidates:
+                continue
+            for pattern in candidates:
+                end = start + len(pattern)
+                if end <= len(lowers) and tuple(lowers[start:end]) == pattern:
+                    spans.append((start, end))
+        spans.sort()
+        return spans
+
+
+def _csv_sha256(csv_path: str) -> str:
+    with open(csv_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_phrases(name: str) -> list[str]:
+    filename, reader_fn = PHRASE_SOURCES[name]
+    csv_path = os.path.join(_DATA_DIR, filename)
+    if not os.path.exists(csv_path):
+        return []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return [p for p in reader_fn(csv.DictReader(f)) if p]
+
+
+def _tokenize_phrases(phrases: list[str], tokenizer=None) -> list[list[str]]:
+    if tokenizer is None:
+        tokenizer = spacy.blank('en').tokenizer
+    return [[t.lower_ for t in tokenizer(p)] for p in phrases]
+
+
+def _artifact_path(name: str) -> str:
+    return os.path.join(_COMPILED_DIR, f'{name}.json')
+
+
+def _load_artifact(name: str, csv_hash: str):
+    try:
+        with open(_artifact_path(name), 'r', encoding='utf-8') as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if artifact.get('version') != ARTIFACT_VERSION or artifact.get('csv_sha256') != csv_hash:
+        return None
+    return artifact['patterns']
+
+
+def load_phrase_table(name: str, tokenizer=None) -> PhraseTable:
+    """
+    Loads the compiled artifact for `name`, or compiles the CSV on the fly when the
+    artifact is missing or was built from a different version of the CSV.
+    """
+    filename, _ = PHRASE_SOURCES[name]
+    csv_path = os.path.join(_DATA_DIR, filename)
+    csv_hash = _csv_sha256(csv_path) if os.path.exists(csv_path) else None
+
+    patterns = _load_artifact(name, csv_hash) if csv_hash else None
+    if patterns is None:
+        patterns = _tokenize_phrases(_read_phrases(name), tokenizer)
+    return PhraseTable(patterns)
+
+
+def build_artifact(name: str, tokenizer=None) -> str:
+    filename, _ = PHRASE_SOURCES[name]
+    patterns = _tokenize_phrases(_read_phrases(name), tokenizer)
+    artifact = {
+        'version': ARTIFACT_VERSION,
+        'source': filename,
+        'csv_sha256': _csv_sha256(os.path.join(_DATA_DIR, filename)),
+        'spacy_version': spacy.__version__,
+        'patterns': patterns,
+    }
+
+    os.makedirs(_COMPILED_DIR, exist_ok=True)
+    path = _artifact_path(name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+    return path
+
+
+def build_all(tokenizer=None) -> list[str]:
+    return [build_artifact(name, tokenizer) for name in PHRASE_SOURCES]
+
+
+if __name__ == '__main__':
+    for artifact_path in build_all():
+        print(f"Wrote {os.path.relpath(artifact_path)}", file=sys.stderr)
@@ -6,61 +6,71 @@ It works by splitting the text into individual paragraphs and then calculate the
 above mentioned formulas for each paragraph.
 Then it calculates its standard deviation and average values.
 
-The end goal is to provide a widely known metric for readability which can help the llm judge the 
+Instead of calling textstat once per paragraph (which re-counts everything each time), the text is
+parsed once, every word gets its syllable count from a cached lookup, and the per-paragraph word,
+sentence and syllable totals are summed with NumPy so all paragraph scores come out of one vectorized step.
+
+The end goal is to provide a widely known metric for readability which can help the llm judge the
 readability of the text better.
 """
+from functools import lru_cache
+
 import numpy as np
 import textstat
 
-import statistics
-from repetition_detection import tokenize_text_into_sentences
-
-def analyze_readability_variance(text: str) -> dict:
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-
-    # Fallback: if fewer than 2 paragraphs, try splitting into chunks of 3 sentences
-    if len(paragraphs) <= 1:
-        sentences = tokenize_text_into_sentences(text)
-        if len(sentences) >= 6:  # Need at least 2 chunks of 3
-            # Chunk sentences into groups of 3
-            chunk_size = 3
-            paragraphs = [
-                " ".join(sentences[i:i + chunk_size])
-                for i in range(0, len(sentences), chunk_size)
-            ]
-
-    if len(paragraphs) <= 1:
-        flesch_score = textstat.flesch_reading_ease(text)
-        grade_level = textstat.flesch_kincaid_grade(text)
-        return {
-            "status": "insufficient_data",
-            "paragraph_count": len(paragraphs),
-            "reading_ease_std": 0.0,
-            "grade_level_std": 0.0,
-            "avg_reading_ease": flesch_score,
-            "avg_grade_level": grade_level,
-            "uniformity_score": "N/A"
-        }
+import shared_nlp
+
+_SENTENCES_PER_CHUNK = 3
+
+
+@lru_cache(maxsize=65536)
+def _syllables(word: str) -> int:
+    return max(1, textstat.syllable_count(word))
+
+
+def _paragraph_starts(text: str) -> np.ndarray:
+    starts = []
+    offset = 0
+    for block in text.split('\n\n'):
+        if block.strip():
+            starts.append(offset)
+        offset += len(block) + 2
+    return np.asarray(starts, dtype=np.int64)
+
+
+def _flesch_scores(words: np.ndarray, sentences: np.ndarray, syllables: np.ndarray):
+    words = np.maximum(words, 1)
+    words_per_sentence = words / np.maximum(sentences, 1)
+    syllables_per_word = syllables / words
+    ease = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+    grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+    return ease, grade
+
 
-    ease_scores = []
-    grade_scores = []
+def count_readability_units(doc) -> tuple[int, int, int]:
+    """Returns the (words, sentences, syllables) totals of a parsed paragraph."""
+    word_tokens = [t for t in doc if not t.is_punct and not t.is_space]
+    syllables = sum(_syllables(t.lower_) for t in word_tokens)
+    return len(word_tokens), sum(1 for _ in doc.sents), syllables
 
-    for p in paragraphs:
-        ease = textstat.flesch_reading_ease(p)
-        grade = textstat.flesch_kincaid_grade(p)
-        
-        ease_scores.append(ease)
-        grade_scores.append(grade)
+
+def score_paragraphs(words, sentences, syllables) -> dict:
+    """Builds the variance report from per-paragraph word, sentence and syllable totals."""
+    ease_scores, grade_scores = _flesch_scores(
+        np.asarray(words, dtype=np.float64),
+        np.asarray(sentences, dtype=np.float64),
+        np.asarray(syllables, dtype=np.float64),
+    )
 
     ease_std = float(np.std(ease_scores))
     grade_std = float(np.std(grade_scores))
-    
+
     avg_ease = float(np.mean(ease_scores))
     avg_grade = float(np.mean(grade_scores))
 
     result = {
         "status": "success",
-        "paragraph_count": len(paragraphs),
+        "paragraph_count": len(ease_scores),
         "reading_ease_std": round(ease_std, 2),
         "grade_level_std": round(grade_std, 2),
         "avg_reading_ease": round(avg_ease, 2),
@@ -69,3 +79,50 @@ def analyze_readability_variance(text: str) -> dict:
     }
 
     return result
+
+
+def analyze_readability_variance(text: str, doc=None) -> dict:
+    if doc is None:
+        doc = shared_nlp.get_nlp_light()(text)
+
+    word_tokens = [t for t in doc if not t.is_punct and not t.is_space]
+    word_offsets = np.fromiter((t.idx for t in word_tokens), dtype=np.int64, count=len(word_tokens))
+    word_syllables = np.fromiter(
+        (_syllables(t.lower_) for t in word_tokens), dtype=np.int64, count=len(word_tokens)
+    )
+    sentence_offsets = np.fromiter((s.start_char for s in doc.sents), dtype=np.int64)
+
+    paragraph_starts = _paragraph_starts(text)
+    group_count = len(paragraph_starts)
+
+    if group_count > 1:
+        word_groups = np.searchsorted(paragraph_starts, word_offsets, side='right') - 1
+        sentence_groups = np.searchsorted(paragraph_starts, sentence_offsets, side='right') - 1
+    elif len(sentence_offsets) >= 2 * _SENTENCES_PER_CHUNK:
+        # Fallback: a single paragraph is scored in chunks of 3 sentences
+        sentence_index = np.searchsorted(sentence_offsets, word_offsets, side='right') - 1
+        word_groups = sentence_index // _SENTENCES_PER_CHUNK
+        sentence_groups = np.arange(len(sentence_offsets)) // _SENTENCES_PER_CHUNK
+        group_count = int(sentence_groups[-1]) + 1
+    else:
+        ease, grade = _flesch_scores(
+            np.array([len(word_tokens)]), np.array([len(sentence_offsets)]), np.array([word_syllables.sum()])
+        )
+        return {
+            "status": "insufficient_data",
+            "paragraph_count": group_count,
+            "reading_ease_std": 0.0,
+            "grade_level_std": 0.0,
+            "avg_reading_ease": round(float(ease[0]), 2),
+            "avg_grade_level": round(float(grade[0]), 2),
+            "uniformity_score": "N/A"
+        }
+
+    word_groups = np.clip(word_groups, 0, group_count - 1)
+    sentence_groups = np.clip(sentence_groups, 0, group_count - 1)
+
+    words = np.bincount(word_groups, minlength=group_count)
+    syllables = np.bincount(word_groups, weights=word_syllables, minlength=group_count)
+    sentences = np.bincount(sentence_groups, minlength=group_count)
+
+    return score_paragraphs(words, sentences, syllables)
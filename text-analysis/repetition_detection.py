@@ -5,19 +5,22 @@ The main purpose is to find n-gram repetitions that make the text feel robotic
 or redundant.
 
 It achieves this by:
-1. Tokenizing the text into words.
-2. generating n-grams of specified lengths (e.g., 2-5 words).
-3. identifying and counting duplicates.
+1. Tokenizing the text into words and their spaCy lowercase hash ids.
+2. rolling those ids into a single 64-bit hash per n-gram of the specified lengths (e.g., 2-5 words).
+3. counting duplicate hashes with NumPy and only building strings for the repeated phrases.
 
 The end goal is to highlight repetitive phrasing that needs variation.
 """
 from __future__ import annotations
 
-from collections import Counter
+import numpy as np
 import shared_nlp
 
 import _paths
 
+# Odd 64-bit multiplier for the polynomial rolling hash (arithmetic wraps modulo 2**64).
+_HASH_BASE = np.uint64(0x9E3779B97F4A7C15)
+
 
 def tokenize_text(text: str) -> list[str]:
     nlp = shared_nlp.get_nlp_light()
@@ -29,27 +32,37 @@ def tokenize_text_into_sentences(text: str) -> list[str]:
     doc = nlp(text)
     return [sent.text for sent in doc.sents]
 
-def get_repeating_keyphrases(text: str, min_phrase_length: int = 2, max_phrase_length: int = 5) -> list[str]:
-    words = tokenize_text(text)
-    keyphrases = _extract_ngrams(words, min_phrase_length, max_phrase_length)
-    return _find_repetitions(keyphrases)
-
-def _extract_ngrams(words: list[str], min_length: int, max_length: int) -> list[str]:
-    ngrams = []
-    for n in range(min_length, max_length + 1):
-        for i in range(len(words) - n + 1):
-            ngrams.append(' '.join(words[i:i+n]))
-    return ngrams
-
-def _find_repetitions(items: list[str]) -> list[str]:
-    counts = Counter(item.lower() for item in items)
-    # We want to return the original case-version of the first occurrence
-    # Or just returning the lowercase version is fine. The original code returned the original case.
-    # Let's preserve original case for the output.
-    seen_originals = {}
-    for item in items:
-        lower_item = item.lower()
-        if lower_item not in seen_originals:
-            seen_originals[lower_item] = item
-            
-    return [seen_originals[normalized] for normalized, count in counts.items() if count > 1]
\ No newline at end of file
+def tokenize_text_with_ids(text: str, doc=None) -> tuple[list[str], np.ndarray]:
+    if doc is None:
+        doc = shared_nlp.get_nlp_blank().make_doc(text)
+    tokens = [token for token in doc if not token.is_punct and not token.is_space]
+    words = [token.text for token in tokens]
+    ids = np.fromiter((token.lower for token in tokens), dtype=np.uint64, count=len(tokens))
+    return words, ids
+
+def get_repeating_keyphrases(text: str, min_phrase_length: int = 2, max_phrase_length: int = 5, doc=None) -> list[str]:
+    words, ids = tokenize_text_with_ids(text, doc)
+    return find_repeated_ngrams(words, ids, min_phrase_length, max_phrase_length)
+
+def find_repeated_ngrams(words: list[str], ids: np.ndarray, min_length: int, max_length: int) -> list[str]:
+    """
+    Returns the first occurrence (original case) of every n-gram that appears more than once,
+    ordered by n and then by position. `ids` holds one case-insensitive hash per word.
+    """
+    repeated = []
+    hashes = ids.astype(np.uint64, copy=True)
+
+    for n in range(1, max_length + 1):
+        if n > 1:
+            # hash(w[i:i+n]) = hash(w[i:i+n-1]) * BASE + id(w[i+n-1])
+            hashes = hashes[:-1] * _HASH_BASE + ids[n - 1:]
+        if len(hashes) == 0:
+            break
+        if n < min_length:
+            continue
+
+        _, first_index, counts = np.unique(hashes, return_index=True, return_counts=True)
+        for i in np.sort(first_index[counts > 1]):
+            repeated.append(' '.join(words[i:i + n]))
+
+    return repeated
@@ -39,11 +39,25 @@ def _classify_variance(cv: float) -> str:
     return 'burstive'
 
 
-def uniform_sentence_check(text: str) -> dict:
-    from repetition_detection import tokenize_text
-    sentences = tokenize_text_into_sentences(text)
-    words_per_sentence = [len(tokenize_text(sentence)) for sentence in sentences]
+def sentence_word_counts(doc) -> list[int]:
+    return [
+        sum(1 for token in sent if not token.is_punct and not token.is_space)
+        for sent in doc.sents
+    ]
 
+
+def uniform_sentence_check(text: str, doc=None) -> dict:
+    if doc is not None:
+        words_per_sentence = sentence_word_counts(doc)
+    else:
+        from repetition_detection import tokenize_text
+        sentences = tokenize_text_into_sentences(text)
+        words_per_sentence = [len(tokenize_text(sentence)) for sentence in sentences]
+
+    return classify_sentence_lengths(words_per_sentence)
+
+
+def classify_sentence_lengths(words_per_sentence: list[int]) -> dict:
     if len(words_per_sentence) <= 1:
         return _build_result(0, 'insufficient')
 
@@ -21,13 +21,14 @@ AI_FAVORED_VERBS = {
     "showcase", "streamline", "exemplify", "resonate", "spearhead"
 }
 
-def analyze_verb_frequency(text: str) -> Dict[str, Any]:
+def analyze_verb_frequency(text: str, doc=None) -> Dict[str, Any]:
 
     if not text or not text.strip():
         return _build_empty_result()
 
-    nlp = shared_nlp.get_nlp_tagger()
-    doc = nlp(text)
+    if doc is None:
+        nlp = shared_nlp.get_nlp_tagger()
+        doc = nlp(text)
     
     total_verbs = 0
     ai_verb_occurrences = 0
@@ -10,7 +10,7 @@ import os
 import csv
 import re
 import random
-from typing import List, Tuple
+from typing import Optional
 
 import _paths  # noqa: E402 — centralised path setup
 
@@ -49,61 +49,86 @@ _CONTRACTION_TYPO_RATE = 0.15
 _AMPERSAND_RATE = 0.25
 _DOUBLE_SPACE_RATE = 0.40
 
+# A "word" is a maximal run of characters that are neither whitespace nor . , ; ! ?
+_WORD_START = r'(?<![^\s.,;!?])'
+_WORD_END = r'(?![^\s.,;!?])'
+_SEPARATOR_CHARS = re.compile(r'[\s.,;!?]')
+
+_SPACES = re.compile(r'[ \t]+')
+_SENTENCE_GAP = re.compile(r'([.!?])\s+(?=[A-Z])')
+
+_substitution_pattern = None
+
+
 def _cleanup_spaces(text: str) -> str:
-    return re.sub(r'[ \t]+', ' ', text)
-
-
-def _fuzz_spelling(text: str) -> str:
-    
-    words = re.split(r'(\s+|[.,;!?])', text)
-    result = []
-    
-    for w in words:
-        if not w or w.isspace() or re.match(r'[.,;!?]', w):
-            result.append(w)
-            continue
-            
+    return _SPACES.sub(' ', text)
+
+
+def _get_substitution_pattern() -> re.Pattern:
+    """One alternation over every typo key and "and", matched only as whole words."""
+    global _substitution_pattern
+    if _substitution_pattern is None:
+        keys = set(_COMMON_TYPOS) | set(_CONTRACTION_TYPOS) | {"and"}
+        keys = [k for k in keys if not _SEPARATOR_CHARS.search(k)]
+        alternation = '|'.join(re.escape(k) for k in sorted(keys, key=len, reverse=True))
+        _substitution_pattern = re.compile(_WORD_START + '(?:' + alternation + ')' + _WORD_END, re.IGNORECASE)
+    return _substitution_pattern
+
+
+def _scaled(rate: float, scale: float) -> float:
+    return min(1.0, rate * scale)
+
+
+def _substitute_words(text: str, rng: random.Random, scale: float = 1.0) -> str:
+    """
+    Applies spelling typos, contraction typos and "and" -> "&" swaps in a single pass.
+    Ampersands only replace an "and" delimited by plain spaces (or the text edges).
+    """
+    typo_rate = _scaled(_TYPO_RATE, scale)
+    contraction_typo_rate = _scaled(_CONTRACTION_TYPO_RATE, scale)
+    ampersand_rate = _scaled(_AMPERSAND_RATE, scale)
+
+    def replace(match):
+        w = match.group(0)
         w_lower = w.lower()
-        new_w = w
-        
-        if w_lower in _COMMON_TYPOS and random.random() < _TYPO_RATE:
-            new_w = _COMMON_TYPOS[w_lower]
-            if w[0].isupper():
-                new_w = new_w.capitalize()
-        elif w_lower in _CONTRACTION_TYPOS and random.random() < _CONTRACTION_TYPO_RATE:
-            new_w = _CONTRACTION_TYPOS[w_lower]
-            if w[0].isupper():
-                new_w = new_w.capitalize()
-                
-        result.append(new_w)
-        
-    return "".join(result)
-
-
-def _inject_typographical_quirks(text: str) -> str:
-    # Ampersand swaps
-    words = text.split(' ')
-    result = []
-    for w in words:
-        if w.lower() == "and" and random.random() < _AMPERSAND_RATE:
-            result.append("&")
-        else:
-            result.append(w)
-    text = ' '.join(result)
-
-    if random.random() < _DOUBLE_SPACE_RATE:
-        text = re.sub(r'([.!?])\s+(?=[A-Z])', r'\1  ', text)
-        
+
+        typo = None
+        if w_lower in _COMMON_TYPOS and rng.random() < typo_rate:
+            typo = _COMMON_TYPOS[w_lower]
+        elif w_lower in _CONTRACTION_TYPOS and rng.random() < contraction_typo_rate:
+            typo = _CONTRACTION_TYPOS[w_lower]
+        if typo is not None:
+            return typo.capitalize() if w[0].isupper() else typo
+
+        if w_lower == "and":
+            start, end = match.span()
+            spaced = (start == 0 or text[start - 1] == ' ') and (end == len(text) or text[end] == ' ')
+            if spaced and rng.random() < ampersand_rate:
+                return "&"
+        return w
+
+    return _get_substitution_pattern().sub(replace, text)
+
+
+def _inject_double_spaces(text: str, rng: random.Random, scale: float = 1.0) -> str:
+    if rng.random() < _scaled(_DOUBLE_SPACE_RATE, scale):
+        text = _SENTENCE_GAP.sub(r'\1  ', text)
     return text
 
 
-def inject_imperfections(text: str) -> str:
+def inject_imperfections(text: str, rng: Optional[random.Random] = None, scale: float = 1.0) -> str:
+    """
+    Pass a seeded `random.Random` for reproducible output.
+    `scale` multiplies every imperfection rate (capped at 1.0).
+    """
     if not text:
         return text
-        
+
     _load_typos_csv()
-    
-    text = _fuzz_spelling(text)
-    text = _inject_typographical_quirks(text)
-    
-    return text
\ No newline at end of file
+    if rng is None:
+        rng = random.Random()
+
+    text = _substitute_words(text, rng, scale)
+    text = _inject_double_spaces(text, rng, scale)
+
+    return text
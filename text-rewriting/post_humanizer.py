@@ -8,11 +8,16 @@ more organic and flawed.
 It achieves this through a layered process:
 1. Aggressively converts full two-word pairs (e.g., "do not", "they are") into their contracted forms ("don't", "they're") to sound less formal.
 2. Calls the imperfection injector to randomly add humanizing typos and typographical quirks like double spaces.
+
+The randomness is driven by a seed, so the same text, strength and seed always produce the same output.
+That keeps the pipeline reproducible in tests and benchmarks.
 """
 import re
 import os
 import csv
-from typing import Dict
+import hashlib
+import random
+from typing import Dict, Optional
 from imperfection_injector import inject_imperfections
 import shared_utils
 
@@ -23,6 +28,13 @@ _data_loaded = False
 _contraction_pattern = None
 _contraction_lookup = None
 
+# How strongly each strength setting applies the imperfection rates.
+_STRENGTH_SCALES = {
+    "light": 0.5,
+    "medium": 1.0,
+    "aggressive": 1.6,
+}
+
 
 def _load_csv_data() -> None:
     global _contraction_pairs, _data_loaded
@@ -68,14 +80,30 @@ def _enforce_contractions(text: str) -> str:
     return _contraction_pattern.sub(replacer, text)
 
 
-def humanize(text: str, strength: str = "medium") -> str:
+def derive_seed(text: str, user_id=None) -> int:
+    """
+    A stable seed for `humanize` from the text the user submitted (after sanitization) and
+    (optionally) the user, so the same request gets the same imperfections on every run.
+    """
+    digest = hashlib.blake2b(f"{user_id}\0{text}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
 
-    if not text or not text.strip():
-        return text
 
+def _humanize(text: str, strength: str, rng: random.Random) -> str:
     _load_csv_data()
 
     text = _enforce_contractions(text)
-    text = inject_imperfections(text)
-    
-    return text
\ No newline at end of file
+    text = inject_imperfections(text, rng, _STRENGTH_SCALES.get(strength, 1.0))
+
+    return text
+
+
+def humanize(text: str, strength: str = "medium", seed: Optional[int] = None) -> str:
+    """
+    Humanizes the text. `strength` is "light", "medium" or "aggressive" and scales the imperfection
+    rates. With a seed the output is deterministic; without one it varies per call.
+    """
+    if not text or not text.strip():
+        return text
+
+    return _humanize(text, strength, random.Random(seed))
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+The prompt budget module keeps the rewriting prompt as small as the text allows.
+
+Embedding the whole `humanizer_patterns.md` and the full, indented analysis JSON in every request
+meant most input tokens (and much of the time to first token) went to fixed overhead.
+
+It achieves this by:
+1. Splitting `humanizer_patterns.md` once into its numbered pattern sections (plus "Personality and soul"),
+   dropping the parts that duplicate or contradict the system prompt (task, process, output format, examples).
+2. Mapping every metric in the analysis, and a few cheap checks on the text itself (em dashes, emojis,
+   curly quotes...), to the pattern sections that address them.
+3. Compacting the analysis down to the actionable findings, serialized without whitespace.
+4. Adding the selected sections in priority order until the pattern token budget is used up.
+
+The end goal is to only pay for the guidance that applies to the text being rewritten.
+"""
+import json
+import logging
+import os
+import re
+
+__all__ = ['estimate_tokens', 'compact_analysis', 'select_patterns', 'build_prompt_inputs']
+
+logger = logging.getLogger(__name__)
+
+PATTERN_TOKEN_BUDGET = int(os.getenv("PROMPT_PATTERN_TOKEN_BUDGET", "1800"))
+
+_PATTERNS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "humanizer_patterns.md")
+
+_PERSONALITY = "personality"
+
+# Used when the analysis points at nothing in particular.
+_DEFAULT_PATTERNS = (7, 1, 22, 3)
+
+_MAX_LIST_ITEMS = 10
+
+_PATTERN_HEADING = re.compile(r'^### (\d+)\. ', re.MULTILINE)
+_SECTION_BREAK = re.compile(r'^(?:---\s*$|## )', re.MULTILINE)
+
+_TEXT_SIGNALS = [
+    (re.compile(r'[—–]'), (13,)),
+    (re.compile(r'\*\*[^*\n]+\*\*'), (14,)),
+    (re.compile(r'^\s*(?:[-*•]|\d+\.)\s+\*{0,2}[A-Z][^:\n]{0,40}:', re.MULTILINE), (15,)),
+    (re.compile(r'^#{1,6}\s', re.MULTILINE), (16,)),
+    (re.compile('[\U0001F300-\U0001FAFF☀-➿]'), (17,)),
+    (re.compile(r'[“”‘’]'), (18,)),
+]
+
+_sections = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English prose)."""
+    return (len(text) + 3) // 4
+
+
+def _load_sections() -> dict:
+    global _sections
+    if _sections is not None:
+        return _sections
+
+    sections = {}
+    if os.path.exists(_PATTERNS_PATH):
+        with open(_PATTERNS_PATH, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        headings = list(_PATTERN_HEADING.finditer(content))
+        for heading in headings:
+            end = _SECTION_BREAK.search(content, heading.end())
+            body = content[heading.start():end.start() if end else len(content)]
+            sections[int(heading.group(1))] = body.strip()
+
+        personality = content.find("## PERSONALITY AND SOUL")
+        if personality != -1:
+            end = content.find("\n## ", personality + 1)
+            body = content[personality:end if end != -1 else len(content)]
+            sections[_PERSONALITY] = body.replace("\n---", "").strip()
+
+    _sections = sections
+    return sections
+
+
+def _ok(stats: dict, name: str) -> dict:
+    result = stats.get(name)
+    if not isinstance(result, dict) or "error" in result:
+        return {}
+    return result
+
+
+def compact_analysis(analysis: dict) -> dict:
+    """
+    Keeps only the findings the rewrite should act on. Metrics that found nothing, errors and
+    presentation fields (colors, statuses, counts that are implied by the lists) are dropped.
+    """
+    stats = analysis.get("statistical_metrics") or {}
+    compact = {}
+
+    hedging = _ok(stats, "hedging")
+    if hedging.get("filler_count"):
+        compact["fillers"] = sorted(hedging.get("detected_fillers", []))[:_MAX_LIST_ITEMS]
+        compact["filler_density_pct"] = round(hedging.get("filler_density", 0), 1)
+
+    phrases = _ok(stats, "ai_phrases").get("phrases")
+    if phrases:
+        compact["ai_phrases"] = sorted(set(phrases))[:_MAX_LIST_ITEMS]
+
+    flagged = _ok(stats, "flagged_words").get("words")
+    if flagged:
+        compact["flagged_words"] = flagged[:_MAX_LIST_ITEMS]
+
+    verbs = _ok(stats, "verb_frequency")
+    if verbs.get("ai_verbs_count"):
+        compact["ai_verbs"] = sorted(verbs.get("detected_ai_verbs", []))[:_MAX_LIST_ITEMS]
+
+    repetition = _ok(stats, "repetition")
+    if repetition.get("count"):
+        compact["repeated_phrases"] = repetition.get("samples", [])
+
+    variance = _ok(stats, "sentence_variance")
+    if variance.get("signal") == "Likely AI":
+        compact["sentence_lengths"] = "too uniform, vary them"
+
+    readability = _ok(stats, "readability")
+    if readability.get("uniformity_score") == "High":
+        compact["readability"] = "same level in every paragraph, vary it"
+
+    punctuation = _ok(stats, "punctuation_profile")
+    if punctuation.get("structure_ratio", 0) > 0.5 and punctuation.get("structured_punct_count", 0) >= 3:
+        compact["punctuation"] = "too structured (; : parentheses), prefer plain sentences"
+
+    critique = analysis.get("llm_critique")
+    if isinstance(critique, dict) and "error" not in critique:
+        for key in ("stylistic_issues", "recommended_actions"):
+            if critique.get(key):
+                compact[key] = critique[key][:_MAX_LIST_ITEMS]
+
+    return compact
+
+
+def _pattern_scores(compact: dict, text: str) -> dict:
+    scores = {}
+
+    def vote(patterns, weight=1):
+        for p in patterns:
+            scores[p] = scores.get(p, 0) + weight
+
+    if "ai_phrases" in compact:
+        vote((1, 4, 7, 19, 24), len(compact["ai_phrases"]))
+    if "flagged_words" in compact:
+        vote((7, 11), len(compact["flagged_words"]))
+    if "ai_verbs" in compact:
+        vote((7, 8, 3), len(compact["ai_verbs"]))
+    if "fillers" in compact:
+        vote((22, 23), len(compact["fillers"]))
+    if "repeated_phrases" in compact:
+        vote((11, 10), len(compact["repeated_phrases"]))
+    if "sentence_lengths" in compact or "readability" in compact:
+        vote((_PERSONALITY, 10), 2)
+    if "punctuation" in compact:
+        vote((13, 15), 2)
+
+    for pattern, patterns in _TEXT_SIGNALS:
+        hits = len(pattern.findall(text))
+        if hits:
+            vote(patterns, hits)
+
+    return scores
+
+
+def select_patterns(compact: dict, text: str, budget: int = None) -> str:
+    """Returns the relevant pattern sections, most relevant first, within `budget` tokens."""
+    budget = PATTERN_TOKEN_BUDGET if budget is None else budget
+    sections = _load_sections()
+
+    scores = _pattern_scores(compact, text)
+    if not scores:
+        scores = {p: len(_DEFAULT_PATTERNS) - i for i, p in enumerate(_DEFAULT_PATTERNS)}
+
+    ranked = sorted((p for p in scores if p in sections), key=lambda p: -scores[p])
+    selected, used = [], 0
+    for p in ranked:
+        cost = estimate_tokens(sections[p])
+        if used + cost > budget:
+            continue
+        selected.append(p)
+        used += cost
+
+    # Keep the document's own order so numbered patterns read naturally.
+    selected.sort(key=lambda p: -1 if p == _PERSONALITY else p)
+    return "\n\n".join(sections[p] for p in selected)
+
+
+def build_prompt_inputs(text: str, analysis: dict) -> dict:
+    """The variables for `prompts.rewriting_prompt`, with their estimated token sizes logged."""
+    compact = compact_analysis(analysis)
+    inputs = {
+        "text": text,
+        "analysis": json.dumps(compact, ensure_ascii=False, separators=(",", ":")),
+        "patterns": select_patterns(compact, text),
+    }
+    logger.info(
+        "Rewrite prompt inputs: text=%d analysis=%d patterns=%d tokens (estimated)",
+        *(estimate_tokens(inputs[k]) for k in ("text", "analysis", "patterns")),
+    )
+    return inputs
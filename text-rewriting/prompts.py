@@ -4,22 +4,16 @@ This file contains the needed prompts for the rewriting process.
 The system one is the one responsible for telling the llm all of the details needed to achieve the task,
 mentioned in the human prompt. 
 It utilizes certain rules (ex. The Hemingway Rule) alongside the results of the analysis to create the best results.
+Only the sections of `humanizer_patterns.md` relevant to the analysis are filled into {patterns},
+see prompt_budget.py.
 
 The human one is responsible for just telling the llm about the task it needs to do.
 """
 from langchain_core.prompts import ChatPromptTemplate
-import os
 
 import _paths
 
-# Load humanizer patterns dynamically
-_humanizer_patterns_path = os.path.join(os.path.dirname(__file__), "humanizer_patterns.md")
-_humanizer_patterns = ""
-if os.path.exists(_humanizer_patterns_path):
-    with open(_humanizer_patterns_path, "r", encoding="utf-8") as f:
-        _humanizer_patterns = f.read()
-
-SYSTEM_PROMPT = f"""You are a "Humanizer." Your job is to strip away AI mannerisms and output raw, authentic human text.
+SYSTEM_PROMPT = """You are a "Humanizer." Your job is to strip away AI mannerisms and output raw, authentic human text.
 
 ### THE PROCESS (CRITICAL)
 1. **DESTRUCTURE:** Read the input draft and extract the core facts/ideas. Ignore the *wording* and *structure* of the original completely.
@@ -46,11 +40,11 @@ SYSTEM_PROMPT = f"""You are a "Humanizer." Your job is to strip away AI manneris
 9. **Bullet/Number Lists:** Absolutely no bulleted lists, numbered lists, or markdown formatting other than paragraphs.
 10. **The "It is" Trap:** Do not start sentences with "It is important to note," "There is," or "It has been."
 
-### AI WRITING PATTERNS TO AVOID (WIKIPEDIA 24 SIGNS)
-{_humanizer_patterns}
+### AI WRITING PATTERNS TO AVOID (FROM WIKIPEDIA'S SIGNS OF AI WRITING)
+{patterns}
 
 ### ANALYSIS INTEGRATION
-The `analysis` JSON contains findings. Use them to know what to avoid, but your main guide is the "Hemingway Rule."
+The `analysis` JSON contains only the findings that need fixing. Use them to know what to avoid, but your main guide is the "Hemingway Rule."
 
 ### FATAL ERRORS (OUTPUT WILL BE REJECTED)
 1. Writing meta-commentary ("Here is the rewrite").
@@ -14,17 +14,73 @@ It uses a buffer to store the output of the LLM and yields it as soon as it is s
 to be part of the final text (maintaining a small buffer to handle the closing tag).
 This is used with the purpose to show the user, the text is being rewritten in real time,
 rather than a lengthy loading screen.
+
+Long documents go through stream_rewrite_chunked instead. The text is split on paragraph
+(or, for huge paragraphs, sentence) boundaries, a bounded number of chunks are rewritten
+concurrently, and their outputs are streamed back in the original order: the first chunk
+streams live while the later ones are generated and buffered in the background.
 """
 
-import json
+import asyncio
+import os
+import time
 import traceback
 import re
 
 import _paths  # noqa: E402 — centralised path setup
 
 import llm_info
+import shared_utils
+import tracing
+from prompt_budget import build_prompt_inputs
 from prompts import rewriting_prompt
 
+REWRITE_CHUNK_CHARS = int(os.getenv("REWRITE_CHUNK_CHARS", "6000"))
+REWRITE_CHUNK_CONCURRENCY = int(os.getenv("REWRITE_CHUNK_CONCURRENCY", "3"))
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_CHUNK_SEPARATOR = "\n\n"
+_DONE = object()
+
+
+def _pack(pieces: list[str], max_chars: int, separator: str) -> list[str]:
+    chunks, current, size = [], [], 0
+    for piece in pieces:
+        if current and size + len(separator) + len(piece) > max_chars:
+            chunks.append(separator.join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece) + (len(separator) if size else 0)
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def split_into_chunks(text: str, max_chars: int = REWRITE_CHUNK_CHARS) -> list[str]:
+    """Groups whole paragraphs into chunks of at most `max_chars` (oversized paragraphs are split by sentence)."""
+    pieces = []
+    for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+        if not paragraph.strip():
+            continue
+        if len(paragraph) > max_chars:
+            pieces.extend(_pack(shared_utils.split_sentences(paragraph), max_chars, " "))
+        else:
+            pieces.append(paragraph)
+    return _pack(pieces, max_chars, _CHUNK_SEPARATOR)
+
+
+def _end_llm_span(span, t_start, t_first, chunks, chars):
+    """Records time to first token and generation speed (streamed chunks are roughly one token each)."""
+    t_end = time.perf_counter()
+    span.set_attributes({"output_chunks": chunks, "output_chars": chars})
+    if t_first is not None:
+        span.set_attribute("ttft_ms", round((t_first - t_start) * 1000, 1))
+        generation = t_end - t_first
+        if generation > 0:
+            span.set_attribute("tokens_per_sec", round(chunks / generation, 1))
+    span.end()
+
+
 class RewritingAgent:
 
     def __init__(self):
@@ -32,6 +88,12 @@ class RewritingAgent:
         self.chain = (rewriting_prompt | self.llm).with_retry(stop_after_attempt=3)
 
     async def stream_rewrite(self, text: str, analysis: dict):
+        # Not made the current span: the consumer runs its own code between our yields.
+        span = tracing.start_span("llm.rewrite", input_chars=len(text))
+        t_start = time.perf_counter()
+        t_first = None
+        received_chunks = 0
+        received_chars = 0
         has_yielded_content = False
         
         buffer = ""
@@ -40,15 +102,14 @@ class RewritingAgent:
         end_tag = "</final_text>"
         
         try:
-            analysis_str = json.dumps(analysis, indent=2)
-            
-            async for chunk in self.chain.astream({
-                "text": text,
-                "analysis": analysis_str
-            }):
+            async for chunk in self.chain.astream(build_prompt_inputs(text, analysis)):
                 if chunk is not None and chunk.content is not None:
                     if isinstance(chunk.content, str) and chunk.content:
-                        
+                        if t_first is None:
+                            t_first = time.perf_counter()
+                        received_chunks += 1
+                        received_chars += len(chunk.content)
+
                         buffer += chunk.content
                         
                         if not found_start_tag:
@@ -85,6 +146,7 @@ class RewritingAgent:
                     yield buffer
                     
         except Exception as e:
+            span.record_exception(e)
             print(f"Streaming Error: {str(e)}")
             traceback.print_exc()
             
@@ -92,5 +154,53 @@ class RewritingAgent:
                 yield f"[Error: Failed to generate text. Check logs.]"
             else:
                 print("Silently suppressed error after partial generation.")
+        finally:
+            _end_llm_span(span, t_start, t_first, received_chunks, received_chars)
+
+    async def stream_rewrite_chunked(self, text: str, analysis: dict,
+                                     max_chunk_chars: int = REWRITE_CHUNK_CHARS,
+                                     concurrency: int = REWRITE_CHUNK_CONCURRENCY):
+        chunks = split_into_chunks(text, max_chunk_chars)
+        if len(chunks) <= 1:
+            async for piece in self.stream_rewrite(text, analysis):
+                yield piece
+            return
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        queues = [asyncio.Queue() for _ in chunks]
+
+        async def produce(index: int):
+            # Tasks are created in order, so earlier chunks get the free slots first.
+            async with semaphore:
+                try:
+                    async for piece in self.stream_rewrite(chunks[index], analysis):
+                        await queues[index].put(piece)
+                finally:
+                    queues[index].put_nowait(_DONE)
+
+        tasks = [asyncio.create_task(produce(i)) for i in range(len(chunks))]
+        try:
+            for index, queue in enumerate(queues):
+                if index:
+                    yield _CHUNK_SEPARATOR
+                # Whitespace around each chunk is trimmed so chunks join on exactly one blank line.
+                held, started = "", False
+                while (piece := await queue.get()) is not _DONE:
+                    if not started:
+                        piece = piece.lstrip() if index else piece
+                        if not piece:
+                            continue
+                        started = True
+                    body = piece.rstrip()
+                    if body:
+                        yield held + body
+                        held = piece[len(body):]
+                    else:
+                        held += piece
+        finally:
+            # Stops the remaining generations if the client goes away mid-stream.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
 rewriting_agent = RewritingAgent()
\ No newline at end of file
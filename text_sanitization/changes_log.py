@@ -9,6 +9,7 @@ import pii_redactor
 import markdown_stripper
 import profanity_filter
 import emoji_cleaner
+import tracing
 
 Change = namedtuple('Change', ['description', 'text_before', 'text_after'])
 
@@ -33,6 +34,12 @@ def apply_regex_changes(text, regex_patterns):
             
     return changes, text
 
+def _apply_step(description, func, text):
+    with tracing.span("sanitize.step", step=description, chars=len(text)) as span:
+        new_text = func(text)
+        span.set_attribute("changed", new_text != text)
+    return new_text
+
 def build_changes_log(text):
     changes = []
     
@@ -44,7 +51,7 @@ def build_changes_log(text):
     ]
 
     for description, func in transformations:
-        new_text = func(text)
+        new_text = _apply_step(description, func, text)
         if new_text != text:
             changes.append(Change(
                 description=description,
@@ -53,7 +60,8 @@ def build_changes_log(text):
             ))
             text = new_text
 
-    regex_changes, text = apply_regex_changes(text, strip_inv_chars.PATTERNS)
+    with tracing.span("sanitize.step", step="Invisible Character Patterns"):
+        regex_changes, text = apply_regex_changes(text, strip_inv_chars.PATTERNS)
     changes.extend(regex_changes)
     
     post_regex_transformations = [
@@ -64,7 +72,7 @@ def build_changes_log(text):
     ]
 
     for description, func in post_regex_transformations:
-        new_text = func(text)
+        new_text = _apply_step(description, func, text)
         if new_text != text:
             changes.append(Change(
                 description=description,
@@ -73,7 +81,8 @@ def build_changes_log(text):
             ))
             text = new_text
 
-    regex_changes, text = apply_regex_changes(text, normalizator.PATTERNS)
+    with tracing.span("sanitize.step", step="Normalization Patterns"):
+        regex_changes, text = apply_regex_changes(text, normalizator.PATTERNS)
     changes.extend(regex_changes)
     
     return text, changes
\ No newline at end of file
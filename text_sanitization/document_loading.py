@@ -5,16 +5,27 @@ I have combined the importing logic into a single file to make it easier to main
 
 It achieves this by:
 1. Mapping file extensions to specific loader functions (.txt, .docx, .html, .pdf).
-2. utilizing specialized libraries like BeautifulSoup, docx2txt, and pypdf to extract text.
+2. utilizing specialized libraries like docx2txt, PyMuPDF and the html_cleaner parser backends to extract text.
 3. implementing error handling for unsupported formats and loading failures.
+4. offering in-memory variants of every loader so uploads can be parsed straight from bytes.
+5. extracting large PDFs page range by page range, in a shared process pool when PDF_PROCESS_POOL is on.
 
 The end goal is to abstract away the file reading complexity and return a clean string.
 """
+import atexit
+import io
+import multiprocessing
 import os
-from bs4 import BeautifulSoup
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, Union
+
 import docx2txt
 import fitz
 
+import html_cleaner
+
 def _load_txt(file_path: str) -> str:
     with open(file_path, 'r', encoding='utf-8') as f:
         return f.read()
@@ -26,15 +37,135 @@ def _load_docx(file_path: str) -> str:
 
 def _load_html(file_path: str) -> str:
     with open(file_path, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'html.parser')
-        return soup.get_text(separator='\n', strip=True)
+        return html_cleaner.html_to_text(f.read(), separator='\n', strip=True)
+
+
+PdfSource = Union[str, bytes]
+
+_PARALLEL_PAGE_THRESHOLD = 64
+_PAGES_PER_TASK = 32
+
+# Off by default: serverless runtimes cannot run process pools, and small deployments gain little.
+PDF_PROCESS_POOL = os.getenv("PDF_PROCESS_POOL", "off").lower() == "on"
+PDF_POOL_WORKERS = int(os.getenv("PDF_POOL_WORKERS", "0")) or None
+
+_pool = None
+_pool_unavailable = False
+_pool_lock = threading.Lock()
+
+
+def _open_pdf(source: PdfSource):
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype='pdf')
+    return fitz.open(source)
+
+
+def _extract_pdf_range(source: PdfSource, start: int, stop: int) -> list[str]:
+    # Runs inside pool workers, so every call opens its own document handle.
+    with _open_pdf(source) as doc:
+        return [doc[i].get_text() or '' for i in range(start, stop)]
+
+
+def _resolve_page_bounds(page_count: int, start_page: int, max_pages: Optional[int]) -> tuple[int, int]:
+    start = min(max(start_page, 0), page_count)
+    stop = page_count if max_pages is None else min(page_count, start + max(max_pages, 0))
+    return start, stop
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """The shared PDF process pool, created on first use; None when it cannot be created."""
+    global _pool, _pool_unavailable
+    if _pool is None and not _pool_unavailable:
+        with _pool_lock:
+            if _pool is None and not _pool_unavailable:
+                try:
+                    # Spawned rather than forked, so workers do not inherit the server's threads and locks.
+                    _pool = ProcessPoolExecutor(
+                        max_workers=PDF_POOL_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+                    )
+                    # Registered only once a pool exists; the app lifespan may also stop it earlier.
+                    atexit.register(shutdown_pool)
+                except (OSError, NotImplementedError, ValueError):
+                    # Some sandboxes (e.g. serverless runtimes) cannot create process pools.
+                    _pool_unavailable = True
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stops the shared PDF process pool; called from the app lifespan on shutdown."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pdf_pages(
+    source: PdfSource,
+    start_page: int = 0,
+    max_pages: Optional[int] = None,
+    parallel: Optional[bool] = None,
+) -> Iterator[str]:
+    """
+    Yields the text of each page in order, starting at start_page (0-based)
+    and stopping after max_pages pages when given.
+    With `parallel` (default: PDF_PROCESS_POOL), documents with many pages are split into ranges
+    that are extracted in the shared process pool; workers read the document from a file path.
+    """
+    with _open_pdf(source) as doc:
+        start, stop = _resolve_page_bounds(doc.page_count, start_page, max_pages)
+
+        pool = None
+        if stop - start >= _PARALLEL_PAGE_THRESHOLD and (PDF_PROCESS_POOL if parallel is None else parallel):
+            pool = _get_pool()
+        if pool is None:
+            for i in range(start, stop):
+                yield doc[i].get_text() or ''
+            return
+
+    ranges = [(s, min(s + _PAGES_PER_TASK, stop)) for s in range(start, stop, _PAGES_PER_TASK)]
+    temp_path = None
+    if isinstance(source, (bytes, bytearray)):
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            f.write(source)
+        source = temp_path = f.name
+
+    try:
+        for pages in pool.map(
+            _extract_pdf_range,
+            [source] * len(ranges),
+            [r[0] for r in ranges],
+            [r[1] for r in ranges],
+        ):
+            yield from pages
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+
+
+def load_pdf_text(source: PdfSource, start_page: int = 0, max_pages: Optional[int] = None) -> str:
+    return '\n'.join(iter_pdf_pages(source, start_page, max_pages))
 
 
 def _load_pdf(file_path: str) -> str:
-    doc = fitz.open(file_path)
-    pages = [page.get_text() or '' for page in doc]
-    doc.close()
-    return '\n'.join(pages)
+    return load_pdf_text(file_path)
+
+
+def _load_txt_bytes(data: bytes) -> str:
+    text = data.decode('utf-8')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _load_docx_bytes(data: bytes) -> str:
+    return docx2txt.process(io.BytesIO(data))
+
+
+def _load_html_bytes(data: bytes) -> str:
+    return html_cleaner.html_to_text(data, separator='\n', strip=True)
+
+
+def _load_pdf_bytes(data: bytes) -> str:
+    return load_pdf_text(data)
 
 
 _LOADERS = {
@@ -44,10 +175,27 @@ _LOADERS = {
     '.pdf': _load_pdf,
 }
 
+_BYTES_LOADERS = {
+    '.txt': _load_txt_bytes,
+    '.docx': _load_docx_bytes,
+    '.html': _load_html_bytes,
+    '.pdf': _load_pdf_bytes,
+}
+
+SUPPORTED_EXTENSIONS = tuple(_LOADERS.keys())
+
+
+def get_extension(file_name: str) -> str:
+    _, ext = os.path.splitext(file_name or '')
+    return ext.lower()
+
+
+def is_supported(file_name: str) -> bool:
+    return get_extension(file_name) in _LOADERS
+
 
 def load_file_content(file_path: str) -> str:
-    _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
+    ext = get_extension(file_path)
 
     loader_fn = _LOADERS.get(ext)
     if not loader_fn:
@@ -57,4 +205,18 @@ def load_file_content(file_path: str) -> str:
     try:
         return loader_fn(file_path)
     except Exception as e:
-        raise RuntimeError(f"Failed to load file '{file_path}': {e}") from e
\ No newline at end of file
+        raise RuntimeError(f"Failed to load file '{file_path}': {e}") from e
+
+
+def load_bytes_content(data: bytes, file_name: str) -> str:
+    ext = get_extension(file_name)
+
+    loader_fn = _BYTES_LOADERS.get(ext)
+    if not loader_fn:
+        supported = ', '.join(_BYTES_LOADERS.keys())
+        raise ValueError(f"Unsupported file extension '{ext}'. Supported: {supported}")
+
+    try:
+        return loader_fn(data)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load file '{file_name}': {e}") from e
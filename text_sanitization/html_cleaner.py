@@ -2,22 +2,145 @@
 HTML Cleaner module.
 
 This module provides functionality to strip HTML tags from text while preserving the content.
-It uses BeautifulSoup for robust parsing and cleaning.
+
+The parser backend is pluggable (HTML_BACKEND env var):
+1. "selectolax" - compiled lexbor parser, by far the fastest.
+2. "lxml" - BeautifulSoup on top of the compiled lxml parser.
+3. "html.parser" - BeautifulSoup with the pure-Python standard library parser.
+"auto" (the default) picks the fastest one that is installed.
+Text that has no markup at all skips parsing entirely.
+Every backend returns the same text: the strings BeautifulSoup's get_text would join (no comments,
+<script>, <style> or <template> content), with newlines normalized to "\n" and NUL characters dropped
+as the HTML spec (and lexbor) does.
 """
-from bs4 import BeautifulSoup
+import os
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401
+    _HAS_LXML = True
+except ImportError:
+    _HAS_LXML = False
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+# Their text is code or inert markup, which BeautifulSoup's get_text leaves out.
+_NON_TEXT_PARENTS = frozenset(("script", "style", "template"))
+_PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "textarea"))
+
+
+def _is_available(backend: str) -> bool:
+    if backend == "selectolax":
+        return _SelectolaxParser is not None
+    if backend == "lxml":
+        return _HAS_LXML
+    return backend == "html.parser"
+
+
+def _resolve_backend(name: str) -> str:
+    name = (name or "auto").lower()
+    if name in BACKENDS and _is_available(name):
+        return name
+    for backend in BACKENDS:
+        if _is_available(backend):
+            return backend
+    return "html.parser"
+
+
+_backend = _resolve_backend(os.getenv("HTML_BACKEND", "auto"))
+
+
+def available_backends() -> list:
+    return [b for b in BACKENDS if _is_available(b)]
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """Switches the parser backend, falling back to the fastest available one."""
+    global _backend
+    _backend = _resolve_backend(name)
+    return _backend
+
+
+def _text_with_bs4(markup, parser: str, separator: str, strip: bool, drop_tags: tuple) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(markup, parser)
+    if drop_tags:
+        for tag in soup(list(drop_tags)):
+            tag.decompose()
+    # lexbor normalizes newlines and drops NUL while parsing; the Python parsers keep both.
+    strings = (
+        string.replace("\r\n", "\n").replace("\r", "\n").replace("\x00", "")
+        for string in soup.strings
+    )
+    strings = (string for string in strings if string)
+    if strip:
+        strings = (string.strip() for string in strings)
+        return separator.join(string for string in strings if string)
+    return separator.join(strings)
+
+
+def _in_preserved_whitespace(node) -> bool:
+    while node is not None:
+        if node.tag in _PRESERVE_WHITESPACE_TAGS:
+            return True
+        node = node.parent
+    return False
+
+
+def _selectolax_strings(tree):
+    if tree.root is None:
+        return
+    for node in tree.root.traverse(include_text=True):
+        if node.tag != "-text" or node.parent.tag in _NON_TEXT_PARENTS:
+            continue
+        text = node.text_content
+        if text and not text.strip() and not _in_preserved_whitespace(node.parent):
+            # BeautifulSoup collapses whitespace-only strings outside <pre> and <textarea>.
+            text = "\n" if "\n" in text else " "
+        if text:
+            yield text
+
+
+def _text_with_selectolax(markup, separator: str, strip: bool, drop_tags: tuple) -> str:
+    tree = _SelectolaxParser(markup)
+    if drop_tags:
+        tree.strip_tags(list(drop_tags))
+    strings = _selectolax_strings(tree)
+    if strip:
+        # Match BeautifulSoup's strip=True: strip every text node and skip the empty ones.
+        strings = (string.strip() for string in strings)
+        return separator.join(string for string in strings if string)
+    return separator.join(strings)
+
+
+def html_to_text(markup, separator: str = " ", strip: bool = False, drop_tags: tuple = (), backend: str = None) -> str:
+    """Extracts the text content of an HTML string (or bytes) with the selected backend."""
+    backend = _resolve_backend(backend) if backend else _backend
+    if backend == "selectolax":
+        return _text_with_selectolax(markup, separator, strip, drop_tags)
+    return _text_with_bs4(markup, backend, separator, strip, drop_tags)
+
 
 def clean_html(text: str) -> str:
 
     if not text:
         return ""
 
-    try:
-        soup = BeautifulSoup(text, "html.parser")
-
-        for script in soup(["script", "style"]):
-            script.decompose()
+    # Without tags or entities every parser returns the input unchanged.
+    if "<" not in text and "&" not in text:
+        return text.strip()
 
-        text = soup.get_text(separator=" ")
+    try:
+        text = html_to_text(text, separator=" ", drop_tags=("script", "style"))
         return text.strip()
     except Exception:
 
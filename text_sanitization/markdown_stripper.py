@@ -3,29 +3,195 @@ Markdown Stripper module.
 
 This module provides functionality to strip Markdown syntax from text.
 It removes formatting like bold, italic, links, headers, and code blocks.
+
+It achieves this by:
+1. Walking the text line by line, handling fenced code blocks, horizontal rules,
+   quotes and headings from the line prefix alone.
+2. Scanning the rest of each line once, jumping between marker characters, and matching
+   emphasis, code spans, links and images with delimiter stacks instead of backtracking regexes.
+
+Every lookahead (closing backticks, closing parenthesis of a link) only ever moves forward,
+so hostile input such as thousands of stray asterisks or brackets is still stripped in linear time.
 """
 import re
+import string
+import unicodedata
+
+_FENCE_OPEN = re.compile(r'^[ \t]*(`{3,}|~{3,})')
+_HORIZONTAL_RULE = re.compile(r'^\s*[-*_]{3,}\s*$')
+_QUOTE_PREFIX = re.compile(r'^(?:>[ \t]*)+')
+_HEADING_PREFIX = re.compile(r'^#{1,6}[ \t]*')
+_INLINE_MARKER = re.compile(r'[*_`\[\]!]')
+_BACKTICK_RUN = re.compile(r'`+')
+
+
+def _is_punct(char: str) -> bool:
+    return char in string.punctuation or unicodedata.category(char)[0] in 'PS'
+
+
+def _run_end(line: str, start: int, char: str) -> int:
+    end = start
+    while end < len(line) and line[end] == char:
+        end += 1
+    return end
+
+
+class _CodeRuns:
+    """Backtick runs of a line grouped by length, consumed strictly left to right."""
+
+    def __init__(self, line: str):
+        self._starts = {}
+        self._cursor = {}
+        for m in _BACKTICK_RUN.finditer(line):
+            self._starts.setdefault(m.end() - m.start(), []).append(m.start())
+
+    def next_run(self, length: int, after: int):
+        starts = self._starts.get(length, ())
+        i = self._cursor.get(length, 0)
+        while i < len(starts) and starts[i] < after:
+            i += 1
+        self._cursor[length] = i
+        return starts[i] if i < len(starts) else None
+
+
+def _add_delimiter(line: str, start: int, end: int, out: list, openers: list):
+    char = line[start]
+    count = end - start
+    before = line[start - 1] if start > 0 else ' '
+    after = line[end] if end < len(line) else ' '
+
+    left_flanking = not after.isspace() and (
+        not _is_punct(after) or before.isspace() or _is_punct(before)
+    )
+    right_flanking = not before.isspace() and (
+        not _is_punct(before) or after.isspace() or _is_punct(after)
+    )
+    if char == '_':
+        # Intraword underscores (snake_case) never form emphasis.
+        can_open = left_flanking and (not right_flanking or _is_punct(before))
+        can_close = right_flanking and (not left_flanking or _is_punct(after))
+    else:
+        can_open, can_close = left_flanking, right_flanking
+
+    index = len(out)
+    out.append(char * count)
+
+    if can_close:
+        while count and openers:
+            opener = openers[-1]
+            used = min(2, count, opener[1])
+            opener[1] -= used
+            count -= used
+            out[opener[0]] = char * opener[1]
+            if not opener[1]:
+                openers.pop()
+        out[index] = char * count
+
+    if count and can_open:
+        openers.append([index, count])
+
+
+def _strip_inline(line: str) -> str:
+    out = []
+    openers = {'*': [], '_': []}
+    brackets = []
+    code_runs = None
+    paren_query, paren_found = -1, -1
+
+    pos = 0
+    length = len(line)
+    while pos < length:
+        m = _INLINE_MARKER.search(line, pos)
+        if not m:
+            out.append(line[pos:])
+            break
+
+        i = m.start()
+        if i > pos:
+            out.append(line[pos:i])
+        char = line[i]
+
+        if char == '`':
+            end = _run_end(line, i, '`')
+            if code_runs is None:
+                code_runs = _CodeRuns(line)
+            close = code_runs.next_run(end - i, end)
+            if close is None:
+                out.append(line[i:end])
+                pos = end
+            else:
+                out.append(line[end:close])
+                pos = close + (end - i)
+
+        elif char in openers:
+            end = _run_end(line, i, char)
+            _add_delimiter(line, i, end, out, openers[char])
+            pos = end
+
+        elif char == '!' and line.startswith('[', i + 1):
+            brackets.append(len(out))
+            out.append('![')
+            pos = i + 2
+
+        elif char == '[':
+            brackets.append(len(out))
+            out.append('[')
+            pos = i + 1
+
+        elif char == ']' and brackets:
+            opener = brackets.pop()
+            if line.startswith('(', i + 1):
+                # Queries only move right, so reuse the last answer while it is still ahead.
+                if paren_found == -1 and paren_query != -1:
+                    close = -1
+                elif paren_found >= i + 2:
+                    close = paren_found
+                else:
+                    close = line.find(')', i + 2)
+                paren_query, paren_found = i + 2, close
+
+                if close != -1:
+                    out[opener] = ''
+                    pos = close + 1
+                    continue
+            out.append(']')
+            pos = i + 1
+
+        else:
+            out.append(char)
+            pos = i + 1
+
+    return ''.join(out)
 
-_MARKDOWN_ELEMENTS = [
-    (re.compile(r'^#{1,6}\s*', re.MULTILINE), ''),
-    (re.compile(r'\*{2}(.*?)\*{2}'), r'\1'),
-    (re.compile(r'_{2}(.*?)_{2}'), r'\1'),
-    (re.compile(r'\*(.*?)\*'), r'\1'),
-    (re.compile(r'_(.*?)_'), r'\1'),
-    (re.compile(r'!\[(.*?)\]\(.*?\)'), r'\1'),
-    (re.compile(r'\[(.*?)\]\(.*?\)'), r'\1'),
-    (re.compile(r'^>\s*', re.MULTILINE), ''),
-    (re.compile(r'`(.*?)`'), r'\1'),
-    (re.compile(r'```.*?\n?(.*?)```', re.DOTALL), r'\1'),
-    (re.compile(r'^\s*[-*_]{3,}\s*$', re.MULTILINE), '')
-]
 
 def strip_markdown(text: str) -> str:
 
     if not text:
         return ""
-    
-    for pattern, replacement in _MARKDOWN_ELEMENTS:
-        text = pattern.sub(replacement, text)
-        
-    return text
+
+    result = []
+    fence = None
+
+    for line in text.split('\n'):
+        if fence:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = None
+            else:
+                result.append(line)
+            continue
+
+        m = _FENCE_OPEN.match(line)
+        if m and not (m.group(1)[0] == '`' and '`' in line[m.end():]):
+            fence = m.group(1)
+            continue
+
+        if _HORIZONTAL_RULE.match(line):
+            result.append('')
+            continue
+
+        line = _QUOTE_PREFIX.sub('', line, count=1)
+        line = _HEADING_PREFIX.sub('', line, count=1)
+        result.append(_strip_inline(line))
+
+    return '\n'.join(result)
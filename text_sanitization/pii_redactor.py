@@ -16,8 +16,8 @@ def redact_pii(text: str) -> str:
     if not text:
         return ""
         
-    nlp = shared_nlp.get_nlp_light()
-    doc = nlp(text)
+    # like_email / like_url are lexical attributes, so tokenizing is enough.
+    doc = shared_nlp.get_nlp_blank().make_doc(text)
     
     result = []
     for token in doc:
@@ -0,0 +1,201 @@
+"""
+Lightweight tracing shared by the sanitizers, analyzers, LLM calls and the web app.
+
+Spans are created with `span(name, **attributes)` (a context manager that becomes the parent of
+spans opened inside it, also across asyncio.to_thread) or `start_span(...)` / `.end()` for work
+that outlives a `with` block, such as a streamed LLM response.
+
+The backend is picked with the TRACING environment variable:
+- "off" (default): every call is a no-op, so instrumented code pays almost nothing.
+- "json": finished spans are appended as JSON lines to TRACE_FILE (one file per process).
+- "otel": spans are forwarded to the OpenTelemetry API, if it is installed, so any configured
+  OpenTelemetry SDK/exporter receives them.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:
+    _otel_trace = None
+
+__all__ = ['span', 'start_span', 'enabled', 'configure']
+
+_current = contextvars.ContextVar('tracing_current_span', default=None)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+    def end(self):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _JsonSpan:
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes', '_start_wall', '_start', '_exporter', '_ended')
+
+    def __init__(self, exporter, name, parent, attributes):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes)
+        self._start_wall = time.time()
+        self._start = time.perf_counter()
+        self._exporter = exporter
+        self._ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def record_exception(self, exc):
+        self.attributes['error'] = True
+        self.attributes['exception'] = f"{type(exc).__name__}: {exc}"
+
+    def end(self):
+        if self._ended:
+            return
+        self._ended = True
+        self._exporter.export({
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self._start_wall,
+            'duration_ms': round((time.perf_counter() - self._start) * 1000, 3),
+            'thread': threading.current_thread().name,
+            'attributes': self.attributes,
+        })
+
+
+class _JsonExporter:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+
+    def start(self, name, attributes):
+        return _JsonSpan(self, name, _current.get(), attributes)
+
+
+class _OtelSpan:
+    __slots__ = ('_span', 'name')
+
+    def __init__(self, otel_span, name):
+        self._span = otel_span
+        self.name = name
+
+    def set_attribute(self, key, value):
+        self._span.set_attribute(key, _otel_value(value))
+
+    def set_attributes(self, attributes):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_exception(self, exc):
+        self._span.record_exception(exc)
+
+    def end(self):
+        self._span.end()
+
+
+def _otel_value(value):
+    return value if isinstance(value, (str, bool, int, float)) else str(value)
+
+
+class _OtelBackend:
+    def __init__(self):
+        self._tracer = _otel_trace.get_tracer("ai_sanitizator")
+
+    def start(self, name, attributes):
+        parent = _current.get()
+        context = _otel_trace.set_span_in_context(parent._span) if isinstance(parent, _OtelSpan) else None
+        otel_span = self._tracer.start_span(
+            name, context=context, attributes={k: _otel_value(v) for k, v in attributes.items()}
+        )
+        return _OtelSpan(otel_span, name)
+
+
+_backend = None
+
+
+def _default_trace_file() -> str:
+    directory = os.getenv("TRACE_DIR", "/tmp/traces" if os.environ.get("VERCEL") else "traces")
+    return os.path.join(directory, f"trace-{os.getpid()}.jsonl")
+
+
+def configure(mode: str = None, trace_file: str = None):
+    """(Re)selects the backend; called once on import with the environment settings."""
+    global _backend
+    mode = (mode or os.getenv("TRACING", "off")).lower()
+
+    if mode == "json":
+        path = trace_file or os.getenv("TRACE_FILE") or _default_trace_file()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        _backend = _JsonExporter(path)
+    elif mode == "otel" and _otel_trace is not None:
+        _backend = _OtelBackend()
+    else:
+        _backend = None
+
+
+def enabled() -> bool:
+    return _backend is not None
+
+
+def start_span(name: str, **attributes):
+    """Starts a span that is not made current; the caller must call `.end()`."""
+    if _backend is None:
+        return _NOOP
+    return _backend.start(name, attributes)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    if _backend is None:
+        yield _NOOP
+        return
+
+    current = _backend.start(name, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        if not isinstance(e, GeneratorExit):
+            current.record_exception(e)
+        raise
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Closed from another context (e.g. an abandoned async generator being finalized).
+            pass
+        current.end()
+
+
+configure()
@@ -1,6 +1,6 @@
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 
@@ -16,12 +16,40 @@ engine = create_engine(_DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+    import tracing
+    if tracing.enabled():
+        operation = statement.lstrip().split(" ", 1)[0].upper()
+        conn.info.setdefault("trace_spans", []).append(
+            tracing.start_span("db.query", operation=operation, statement=statement[:200], executemany=executemany)
+        )
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _end_query_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        spans.pop().end()
+
+
+@event.listens_for(engine, "handle_error")
+def _fail_query_span(context):
+    # after_cursor_execute is skipped when a statement fails, so its span is ended here.
+    conn = context.connection
+    spans = conn.info.get("trace_spans") if conn is not None and context.statement is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_exception(context.original_exception)
+        span.end()
+
+
 class Base(DeclarativeBase):
     pass
 
 
 def init_db():
-    from web_app.models import User, HistoryEntry  # noqa: F401
+    from web_app.models import User, HistoryEntry, RewriteJob, RewriteJobEvent  # noqa: F401
     Base.metadata.create_all(bind=engine)
 
 
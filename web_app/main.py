@@ -4,7 +4,7 @@ import sys
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 logging.basicConfig(level=logging.INFO)
@@ -13,18 +13,16 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 _project_root = os.path.dirname(current_dir)
 sys.path.insert(0, _project_root)
 
-import _paths
-try:
-    from text_sanitization import document_loading
-    from text_sanitization.changes_log import build_changes_log
-except ImportError as e:
-    logging.error(f"Error importing core text processing modules: {e}")
-    raise e
+import _paths  # noqa: F401 — centralised path setup
+import app_metrics
 
 from web_app.database import init_db
 from web_app.routes_auth import router as auth_router
 from web_app.routes_history import router as history_router
+from web_app.routes_jobs import router as jobs_router
 from web_app.routes_process import router as process_router
+from web_app.services import warmup
+from web_app.services.job_queue import job_queue
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -37,18 +35,46 @@ async def lifespan(app: FastAPI):
             stacklevel=2,
             category=RuntimeWarning
         )
-        
+
+    # PRELOAD_MODE=blocking finishes warming before the first request is accepted,
+    # the default warms in the background and reports progress on /api/ready.
+    if os.getenv("PRELOAD_MODE", "background") == "blocking":
+        warmup.preload()
+    else:
+        warmup.start_preload()
+
+    # Background rewrite jobs, including those left queued by a worker that has since stopped.
+    job_queue.start()
+
     yield
 
+    await job_queue.stop()
+
+    # The document loaders are imported lazily, possibly still by the preload thread at this point;
+    # a pool only exists once an upload created it, and it also stops itself at exit.
+    shutdown_pool = getattr(sys.modules.get("text_sanitization.document_loading"), "shutdown_pool", None)
+    if shutdown_pool is not None:
+        shutdown_pool()
+
 app = FastAPI(lifespan=lifespan)
 
 
 app.include_router(auth_router)
 app.include_router(history_router)
+app.include_router(jobs_router)
 app.include_router(process_router)
 
 app.mount("/static", StaticFiles(directory=os.path.join(current_dir, "static")), name="static")
 
+@app.get("/api/ready")
+async def readiness():
+    status = warmup.readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@app.get("/metrics")
+async def metrics():
+    return Response(app_metrics.render(), media_type=app_metrics.CONTENT_TYPE_LATEST)
+
 @app.get("/")
 async def read_index():
     return FileResponse(os.path.join(current_dir, 'static', 'index.html'))
\ No newline at end of file
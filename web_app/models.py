@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from web_app.database import Base
@@ -40,3 +40,38 @@ class HistoryEntry(Base):
 
     def __repr__(self):
         return f"<HistoryEntry(id={self.id}, action={self.action_type!r})>"
+
+
+class RewriteJob(Base):
+    __tablename__ = "rewrite_jobs"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    strength = Column(String(20), nullable=False, default="medium")
+    input_text = Column(Text, nullable=False)
+    clean_text = Column(Text, nullable=False)
+    changes_json = Column(Text, nullable=False, default="[]")
+    owner = Column(String(255), nullable=False)
+    event_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    events = relationship("RewriteJobEvent", back_populates="job", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<RewriteJob(id={self.id!r}, status={self.status!r})>"
+
+
+class RewriteJobEvent(Base):
+    __tablename__ = "rewrite_job_events"
+    __table_args__ = (UniqueConstraint("job_id", "seq"),)
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(32), ForeignKey("rewrite_jobs.id"), nullable=False, index=True)
+    seq = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+
+    job = relationship("RewriteJob", back_populates="events")
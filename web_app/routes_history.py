@@ -1,11 +1,15 @@
+import codecs
+import heapq
+import json
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from sqlalchemy import desc
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import desc, insert
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from web_app.auth import get_optional_user
 from web_app.database import get_db
@@ -15,6 +19,7 @@ from web_app.models import HistoryEntry, User
 router = APIRouter(prefix="/api", tags=["history"])
 
 MAX_HISTORY_PER_USER = 50
+MAX_BULK_BODY_BYTES = 5 * 1024 * 1024  # 5 MB
 
 
 class BulkHistoryItem(BaseModel):
@@ -24,6 +29,85 @@ class BulkHistoryItem(BaseModel):
     created_at: Optional[str] = None
 
 
+def _parse_created_at(value: Optional[str], fallback: datetime) -> datetime:
+    if not value:
+        return fallback
+    try:
+        created = datetime.fromisoformat(value)
+    except ValueError:
+        return fallback
+    if created.tzinfo is None:
+        return created.replace(tzinfo=timezone.utc)
+    return created.astimezone(timezone.utc)
+
+
+async def _iter_json_array(request: Request, max_bytes: int) -> AsyncIterator[object]:
+    """
+    Incrementally decodes a top-level JSON array from the request body,
+    yielding each element as soon as it is complete.
+    Raises 413 once the body grows past max_bytes and 422 on malformed JSON.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    received = 0
+    opened = False
+    closed = False
+    expect_comma = False
+    expect_item = False
+
+    async def chunks():
+        nonlocal received
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise HTTPException(status_code=413, detail="Request body too large")
+            yield utf8.decode(chunk), False
+        yield utf8.decode(b"", final=True), True
+
+    async for text, final in chunks():
+        buffer += text
+        pos = 0
+
+        while not closed:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            char = buffer[pos]
+            if not opened:
+                if char != "[":
+                    raise HTTPException(status_code=422, detail="Expected a JSON array")
+                opened = True
+                pos += 1
+            elif char == "]" and not expect_item:
+                closed = True
+                pos += 1
+            elif expect_comma:
+                if char != ",":
+                    raise HTTPException(status_code=422, detail="Malformed JSON array")
+                expect_comma = False
+                expect_item = True
+                pos += 1
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # element not fully received yet
+                if end == len(buffer) and not final:
+                    break  # a bare number may continue in the next chunk
+                pos = end
+                expect_comma = True
+                expect_item = False
+                yield item
+
+        buffer = buffer[pos:]
+
+    if not closed or buffer.strip():
+        raise HTTPException(status_code=422, detail="Malformed JSON array")
+
+
 def _enforce_history_limit(db: Session, user_id: int):
     count = db.query(HistoryEntry).filter(HistoryEntry.user_id == user_id).count()
 
@@ -110,33 +194,53 @@ def delete_history_entry(
 
 
 @router.post("/history/bulk")
-def bulk_save_history(
-    items: List[BulkHistoryItem],
+async def bulk_save_history(
+    request: Request,
     user: Optional[User] = Depends(get_optional_user),
     db: Session = Depends(get_db),
 ):
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    for item in items:
-        created = None
-        if item.created_at:
-            try:
-                created = datetime.fromisoformat(item.created_at)
-            except ValueError:
-                created = None
-
-        entry = HistoryEntry(
-            user_id=user.id,
-            action_type=item.action_type,
-            input_text=item.input_text,
-            output_text=item.output_text,
-            created_at=created or datetime.now(timezone.utc),
-        )
-        db.add(entry)
-
-    db.flush()
-    _enforce_history_limit(db, user.id)
-    db.commit()
-
-    return JSONResponse({"status": "saved", "count": len(items)})
+    # Only the newest MAX_HISTORY_PER_USER items can survive trimming,
+    # so keep a bounded min-heap instead of materialising the whole payload.
+    now = datetime.now(timezone.utc)
+    newest = []
+    received = 0
+
+    async for raw_item in _iter_json_array(request, MAX_BULK_BODY_BYTES):
+        try:
+            item = BulkHistoryItem.model_validate(raw_item)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+        created = _parse_created_at(item.created_at, now)
+        entry = (created, received, item)
+        received += 1
+
+        if len(newest) < MAX_HISTORY_PER_USER:
+            heapq.heappush(newest, entry)
+        elif entry[:2] > newest[0][:2]:
+            heapq.heapreplace(newest, entry)
+
+    if newest:
+        rows = [
+            {
+                "user_id": user.id,
+                "action_type": item.action_type,
+                "input_text": item.input_text,
+                "output_text": item.output_text,
+                "created_at": created,
+            }
+            for created, _, item in newest
+        ]
+
+        def save():
+            db.execute(insert(HistoryEntry), rows)
+            _enforce_history_limit(db, user.id)
+            db.commit()
+
+        await run_in_threadpool(save)
+
+    # "count" is the number of items received, as before; older ones are dropped by the history limit.
+    return JSONResponse({"status": "saved", "count": received})
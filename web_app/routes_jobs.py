@@ -0,0 +1,98 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from web_app.auth import get_optional_user
+from web_app.database import get_db
+from web_app.models import RewriteJob, User
+from web_app.routes_process import sanitize_with_changes
+from web_app.services import event_stream
+from web_app.services.job_queue import FINISHED, REWRITE_JOBS_ENABLED, job_queue
+from web_app.services.rate_limiter import check_rewrite_allowed
+
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+
+def _get_job(db: Session, job_id: str, user: Optional[User]) -> RewriteJob:
+    """A user's jobs are private to them; anonymous jobs are reachable by their (unguessable) id."""
+    job = db.get(RewriteJob, job_id)
+    if job is None or (job.user_id is not None and (user is None or user.id != job.user_id)):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def _job_summary(job: RewriteJob) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "strength": job.strength,
+        "event_count": job.event_count,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "events_url": f"/api/jobs/{job.id}/events",
+    }
+
+
+@router.post("/jobs", status_code=202)
+async def create_rewrite_job(
+    request: Request,
+    text: str = Form(..., min_length=1),
+    strength: str = Form("medium"),
+    db: Session = Depends(get_db),
+):
+    if not REWRITE_JOBS_ENABLED:
+        # Clients fall back to streaming from /api/process.
+        raise HTTPException(status_code=503, detail="Background rewrite jobs are disabled")
+
+    clean_text_val, changes_list = await sanitize_with_changes(text, "rewrite")
+
+    user = await run_in_threadpool(get_optional_user, request, db)
+    error_msg = await run_in_threadpool(check_rewrite_allowed, request, user, db, len(clean_text_val))
+    if error_msg:
+        raise HTTPException(status_code=429, detail=error_msg)
+
+    def create():
+        job = job_queue.create_job(db, user, text, clean_text_val, changes_list, strength)
+        return _job_summary(job)
+
+    summary = await run_in_threadpool(create)
+    job_queue.submit(summary["job_id"])
+    return JSONResponse(summary, status_code=202)
+
+
+@router.get("/jobs/{job_id}")
+def get_rewrite_job(job_id: str, request: Request, db: Session = Depends(get_db)):
+    return _job_summary(_get_job(db, job_id, get_optional_user(request, db)))
+
+
+@router.get("/jobs/{job_id}/events")
+def follow_rewrite_job(
+    job_id: str,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Streams the job's NDJSON events from `offset` (the number of events already received),
+    then follows it live. The stream ends with a {"type": "job"} event carrying the final status.
+    """
+    job = _get_job(db, job_id, get_optional_user(request, db))
+    response = event_stream.ndjson_response(job_queue.follow(job.id, offset), request)
+    response.headers["X-Job-Status"] = job.status
+    return response
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_rewrite_job(job_id: str, request: Request, db: Session = Depends(get_db)):
+    # Async, so the job's task is cancelled from the event loop that runs it.
+    job = await run_in_threadpool(lambda: _get_job(db, job_id, get_optional_user(request, db)))
+    if job.status in FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    await job_queue.cancel(job.id)
+    return {"job_id": job.id, "status": "cancelling"}
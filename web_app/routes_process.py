@@ -1,25 +1,86 @@
 import asyncio
-import json
-import os
-import shutil
-import tempfile
 import time
 import traceback
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 
-from text_sanitization import document_loading
+import app_metrics
+import request_profiler
+import tracing
 from text_sanitization.changes_log import build_changes_log
 from web_app.auth import get_optional_user
 from web_app.database import get_db
 from web_app.routes_history import save_history_entry
-from web_app.services.rate_limiter import anonymous_rewrite_limiter, check_rate_limit, update_usage
-from web_app.services.rewrite_pipeline import rewrite_stream_generator
+from web_app.services import event_stream
+from web_app.services.rate_limiter import check_rewrite_allowed
+
+# The rewrite pipeline (langchain, spaCy models, textstat) and the document loaders
+# (PyMuPDF, docx2txt) are imported inside the handlers that need them, so a cold
+# start that only serves /api/process?action=clean never loads them.
 
 router = APIRouter()
 
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MB
+# Room for the multipart boundaries and part headers around the file itself.
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class _UploadTooLarge(MultiPartException):
+    pass
+
+
+class _UnsupportedUpload(MultiPartException):
+    pass
+
+
+async def _capped_stream(stream, max_bytes: int):
+    """Re-yields the request body, stopping as soon as more than max_bytes have arrived."""
+    received = 0
+    async for chunk in stream:
+        received += len(chunk)
+        if received > max_bytes:
+            raise _UploadTooLarge("File is too large")
+        yield chunk
+
+
+class _UploadParser(MultiPartParser):
+    """
+    Starlette's multipart parser for a single upload: the file type is checked as soon as the
+    part headers arrive, before its body is read, and the file is kept in memory up to the upload limit.
+    """
+
+    def __init__(self, headers, stream, is_supported):
+        super().__init__(headers, stream, max_files=1, max_fields=10)
+        self.spool_max_size = MAX_UPLOAD_BYTES
+        self._is_supported = is_supported
+
+    def on_headers_finished(self) -> None:
+        super().on_headers_finished()
+        file = self._current_part.file
+        if file is not None and not self._is_supported(file.filename):
+            raise _UnsupportedUpload(file.filename)
+
+
+async def sanitize_with_changes(text: str, action: str):
+    """Runs the sanitization steps off the event loop; returns the clean text and the change log as dicts."""
+    with tracing.span("process.sanitize", action=action, chars=len(text)), app_metrics.time_stage("sanitize"):
+        clean_text_val, changes = await request_profiler.to_thread(build_changes_log, text)
+
+    changes_list = [
+        {
+            "description": c.description,
+            "text_before": c.text_before,
+            "text_after": c.text_after
+        }
+        for c in changes
+    ]
+    return clean_text_val, changes_list
+
+
 @router.post("/api/process")
 async def process_text(
     request: Request,
@@ -28,18 +89,11 @@ async def process_text(
     strength: str = Form("medium"),
     db: Session = Depends(get_db),
 ):
+    started = time.perf_counter()
+    status = "error"
+    profile = request_profiler.start(request, action=action, input_chars=len(text), strength=strength)
     try:
-
-        clean_text_val, changes = await asyncio.to_thread(build_changes_log, text)
-        
-        changes_list = [
-            {
-                "description": c.description,
-                "text_before": c.text_before, 
-                "text_after": c.text_after
-            } 
-            for c in changes
-        ]
+        clean_text_val, changes_list = await sanitize_with_changes(text, action)
 
         user = get_optional_user(request, db)
 
@@ -47,6 +101,7 @@ async def process_text(
             if user:
                 save_history_entry(db, user.id, "clean", text, clean_text_val)
 
+            status = "ok"
             return JSONResponse({
                 "clean_text": clean_text_val,
                 "changes": changes_list
@@ -55,24 +110,23 @@ async def process_text(
         elif action == "rewrite":
             t0 = time.time()
 
-            if user:
-                is_allowed, error_msg = check_rate_limit(user, db, len(clean_text_val))
-                if not is_allowed:
-                    async def error_generator():
-                         yield json.dumps({"type": "error", "data": error_msg}) + "\n"
-                    return StreamingResponse(error_generator(), media_type="application/x-ndjson")
-
-                update_usage(user, db, len(clean_text_val))
-            else:
-                is_allowed, error_msg = anonymous_rewrite_limiter.check(request)
-                if not is_allowed:
-                    async def error_generator():
-                         yield json.dumps({"type": "error", "data": error_msg}) + "\n"
-                    return StreamingResponse(error_generator(), media_type="application/x-ndjson")
-
-            return StreamingResponse(
-                rewrite_stream_generator(text, clean_text_val, request, db, user, changes_list, t0, strength),
-                media_type="application/x-ndjson"
+            error_msg = check_rewrite_allowed(request, user, db, len(clean_text_val))
+            if error_msg:
+                status = "rate_limited"
+                async def error_generator():
+                     yield event_stream.encode_event("error", error_msg)
+                return event_stream.ndjson_response(error_generator())
+
+            from web_app.services.rewrite_pipeline import rewrite_stream_generator
+
+            status = "streaming"
+            # A profiled rewrite is saved when the stream ends, not when the response is handed back.
+            return event_stream.ndjson_response(
+                request_profiler.profile_stream(
+                    profile,
+                    rewrite_stream_generator(text, clean_text_val, request, db, user, changes_list, t0, strength),
+                ),
+                request,
             )
             
         else:
@@ -81,28 +135,71 @@ async def process_text(
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Only known actions become label values, to keep the metric's cardinality bounded.
+        action_label = action if action in ("clean", "rewrite") else "invalid"
+        app_metrics.REQUESTS.labels("process", action_label, status).inc()
+        app_metrics.REQUEST_LATENCY.labels("process", action_label).observe(time.perf_counter() - started)
+        if status != "streaming":
+            request_profiler.finish(profile, status)
 
 @router.post("/api/upload")
-async def upload_file(file: UploadFile = File(...)):
-    tmp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as tmp:
-            tmp_path = tmp.name
+async def upload_file(request: Request):
+    from text_sanitization import document_loading
 
-        def save_upload_file():
-            with open(tmp_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+    started = time.perf_counter()
+    status = "error"
+    action_label = "other"
+    form = None
+    try:
+        # A body declared larger than the limit is refused before any of it is read.
+        max_body = MAX_UPLOAD_BYTES + _MULTIPART_OVERHEAD_BYTES
+        content_length = request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_body:
+            status = "too_large"
+            raise HTTPException(status_code=413, detail="File is too large")
+
+        if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+            status = "invalid"
+            raise HTTPException(status_code=422, detail="No file uploaded")
+
+        parser = _UploadParser(request.headers, _capped_stream(request.stream(), max_body), document_loading.is_supported)
+        try:
+            form = await parser.parse()
+        except _UploadTooLarge:
+            status = "too_large"
+            raise HTTPException(status_code=413, detail="File is too large")
+        except _UnsupportedUpload:
+            status = "unsupported"
+            supported = ', '.join(document_loading.SUPPORTED_EXTENSIONS)
+            raise HTTPException(status_code=400, detail=f"Unsupported file type. Supported: {supported}")
+        except MultiPartException as e:
+            status = "invalid"
+            raise HTTPException(status_code=400, detail=str(e))
+
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            status = "invalid"
+            raise HTTPException(status_code=422, detail="No file uploaded")
+
+        extension = document_loading.get_extension(file.filename)
+        action_label = extension.lstrip(".")
+
+        # Backstop: the body limit includes the multipart overhead, the file itself must fit MAX_UPLOAD_BYTES.
+        data = await file.read(MAX_UPLOAD_BYTES + 1)
+        if len(data) > MAX_UPLOAD_BYTES:
+            status = "too_large"
+            raise HTTPException(status_code=413, detail="File is too large")
 
-        await asyncio.to_thread(save_upload_file)
-            
         try:
-            content = await asyncio.to_thread(document_loading.load_file_content, tmp_path)
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                os.remove(tmp_path)
-        
-        return {"content": content}
-    except Exception as e:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
-        raise HTTPException(status_code=500, detail=f"File processing failed: {str(e)}")
\ No newline at end of file
+            with tracing.span("upload.load", extension=extension, bytes=len(data)), app_metrics.time_stage("load_document"):
+                content = await asyncio.to_thread(document_loading.load_bytes_content, data, file.filename)
+            status = "ok"
+            return {"content": content}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"File processing failed: {str(e)}")
+    finally:
+        if form is not None:
+            await form.close()
+        app_metrics.REQUESTS.labels("upload", action_label, status).inc()
+        app_metrics.REQUEST_LATENCY.labels("upload", action_label).observe(time.perf_counter() - started)
@@ -0,0 +1,157 @@
+"""
+NDJSON event encoding, chunk coalescing and optional compression for streamed responses.
+
+It achieves this by:
+1. Encoding events with orjson (falling back to json), straight to bytes.
+2. Merging the small "chunk" pieces of a rewrite into one event per STREAM_COALESCE_MS window
+   (or STREAM_COALESCE_CHARS characters), while sending the very first piece immediately.
+3. Compressing the stream with gzip or zstd when STREAM_COMPRESSION allows it and the client
+   accepts it, flushing after every event so nothing is held back by the compressor.
+
+The end goal is fewer, smaller writes per stream, especially for the large final "done" event.
+"""
+import asyncio
+import os
+import time
+import zlib
+
+from fastapi.responses import StreamingResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MEDIA_TYPE = "application/x-ndjson"
+
+STREAM_COALESCE_MS = float(os.getenv("STREAM_COALESCE_MS", "50"))
+STREAM_COALESCE_CHARS = int(os.getenv("STREAM_COALESCE_CHARS", "512"))
+# "off", "gzip", "zstd" or "auto" (zstd when the client and server support it, otherwise gzip).
+STREAM_COMPRESSION = os.getenv("STREAM_COMPRESSION", "off").lower()
+
+_END = object()
+
+
+def _orjson_default(obj):
+    # Accepts what json.dumps did: float subclasses and numpy scalars in analyzer results.
+    if isinstance(obj, float):
+        return float(obj)
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError
+
+
+def encode_event(event_type: str, data) -> bytes:
+    """One NDJSON line: {"type": ..., "data": ...}."""
+    event = {"type": event_type, "data": data}
+    if orjson is not None:
+        return orjson.dumps(
+            event, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ) + b"\n"
+    return (json.dumps(event) + "\n").encode("utf-8")
+
+
+async def coalesce(pieces, max_delay_ms: float = STREAM_COALESCE_MS, max_chars: int = STREAM_COALESCE_CHARS):
+    """
+    Re-yields the strings of `pieces` joined into larger ones. Buffered text is sent once it is
+    `max_delay_ms` old or `max_chars` long, so a slow model is not delayed further; a window of 0
+    turns coalescing off. The first piece is never held, to keep time-to-first-chunk unchanged.
+    """
+    if max_delay_ms <= 0:
+        async for piece in pieces:
+            yield piece
+        return
+
+    # The source is drained by one task, so waiting for it with a timeout never interrupts it.
+    queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for piece in pieces:
+                await queue.put(piece)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(_END)
+
+    task = asyncio.create_task(pump())
+    buffer, buffered, first, deadline = [], 0, True, None
+    try:
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield "".join(buffer)
+                buffer, buffered, deadline = [], 0, None
+                continue
+
+            if item is _END or isinstance(item, Exception):
+                if buffer:
+                    yield "".join(buffer)
+                if item is _END:
+                    return
+                raise item
+
+            if first:
+                first = False
+                yield item
+                continue
+
+            buffer.append(item)
+            buffered += len(item)
+            if deadline is None:
+                deadline = time.perf_counter() + max_delay_ms / 1000
+            if buffered >= max_chars:
+                yield "".join(buffer)
+                buffer, buffered, deadline = [], 0, None
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await pieces.aclose()
+
+
+def negotiate_encoding(accept_encoding: str, mode: str = STREAM_COMPRESSION):
+    """The Content-Encoding to use for a stream, or None."""
+    if mode not in ("gzip", "zstd", "auto"):
+        return None
+    accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+    if mode in ("zstd", "auto") and zstandard is not None and "zstd" in accepted:
+        return "zstd"
+    if mode in ("gzip", "auto") and "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+async def _compressed(stream, encoding: str):
+    if encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        flush_mode, finish = zstandard.COMPRESSOBJ_FLUSH_BLOCK, lambda: compressor.flush()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        flush_mode, finish = zlib.Z_SYNC_FLUSH, lambda: compressor.flush(zlib.Z_FINISH)
+
+    async for line in stream:
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        # Flushed per event, so the client can decode each event as soon as it arrives.
+        yield compressor.compress(line) + compressor.flush(flush_mode)
+    yield finish()
+
+
+def ndjson_response(stream, request=None) -> StreamingResponse:
+    """A StreamingResponse for `stream`, compressed when configured and accepted by the client."""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", "")) if request is not None else None
+    if encoding is None:
+        return StreamingResponse(stream, media_type=MEDIA_TYPE)
+    return StreamingResponse(
+        _compressed(stream, encoding),
+        media_type=MEDIA_TYPE,
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+    )
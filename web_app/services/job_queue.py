@@ -0,0 +1,396 @@
+"""
+Resumable rewrite jobs: each rewrite runs once in the background and its events are kept in SQLite.
+
+It achieves this by:
+1. Storing every job (input, sanitized text, change log, status) and every NDJSON event it produces,
+   numbered from 0, in the rewrite_jobs and rewrite_job_events tables.
+2. Running jobs as asyncio tasks, at most REWRITE_JOB_WORKERS at a time per process, detached from
+   the HTTP connection that created them. Events are written in batches from a worker thread, so
+   SQLite never blocks the event loop.
+3. Letting clients read a job's events from any offset and then follow it live until its final
+   {"type": "job"} event: from memory while this process runs the job, otherwise from the database.
+4. On startup, taking over the jobs of processes on this host that are gone (including an earlier
+   boot that had the same PID): queued jobs are run, running ones are failed, since an LLM
+   generation cannot be resumed halfway.
+
+The end goal is rewrites that survive dropped connections and page reloads, and run exactly once.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import app_metrics
+from web_app.database import SessionLocal
+from web_app.models import RewriteJob, RewriteJobEvent, User
+from web_app.services import event_stream
+
+logger = logging.getLogger(__name__)
+
+_SERVERLESS = bool(os.environ.get("VERCEL") or os.environ.get("VERCEL_ENV"))
+# Serverless instances have their own /tmp database and may be frozen between requests,
+# so a job could not be reattached from another instance; clients then stream directly.
+REWRITE_JOBS_ENABLED = os.getenv("REWRITE_JOBS", "off" if _SERVERLESS else "on").lower() == "on"
+REWRITE_JOB_WORKERS = int(os.getenv("REWRITE_JOB_WORKERS", "4"))
+REWRITE_JOB_TTL_HOURS = float(os.getenv("REWRITE_JOB_TTL_HOURS", "24"))
+# Events are committed every REWRITE_JOB_EVENT_BATCH events, or once the oldest unwritten one is
+# JOB_FLUSH_SECONDS old, and always at the end of the job.
+REWRITE_JOB_EVENT_BATCH = int(os.getenv("REWRITE_JOB_EVENT_BATCH", "20"))
+JOB_FLUSH_SECONDS = 0.25
+# Followers of a job run by another worker process poll the database.
+JOB_POLL_SECONDS = 1.0
+_PRUNE_INTERVAL_SECONDS = 600
+
+FINISHED = ("done", "failed", "cancelled")
+# Statuses: queued -> running -> done | failed | cancelled. "cancelling" asks another process to stop.
+
+# The boot id tells this process apart from an earlier one with the same host and PID (e.g. PID 1
+# in a restarted container).
+_BOOT_ID = uuid.uuid4().hex[:12]
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{_BOOT_ID}"
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _owner_alive(owner: str) -> bool:
+    host, pid, boot = (owner.split(":") + [None, None])[:3]
+    if host != socket.gethostname():
+        return True  # Another machine's job; it cannot be checked from here.
+    if pid == str(os.getpid()):
+        return boot == _BOOT_ID
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError, TypeError):
+        return True
+    return True
+
+
+# Database helpers. They open their own session and are called through asyncio.to_thread
+# from the event loop.
+
+def _add_events(db, job: RewriteJob, first_seq: int, payloads: list):
+    # Skips what an earlier, interrupted write already committed, so retrying a batch is safe.
+    already = max(0, (job.event_count or 0) - first_seq)
+    for seq, payload in enumerate(payloads[already:], start=first_seq + already):
+        db.add(RewriteJobEvent(job_id=job.id, seq=seq, payload=payload))
+    job.event_count = max(job.event_count or 0, first_seq + len(payloads))
+
+
+def _finish_job(db, job: RewriteJob, status: str, error: str = None, pending=(), first_seq: int = None):
+    # The final event and the status are committed together, so followers never miss the end.
+    data = {"status": status}
+    if error:
+        data["error"] = error
+    final = event_stream.encode_event("job", data).decode("utf-8").rstrip("\n")
+    first_seq = job.event_count if first_seq is None else first_seq
+    _add_events(db, job, first_seq, list(pending) + [final])
+    job.status = status
+    job.error = error
+    job.finished_at = _now()
+    db.commit()
+    app_metrics.REWRITE_JOBS.labels(status).inc()
+
+
+def _start_job(job_id: str):
+    """Marks a queued job running and returns what the worker needs, or None if it must not run."""
+    db = SessionLocal()
+    try:
+        job = db.get(RewriteJob, job_id)
+        if job is None or job.status not in ("queued", "cancelling"):
+            return None
+        if job.status == "cancelling":
+            _finish_job(db, job, "cancelled")
+            return None
+        job.status = "running"
+        job.started_at = _now()
+        db.commit()
+        return {
+            "input_text": job.input_text,
+            "clean_text": job.clean_text,
+            "changes": json.loads(job.changes_json),
+            "strength": job.strength,
+            "user_id": job.user_id,
+            "event_count": job.event_count,
+        }
+    finally:
+        db.close()
+
+
+def _write_events(job_id: str, first_seq: int, payloads: list) -> str:
+    """Commits a batch of events; returns the job's current status (to notice "cancelling")."""
+    db = SessionLocal()
+    try:
+        job = db.get(RewriteJob, job_id)
+        _add_events(db, job, first_seq, payloads)
+        db.commit()
+        return job.status
+    finally:
+        db.close()
+
+
+def _close_job(job_id: str, first_seq: int, payloads: list, status: str, error: str = None):
+    db = SessionLocal()
+    try:
+        _finish_job(db, db.get(RewriteJob, job_id), status, error, payloads, first_seq)
+    finally:
+        db.close()
+
+
+def _cancel_stored_job(job_id: str, ask_owner: bool):
+    db = SessionLocal()
+    try:
+        job = db.get(RewriteJob, job_id)
+        if job is None or job.status in FINISHED:
+            return
+        if ask_owner and job.owner != OWNER and _owner_alive(job.owner):
+            # Run by another worker process, which stops at its next write and finishes the job.
+            job.status = "cancelling"
+            db.commit()
+        else:
+            _finish_job(db, job, "cancelled")
+    finally:
+        db.close()
+
+
+def _read_events(job_id: str, offset: int):
+    db = SessionLocal()
+    try:
+        # The status is read first: if it is final, every event is already committed.
+        status = db.query(RewriteJob.status).filter(RewriteJob.id == job_id).scalar()
+        events = (
+            db.query(RewriteJobEvent.payload)
+            .filter(RewriteJobEvent.job_id == job_id, RewriteJobEvent.seq >= offset)
+            .order_by(RewriteJobEvent.seq)
+            .all()
+        )
+        return status, [payload for (payload,) in events]
+    finally:
+        db.close()
+
+
+class JobQueue:
+    def __init__(self, workers: int = REWRITE_JOB_WORKERS):
+        self.workers = workers
+        self._slots = None
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._cancel_requested: set[str] = set()
+        self._signals: dict[str, asyncio.Event] = {}
+        # job id -> (first seq, events) for the jobs this process is running.
+        self._live: dict[str, tuple[int, list]] = {}
+        self._last_prune = 0.0
+
+    def start(self):
+        """Called from the app lifespan: recovers orphaned jobs and prunes expired ones."""
+        self._slots = asyncio.Semaphore(max(1, self.workers))
+        if not REWRITE_JOBS_ENABLED:
+            return
+        self._prune()
+        for job_id in self._claim_orphans():
+            self.submit(job_id)
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def create_job(self, db, user, raw_text: str, clean_text: str, changes_list: list, strength: str) -> RewriteJob:
+        job = RewriteJob(
+            id=uuid.uuid4().hex,
+            user_id=user.id if user else None,
+            status="queued",
+            strength=strength,
+            input_text=raw_text,
+            clean_text=clean_text,
+            changes_json=json.dumps(changes_list),
+            owner=OWNER,
+        )
+        db.add(job)
+        db.commit()
+        return job
+
+    def submit(self, job_id: str):
+        app_metrics.REWRITE_JOBS_QUEUED.inc()
+        self._tasks[job_id] = asyncio.create_task(self._run_when_free(job_id))
+
+    async def cancel(self, job_id: str):
+        """Cancels a queued or running job; a job run by another process is asked to stop."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            self._cancel_requested.add(job_id)
+            task.cancel()
+        else:
+            await asyncio.to_thread(_cancel_stored_job, job_id, True)
+            self._notify(job_id)
+
+    async def _run_when_free(self, job_id: str):
+        started = False
+        try:
+            async with self._slots:
+                started = True
+                app_metrics.REWRITE_JOBS_QUEUED.dec()
+                await self._run(job_id)
+        except asyncio.CancelledError:
+            # Cancelled while waiting for a slot. On shutdown the job stays queued for the next start.
+            if job_id in self._cancel_requested:
+                await asyncio.to_thread(_cancel_stored_job, job_id, False)
+                self._notify(job_id)
+            else:
+                raise
+        finally:
+            if not started:
+                app_metrics.REWRITE_JOBS_QUEUED.dec()
+            self._tasks.pop(job_id, None)
+            self._cancel_requested.discard(job_id)
+
+    async def _run(self, job_id: str):
+        from web_app.services.rewrite_pipeline import rewrite_stream_generator
+
+        job = await asyncio.to_thread(_start_job, job_id)
+        if job is None:
+            self._notify(job_id)
+            return
+
+        seq = job["event_count"]
+        live = []
+        self._live[job_id] = (seq, live)
+        pending, flush_at = [], None
+        status, error = "done", None
+
+        db = SessionLocal()
+        try:
+            user = await asyncio.to_thread(db.get, User, job["user_id"]) if job["user_id"] else None
+            stream = rewrite_stream_generator(
+                job["input_text"], job["clean_text"], None, db, user,
+                job["changes"], time.time(), job["strength"],
+            )
+            try:
+                async for line in stream:
+                    payload = (line.decode("utf-8") if isinstance(line, bytes) else line).rstrip("\n")
+                    live.append(payload)
+                    pending.append(payload)
+                    self._notify(job_id)
+
+                    if flush_at is None:
+                        flush_at = time.monotonic() + JOB_FLUSH_SECONDS
+                    if len(pending) >= REWRITE_JOB_EVENT_BATCH or time.monotonic() >= flush_at:
+                        current = await asyncio.to_thread(_write_events, job_id, seq, pending)
+                        seq, pending, flush_at = seq + len(pending), [], None
+                        if current == "cancelling":
+                            status = "cancelled"
+                            break
+            except asyncio.CancelledError:
+                if job_id in self._cancel_requested:
+                    status = "cancelled"
+                else:
+                    status, error = "failed", "Interrupted by a server shutdown"
+            except Exception as e:
+                logger.exception("Rewrite job %s failed", job_id)
+                status, error = "failed", str(e)
+            finally:
+                await stream.aclose()
+        finally:
+            db.close()
+
+        try:
+            await asyncio.to_thread(_close_job, job_id, seq, pending, status, error)
+        finally:
+            # Only dropped once everything is committed, so followers can switch to the database.
+            self._live.pop(job_id, None)
+            self._notify(job_id)
+        if time.monotonic() - self._last_prune > _PRUNE_INTERVAL_SECONDS:
+            await asyncio.to_thread(self._prune)
+
+    def _signal(self, job_id: str) -> asyncio.Event:
+        signal = self._signals.get(job_id)
+        if signal is None:
+            signal = self._signals[job_id] = asyncio.Event()
+        return signal
+
+    def _notify(self, job_id: str):
+        signal = self._signals.pop(job_id, None)
+        if signal is not None:
+            signal.set()
+
+    async def follow(self, job_id: str, offset: int = 0):
+        """Yields the job's NDJSON lines from `offset` on, following it live until it finishes."""
+        while True:
+            # Taken before reading, so an event added in between still wakes this follower.
+            signal = self._signal(job_id)
+            live = self._live.get(job_id)
+            if live is not None and offset >= live[0]:
+                first_seq, events = live
+                status, events = "running", events[offset - first_seq:]
+            else:
+                status, events = await asyncio.to_thread(_read_events, job_id, offset)
+
+            for payload in events:
+                yield (payload + "\n").encode("utf-8")
+            offset += len(events)
+
+            if status is None or status in FINISHED:
+                return
+            if not events:
+                try:
+                    await asyncio.wait_for(signal.wait(), JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _claim_orphans(self) -> list:
+        db = SessionLocal()
+        try:
+            claimed = []
+            jobs = db.query(RewriteJob).filter(RewriteJob.status.in_(("queued", "running", "cancelling"))).all()
+            for job in jobs:
+                if _owner_alive(job.owner):
+                    continue
+                # Conditional update, so two processes starting together cannot both take a job.
+                taken = (
+                    db.query(RewriteJob)
+                    .filter(RewriteJob.id == job.id, RewriteJob.owner == job.owner)
+                    .update({RewriteJob.owner: OWNER}, synchronize_session=False)
+                )
+                db.commit()
+                if not taken:
+                    continue
+                db.refresh(job)
+                if job.status == "running":
+                    _finish_job(db, job, "failed", "Interrupted by a server restart")
+                elif job.status == "cancelling":
+                    _finish_job(db, job, "cancelled")
+                else:
+                    claimed.append(job.id)
+            if claimed:
+                logger.info("Resuming %d queued rewrite job(s) left by a stopped worker", len(claimed))
+            return claimed
+        finally:
+            db.close()
+
+    def _prune(self):
+        """Deletes finished jobs (and their events) older than REWRITE_JOB_TTL_HOURS."""
+        self._last_prune = time.monotonic()
+        cutoff = _now() - timedelta(hours=REWRITE_JOB_TTL_HOURS)
+        db = SessionLocal()
+        try:
+            expired = [
+                job_id for (job_id,) in db.query(RewriteJob.id)
+                .filter(RewriteJob.status.in_(FINISHED), RewriteJob.finished_at < cutoff)
+                .all()
+            ]
+            if expired:
+                db.query(RewriteJobEvent).filter(RewriteJobEvent.job_id.in_(expired)).delete(synchronize_session=False)
+                db.query(RewriteJob).filter(RewriteJob.id.in_(expired)).delete(synchronize_session=False)
+                db.commit()
+        finally:
+            db.close()
+
+
+job_queue = JobQueue()
@@ -3,8 +3,11 @@ import json
 import asyncio
 import time
 from collections import defaultdict
+from typing import Optional, Tuple
 from fastapi import Request
 
+import app_metrics
+
 
 CHAR_LIMIT = 2000
 COOLDOWN_HOURS = 3
@@ -23,6 +26,7 @@ def check_rate_limit(user, db, cost: int, limit: int = CHAR_LIMIT):
     # Check existing lockout
     if user.rewrite_lockout_until and user.rewrite_lockout_until > now:
         remaining = user.rewrite_lockout_until - now
+        app_metrics.RATE_LIMIT_REJECTIONS.labels("user").inc()
         hours, remainder = divmod(remaining.seconds, 3600)
         minutes, seconds = divmod(remainder, 60)
         return False, f"Usage limit exceeded. Try again in {hours}h {minutes}m."
@@ -34,6 +38,7 @@ def check_rate_limit(user, db, cost: int, limit: int = CHAR_LIMIT):
         user.rewrite_lockout_until = now + timedelta(hours=COOLDOWN_HOURS)
         user.chars_used_current_session = 0
         db.commit()
+        app_metrics.RATE_LIMIT_REJECTIONS.labels("user").inc()
         return False, f"Usage limit ({limit} chars) exceeded. You are now on a {COOLDOWN_HOURS}-hour cooldown. You can still use Sanitization."
 
     return True, None
@@ -51,7 +56,7 @@ class IPRateLimiter:
         self.max_entries = max_entries
         self._hits: dict[str, list[float]] = defaultdict(list)
     
-    def check(self, request: Request) -> tuple[bool, str | None]:
+    def check(self, request: Request) -> Tuple[bool, Optional[str]]:
         """
         Checks if the IP has exceeded the rate limit.
         Returns a tuple (is_allowed, error_message_or_none).
@@ -67,6 +72,7 @@ class IPRateLimiter:
         self._hits[ip] = [t for t in self._hits[ip] if now - t < self.window]
         
         if len(self._hits[ip]) >= self.max_requests:
+            app_metrics.RATE_LIMIT_REJECTIONS.labels("anonymous").inc()
             return False, "Rate limit exceeded for anonymous usage. Try again later or log in."
         
         self._hits[ip].append(now)
@@ -80,3 +86,17 @@ class IPRateLimiter:
                 del self._hits[ip]
 
 anonymous_rewrite_limiter = IPRateLimiter(max_requests=5, window_seconds=60)
+
+
+def check_rewrite_allowed(request: Request, user, db, cost: int) -> Optional[str]:
+    """
+    Applies the rewrite limits: the per-user character budget (charging it when allowed)
+    or, for anonymous requests, the per-IP limiter. Returns the error message or None.
+    """
+    if user:
+        is_allowed, error_msg = check_rate_limit(user, db, cost)
+        if is_allowed:
+            update_usage(user, db, cost)
+    else:
+        is_allowed, error_msg = anonymous_rewrite_limiter.check(request)
+    return None if is_allowed else error_msg
@@ -1,19 +1,22 @@
 
 import asyncio
-import json
 import time
 
 try:
     import llm_validator
     from rewriting_agent import rewriting_agent
-    from post_humanizer import humanize
+    from post_humanizer import derive_seed, humanize
 except ImportError:
     # These might fail if run in isolation or if paths aren't set up yet, 
     # but the app sets paths in main.py. 
     # We will assume they are importable when running from main.
     pass
 
+import app_metrics
+import request_profiler
+import tracing
 from web_app.routes_history import save_history_entry
+from web_app.services import event_stream
 
 async def rewrite_stream_generator(
     raw_text: str,
@@ -33,72 +36,77 @@ async def rewrite_stream_generator(
     4. Humanization
     5. Verification
     6. History Saving
-    """
-    print(f"[TIMING] Start processing...")
 
-    yield json.dumps({
-        "type": "stage", 
-        "data": {
-            "step": "clean",
-            "clean_text": clean_text_val
-        }
-    }) + "\n"
+    Every stage is traced as a child of one "rewrite" span (see tracing.py) and timed in app_metrics.
+    """
+    app_metrics.REWRITES_IN_PROGRESS.inc()
+    try:
+        with tracing.span("rewrite", input_chars=len(clean_text_val), strength=strength) as span:
+            async for line in _rewrite_stages(raw_text, clean_text_val, db, user, changes_list, t0, strength, span):
+                yield line
+            span.set_attribute("total_ms", round((time.time() - t0) * 1000, 1))
+    finally:
+        app_metrics.REWRITES_IN_PROGRESS.dec()
+        app_metrics.STAGE_LATENCY.labels("total").observe(time.time() - t0)
+
+
+async def _rewrite_stages(raw_text, clean_text_val, db, user, changes_list, t0, strength, root_span):
+    yield event_stream.encode_event("stage", {
+        "step": "clean",
+        "clean_text": clean_text_val
+    })
 
-    t1 = time.time()
-    
     # 1. Stats Collection
-    stats = await asyncio.to_thread(llm_validator.collect_stats, clean_text_val)
-    print(f"[TIMING] Stats collection took: {time.time() - t1:.2f}s")
-
-    # 2. Critique (Async Task)
-    critique_task = asyncio.create_task(
-        asyncio.to_thread(llm_validator.get_llm_critique, clean_text_val, stats)
-    )
+    with tracing.span("rewrite.stats"), app_metrics.time_stage("stats"):
+        stats = await request_profiler.to_thread(llm_validator.collect_stats, clean_text_val, None, True)
+
+    # 2. Critique (Async Task), skipped when the local score model is confident
+    local_score = llm_validator.local_ai_score(stats)
+    critique_task = None
+    if local_score is None:
+        critique_task = asyncio.create_task(
+            request_profiler.to_thread(llm_validator.get_llm_critique, clean_text_val, stats)
+        )
 
     analysis_for_rewrite = {"statistical_metrics": stats, "llm_critique": None}
     
-    yield json.dumps({
-        "type": "stage",
-        "data": { "step": "analyzed" }
-    }) + "\n"
+    yield event_stream.encode_event("stage", {"step": "analyzed"})
 
     # 3. Streaming Rewrite
     rewritten_chunks_gen = []
-    t2 = time.time()
-    try:
-        async for chunk in rewriting_agent.stream_rewrite(clean_text_val, analysis_for_rewrite):
-            if chunk and isinstance(chunk, str):
-                rewritten_chunks_gen.append(chunk)
-                yield json.dumps({"type": "chunk", "data": chunk}) + "\n"
-    except Exception as e:  
-        print(f"Rewrite error: {e}")
-        yield json.dumps({"type": "error", "data": str(e)}) + "\n"
-    
-    print(f"[TIMING] Rewriting (Streaming) took: {time.time() - t2:.2f}s")
-        
+    with tracing.span("rewrite.stream") as span, app_metrics.time_stage("stream"):
+        try:
+            # Token-sized pieces are merged into fewer, larger chunk events (see event_stream.coalesce).
+            async for chunk in event_stream.coalesce(
+                rewriting_agent.stream_rewrite_chunked(clean_text_val, analysis_for_rewrite)
+            ):
+                if chunk and isinstance(chunk, str):
+                    if not rewritten_chunks_gen:
+                        app_metrics.TIME_TO_FIRST_CHUNK.observe(time.time() - t0)
+                    rewritten_chunks_gen.append(chunk)
+                    yield event_stream.encode_event("chunk", chunk)
+        except Exception as e:
+            span.record_exception(e)
+            print(f"Rewrite error: {e}")
+            yield event_stream.encode_event("error", str(e))
+        span.set_attribute("chunks", len(rewritten_chunks_gen))
+
     raw_rewritten_text = "".join(rewritten_chunks_gen)
 
-    yield json.dumps({
-        "type": "stage",
-        "data": { "step": "humanizing" }
-    }) + "\n"
+    yield event_stream.encode_event("stage", {"step": "humanizing"})
 
     # 4. Humanization
-    t3 = time.time()
-    rewritten_text_final = await asyncio.to_thread(humanize, raw_rewritten_text, strength)
-    print(f"[TIMING] Humanization (Post-processing) took: {time.time() - t3:.2f}s")
+    seed = derive_seed(clean_text_val, user.id if user else None)
+    with tracing.span("rewrite.humanize", chars=len(raw_rewritten_text)), app_metrics.time_stage("humanize"):
+        rewritten_text_final = await request_profiler.to_thread(humanize, raw_rewritten_text, strength, seed)
 
-    yield json.dumps({
-        "type": "stage",
-        "data": { "step": "verifying" }
-    }) + "\n"
+    yield event_stream.encode_event("stage", {"step": "verifying"})
 
     # 5. Verification
-    t4 = time.time()
-    rewritten_analysis = await asyncio.to_thread(
-        llm_validator.verify_metrics_only, rewritten_text_final
-    )
-    print(f"[TIMING] Verification (Metrics) took: {time.time() - t4:.2f}s")
+    with tracing.span("rewrite.verify"), app_metrics.time_stage("verify"):
+        rewritten_analysis = await request_profiler.to_thread(
+            llm_validator.verify_metrics_only, rewritten_text_final
+        )
 
     final_changes = list(changes_list)
     final_changes.append({
@@ -107,45 +115,38 @@ async def rewrite_stream_generator(
         "text_after": rewritten_text_final
     })
 
-    print(f"[TIMING] Results ready at: {time.time() - t0:.2f}s")
+    root_span.set_attribute("results_ready_ms", round((time.time() - t0) * 1000, 1))
+    app_metrics.STAGE_LATENCY.labels("results_ready").observe(time.time() - t0)
 
     # 6. History Saving
     if user:
-        save_history_entry(
-            db, user.id, "rewrite", request_text=raw_text, result_text=rewritten_text_final
-        )
-        # Note: 'request_text' argument name in save_history_entry might be 'text'.
-        # Checking logic calls: save_history_entry(db, user.id, "rewrite", text, rewritten_text_final)
-        # The original code passed 'text' (the original input). 
-        # Here I passed 'clean_text_val'. Let me check the original code again.
-        # Line 197: save_history_entry(db, user.id, "rewrite", text, rewritten_text_final)
-        # It used 'text' (the raw input). 
-        # I need to pass 'text' (raw input) to this function or handle it.
-        # I should add 'raw_text' as argument to this function.
-
-    yield json.dumps({
-        "type": "done",
-        "data": {
-            "clean_text": clean_text_val,
-            "rewritten_text": rewritten_text_final,
-            "changes": final_changes,
-            "rewritten_metrics": rewritten_analysis.get("statistical_metrics", {})
-        }
-    }) + "\n"
-
-    t5 = time.time()
-    try:
-        llm_critique = await critique_task
-    except Exception:
-        llm_critique = {}
+        with tracing.span("rewrite.save_history"), app_metrics.time_stage("save_history"):
+            save_history_entry(db, user.id, "rewrite", raw_text, rewritten_text_final)
+
+    yield event_stream.encode_event("done", {
+        "clean_text": clean_text_val,
+        "rewritten_text": rewritten_text_final,
+        "changes": final_changes,
+        "rewritten_metrics": rewritten_analysis.get("statistical_metrics", {})
+    })
+
+    if critique_task is None:
+        llm_critique = {"source": "local", "ai_score": local_score.score, "confidence": local_score.confidence}
+    else:
+        with tracing.span("rewrite.critique_wait"), app_metrics.time_stage("critique_wait"):
+            try:
+                llm_critique = await critique_task
+            except Exception:
+                llm_critique = {}
+        if "ai_score" in llm_critique:
+            await request_profiler.to_thread(llm_validator.ai_score_model.log_pair, stats, llm_critique["ai_score"])
     ai_score = llm_critique.get("ai_score", 0.0)
-    print(f"[TIMING] LLM Critique waited: {time.time() - t5:.2f}s")
-    print(f"[TIMING] Total Process took: {time.time() - t0:.2f}s")
-
-    yield json.dumps({
-        "type": "ai_score",
-        "data": {
-            "score": ai_score,
-            "critique": llm_critique
-        }
-    }) + "\n"
+    if critique_task is None:
+        app_metrics.AI_SCORE_SOURCE.labels("local").inc()
+    else:
+        app_metrics.AI_SCORE_SOURCE.labels("llm" if "ai_score" in llm_critique else "llm_failed").inc()
+
+    yield event_stream.encode_event("ai_score", {
+        "score": ai_score,
+        "critique": llm_critique
+    })
@@ -0,0 +1,144 @@
+"""
+Preloads models, phrase tables and CSV data so the first real request does not pay for them.
+
+PRELOAD_COMPONENTS selects what is warmed: "all", "none" or a comma-separated list of
+component names. On Vercel the default skips the spaCy models, which would otherwise be
+loaded inside every cold start even for requests that never need them.
+"""
+import logging
+import os
+import threading
+import time
+
+import _paths  # noqa: F401 — centralised path setup
+import app_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_model(getter_name: str):
+    def load():
+        import shared_nlp
+        nlp = getattr(shared_nlp, getter_name)()
+        nlp("Warm up the pipeline.")
+    return load
+
+
+def _warm_tokenizer():
+    import shared_nlp
+    shared_nlp.get_nlp_blank().make_doc("Warm up the tokenizer.")
+
+
+def _warm_ai_phrases():
+    import ai_phrase_detector
+    ai_phrase_detector._initialize_matcher()
+
+
+def _warm_hedging():
+    import hedging_filler_detector
+    hedging_filler_detector._initialize_spacy()
+
+
+def _warm_typos():
+    import imperfection_injector
+    imperfection_injector._load_typos_csv()
+
+
+def _warm_contractions():
+    import post_humanizer
+    post_humanizer._load_csv_data()
+
+
+# Ordered cheapest first, so lightweight components become ready early.
+COMPONENTS = {
+    "tokenizer": _warm_tokenizer,
+    "ai_phrases": _warm_ai_phrases,
+    "hedging": _warm_hedging,
+    "typos": _warm_typos,
+    "contractions": _warm_contractions,
+    "nlp_light": _warm_model("get_nlp_light"),
+    "nlp_tagger": _warm_model("get_nlp_tagger"),
+}
+
+_SERVERLESS_DEFAULT = ("tokenizer", "ai_phrases", "hedging", "typos", "contractions")
+
+_status = {}
+_status_lock = threading.Lock()
+
+
+def selected_components() -> list[str]:
+    if os.environ.get("PRELOAD_COMPONENTS") is None:
+        if os.environ.get("VERCEL") or os.environ.get("VERCEL_ENV"):
+            return list(_SERVERLESS_DEFAULT)
+        return list(COMPONENTS)
+
+    value = os.environ["PRELOAD_COMPONENTS"].strip().lower()
+    if value == "all":
+        return list(COMPONENTS)
+    if value in ("", "none"):
+        return []
+
+    names = [n.strip() for n in value.split(",") if n.strip()]
+    unknown = [n for n in names if n not in COMPONENTS]
+    if unknown:
+        logger.warning("Ignoring unknown preload components: %s", ", ".join(unknown))
+    return [n for n in COMPONENTS if n in names]
+
+
+def _set_status(name: str, state: str, **extra):
+    with _status_lock:
+        _status[name] = {"state": state, **extra}
+    app_metrics.COMPONENT_READY.labels(name).set(1 if state == "warm" else 0)
+
+
+def _mark_pending(names):
+    for name in names:
+        _set_status(name, "pending")
+
+
+def preload(components=None):
+    """Loads the given components (default: the configured selection) one by one. Blocking."""
+    names = selected_components() if components is None else list(components)
+    _mark_pending(names)
+    _load_all(names)
+
+
+def start_preload(components=None) -> threading.Thread:
+    """Starts preloading in a background thread, so the server accepts connections meanwhile."""
+    names = selected_components() if components is None else list(components)
+    # Marked before the thread starts so the readiness probe never sees an empty, "ready" state.
+    _mark_pending(names)
+    thread = threading.Thread(target=_load_all, args=(names,), name="preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def _load_all(names):
+    for name in names:
+        _set_status(name, "loading")
+        t0 = time.perf_counter()
+        try:
+            COMPONENTS[name]()
+        except Exception as e:
+            logger.warning("Preloading %s failed: %s", name, e)
+            _set_status(name, "failed", error=str(e))
+            continue
+        _set_status(name, "warm", seconds=round(time.perf_counter() - t0, 3))
+
+
+def readiness() -> dict:
+    """
+    Reports every selected component's state and an overall status: "loading" while anything is
+    pending or loading, "degraded" once something failed, "ready" when everything is warm.
+    Only "ready" counts as ready, so a worker whose preload failed is kept out of rotation.
+    """
+    with _status_lock:
+        components = {name: dict(state) for name, state in _status.items()}
+    states = {c["state"] for c in components.values()}
+    if states & {"pending", "loading"}:
+        status = "loading"
+    elif "failed" in states:
+        status = "degraded"
+    else:
+        status = "ready"
+    return {"ready": status == "ready", "status": status, "components": components}
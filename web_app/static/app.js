@@ -54,6 +54,9 @@ fileInput.addEventListener('change', async (e) => {
     }
 });
 
+const JOB_KEY = 'sanitizator_rewrite_job';
+const MAX_JOB_RECONNECTS = 5;
+
 async function processText(action) {
     const text = document.getElementById('rawText').value;
     if (!text) {
@@ -72,59 +75,41 @@ async function processText(action) {
     formData.append('strength', getStrength());
 
     try {
-        const response = await fetch('/api/process', {
-            method: 'POST',
-            body: formData
-        });
-
-        if (!response.ok) {
-            const errorElem = await response.json();
-            throw new Error(errorElem.detail || 'Processing failed');
-        }
-
         if (action === 'rewrite') {
-            document.getElementById('results-panel').classList.remove('hidden');
-            document.getElementById('input-panel').classList.add('hidden');
-
-            document.getElementById('cleanResult').value = 'Sanitizing...';
-            document.getElementById('finalResult').value = '';
-            document.getElementById('aiScore').classList.add('hidden');
-            document.getElementById('changesLog').innerHTML = '<div class="text-slate-500 italic">Processing...</div>';
-
-            const reader = response.body.getReader();
-            const decoder = new TextDecoder();
-            let buffer = '';
-
-            while (true) {
-                const { value, done } = await reader.read();
-                if (done) break;
-
-                buffer += decoder.decode(value, { stream: true });
-                const lines = buffer.split('\n');
-
-                buffer = lines.pop() || '';
-
-                for (const line of lines) {
-                    if (!line.trim()) continue;
-                    try {
-                        const msg = JSON.parse(line);
-                        handleStreamEvent(msg);
-                    } catch (e) {
-                        console.error('Error parsing stream line', e);
-                    }
-                }
+            // Rewrites run as server-side jobs, so a dropped connection or a reload can reattach to them.
+            const response = await fetch('/api/jobs', {
+                method: 'POST',
+                headers: Auth.authHeaders(),
+                body: formData
+            });
+
+            if (response.status === 503) {
+                // Jobs are disabled on this deployment (e.g. serverless): stream the rewrite directly.
+                await streamRewrite(formData);
+                return;
             }
 
-            if (buffer.trim()) {
-                try {
-                    const msg = JSON.parse(buffer);
-                    handleStreamEvent(msg);
-                } catch (e) {
-                    console.error('Error parsing final stream line', e);
-                }
+            if (!response.ok) {
+                const errorElem = await response.json();
+                throw new Error(errorElem.detail || 'Processing failed');
             }
 
+            const job = await response.json();
+            sessionStorage.setItem(JOB_KEY, JSON.stringify({ id: job.job_id, text: text }));
+            showRewriteProgress();
+            await followRewriteJob(job.job_id);
+
         } else {
+            const response = await fetch('/api/process', {
+                method: 'POST',
+                body: formData
+            });
+
+            if (!response.ok) {
+                const errorElem = await response.json();
+                throw new Error(errorElem.detail || 'Processing failed');
+            }
+
             const data = await response.json();
             History.addSessionEntry(action, text, data.clean_text);
             showResults(data, action);
@@ -141,6 +126,139 @@ async function processText(action) {
     }
 }
 
+function showRewriteProgress() {
+    document.getElementById('results-panel').classList.remove('hidden');
+    document.getElementById('input-panel').classList.add('hidden');
+
+    document.getElementById('cleanResult').value = 'Sanitizing...';
+    document.getElementById('finalResult').value = '';
+    document.getElementById('aiScore').classList.add('hidden');
+    document.getElementById('changesLog').innerHTML = '<div class="text-slate-500 italic">Processing...</div>';
+}
+
+async function streamRewrite(formData) {
+    const response = await fetch('/api/process', {
+        method: 'POST',
+        body: formData
+    });
+
+    if (!response.ok) {
+        const errorElem = await response.json();
+        throw new Error(errorElem.detail || 'Processing failed');
+    }
+
+    showRewriteProgress();
+    await readNdjson(response, handleStreamEvent);
+}
+
+async function readNdjson(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+
+        buffer = lines.pop() || '';
+
+        for (const line of lines) {
+            if (!line.trim()) continue;
+            try {
+                onEvent(JSON.parse(line));
+            } catch (e) {
+                console.error('Error parsing stream line', e);
+            }
+        }
+    }
+
+    if (buffer.trim()) {
+        try {
+            onEvent(JSON.parse(buffer));
+        } catch (e) {
+            console.error('Error parsing final stream line', e);
+        }
+    }
+}
+
+async function followRewriteJob(jobId) {
+    // `offset` counts the events already shown, so a reconnect resumes exactly where the stream stopped.
+    let offset = 0;
+    let failures = 0;
+
+    while (true) {
+        let finished = false;
+        let response;
+        try {
+            response = await fetch(`/api/jobs/${jobId}/events?offset=${offset}`, {
+                headers: Auth.authHeaders()
+            });
+        } catch (err) {
+            response = null;
+        }
+
+        if (response && response.status === 404) {
+            sessionStorage.removeItem(JOB_KEY);
+            throw new Error('The rewrite job no longer exists');
+        }
+
+        if (response && response.ok) {
+            try {
+                await readNdjson(response, (msg) => {
+                    offset++;
+                    failures = 0;
+                    if (msg.type === 'job') {
+                        finished = true;
+                        sessionStorage.removeItem(JOB_KEY);
+                        if (msg.data.status === 'failed') {
+                            handleStreamEvent({ type: 'error', data: msg.data.error || 'The rewrite failed.' });
+                        }
+                        return;
+                    }
+                    handleStreamEvent(msg);
+                });
+            } catch (err) {
+                console.error('Rewrite stream interrupted', err);
+            }
+        }
+
+        if (finished) return;
+
+        failures++;
+        if (failures > MAX_JOB_RECONNECTS) {
+            throw new Error('Lost the connection to the rewrite. Reload the page to resume it.');
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+    }
+}
+
+async function resumeRewriteJob() {
+    let pending = null;
+    try {
+        pending = JSON.parse(sessionStorage.getItem(JOB_KEY) || 'null');
+    } catch (e) {
+        sessionStorage.removeItem(JOB_KEY);
+    }
+    if (!pending) return;
+
+    // Replays the job's events from the start, which rebuilds the results panel after a reload.
+    _originalText = pending.text;
+    document.getElementById('rawText').value = pending.text;
+    showRewriteProgress();
+    try {
+        await followRewriteJob(pending.id);
+    } catch (err) {
+        alert('Error processing text: ' + err.message);
+        document.getElementById('results-panel').classList.add('hidden');
+        document.getElementById('input-panel').classList.remove('hidden');
+    }
+}
+
+document.addEventListener('DOMContentLoaded', resumeRewriteJob);
+
 async function handleStreamEvent(msg) {
     if (msg.type === 'error') {
         alert("⚠️ " + msg.data);